@@ -0,0 +1,158 @@
+"""
+Compare LLM calls per handled message between the old LangChain ReAct
+executor and the native tool-calling executor.
+
+Both loops get the same Discord-style tools, with side effects replaced by
+recorders so nothing is posted. Needs OPENAI_API_KEY.
+
+    poetry run python scripts/bench_agent_llm_calls.py [--model gpt-4o] [--runs 3]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+from langchain.agents import AgentExecutor, create_react_agent
+from langchain.tools import Tool
+from langchain_community.callbacks import get_openai_callback
+from langchain_core.prompts import PromptTemplate
+from langchain_openai import ChatOpenAI
+
+from src.helpers.tool_executor import ToolCallingExecutor
+
+# Mix of chatter that needs no tool, single lookups and a multi-lookup
+MESSAGES = [
+    "gm everyone 🐮",
+    "lol nice",
+    "Can someone explain what solvers do on CoW Swap?",
+    "What is CIP-38 about?",
+    "What did the community think about CIP-38, and what do solvers do on CoWSwap?",
+]
+
+INSTRUCTIONS = """You are chAIrman 🪑, the CoW Protocol community bot.
+If the message needs a response, use Discord_Send with a helpful reply.
+If not, briefly explain why."""
+
+REACT_TEMPLATE = """Answer the following questions as best you can. You have access to the following tools:
+
+{tools}
+
+Use the following format:
+
+Question: the input question you must answer
+Thought: you should always think about what to do
+Action: the action to take, should be one of [{tool_names}]
+Action Input: the input to the action
+Observation: the result of the action
+... (this Thought/Action/Action Input/Observation can repeat N times)
+Thought: I now know the final answer
+Final Answer: the final answer to the original input question
+
+Begin!
+
+Question: {input}
+Thought:{agent_scratchpad}"""
+
+INSIGHTS = {
+    "cip-38": "CIP-38 introduced solver rewards based on surplus delivered to users.",
+    "community": "The community broadly supported CIP-38, with debate on reward caps.",
+    "solver": "Solvers compete to find the best settlement for each batch of orders.",
+}
+
+
+def make_tools(sent):
+    def get_insight(query):
+        query = query.lower()
+        for key, text in INSIGHTS.items():
+            if key in query:
+                return text
+        return "No insight available."
+
+    def discord_send(message):
+        sent.append(message)
+        return "Message sent"
+
+    return [
+        Tool(
+            name="Discord_Send",
+            func=discord_send,
+            description="Send a message to Discord channel. Action Input: message (str) - The text message you want to send to Discord.",
+            return_direct=True,
+        ),
+        Tool(
+            name="Get_Insight",
+            func=get_insight,
+            description="Get insights about CIP-38, community feedback on it, or what solvers do on CoW Swap. Action Input: question (str).",
+        ),
+    ]
+
+
+def run_react(model, tools, text):
+    llm = ChatOpenAI(temperature=0.3, model=model, api_key=os.getenv("OPENAI_API_KEY"))
+    prompt = PromptTemplate(
+        template=REACT_TEMPLATE,
+        input_variables=["input", "agent_scratchpad"],
+        partial_variables={
+            "tools": "\n".join(f"{tool.name}: {tool.description}" for tool in tools),
+            "tool_names": ", ".join(tool.name for tool in tools),
+        },
+    )
+    executor = AgentExecutor(
+        agent=create_react_agent(llm=llm, tools=tools, prompt=prompt),
+        tools=tools,
+        max_iterations=6,
+        handle_parsing_errors=True,
+        early_stopping_method="force",
+    )
+    with get_openai_callback() as cb:
+        executor.invoke({"input": text})
+    return cb.successful_requests
+
+
+def run_native(model, tools, text):
+    executor = ToolCallingExecutor(tools=tools, model=model, max_iterations=6)
+    return executor.invoke({"input": text})["llm_calls"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--model", default="gpt-4o")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    load_dotenv()
+    if not os.getenv("OPENAI_API_KEY"):
+        sys.exit("OPENAI_API_KEY is not set")
+
+    totals = {"react": [], "native": []}
+    latencies = {"react": [], "native": []}
+    print(f"{'message':<60} {'react':>6} {'native':>6}")
+    for message in MESSAGES:
+        text = f"{INSTRUCTIONS}\n\nMessage from bench:\n{message}"
+        row = {}
+        for name, runner in (("react", run_react), ("native", run_native)):
+            calls = []
+            for _ in range(args.runs):
+                started = time.monotonic()
+                calls.append(runner(args.model, make_tools([]), text))
+                latencies[name].append(time.monotonic() - started)
+            row[name] = statistics.mean(calls)
+            totals[name].extend(calls)
+        print(f"{message[:60]:<60} {row['react']:>6.2f} {row['native']:>6.2f}")
+
+    print()
+    for name in ("react", "native"):
+        print(
+            f"{name:<7} LLM calls/message: {statistics.mean(totals[name]):.2f}  "
+            f"latency/message: {statistics.mean(latencies[name]):.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Compare per-action latency of Solana read actions with a fresh AsyncClient
+and event loop per call (the old behaviour) against SolanaConnection's
+persistent client and loop.
+
+Only read-only RPC calls are made. get-balance is included when
+SOLANA_PRIVATE_KEY is set.
+
+    poetry run python scripts/bench_solana_actions.py [--rpc URL] [--runs 10]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+from solana.rpc.async_api import AsyncClient
+from solders.keypair import Keypair  # type: ignore
+
+from src.connections.solana_connection import SolanaConnection
+from src.helpers.solana.performance import SolanaPerformanceTracker
+from src.helpers.solana.read import SolanaReadHelper
+
+
+def fresh_client_call(rpc, make_coro):
+    """One action the old way: new client, new loop, client never closed"""
+    return asyncio.run(make_coro(AsyncClient(rpc)))
+
+
+def time_calls(fn, runs):
+    latencies = []
+    for _ in range(runs):
+        started = time.monotonic()
+        fn()
+        latencies.append(time.monotonic() - started)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rpc", default="https://api.mainnet-beta.solana.com")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    load_dotenv()
+    connection = SolanaConnection({"rpc": args.rpc})
+
+    actions = {
+        "get-tps": (
+            lambda client: SolanaPerformanceTracker.fetch_current_tps(client),
+            lambda: connection.get_tps(),
+        ),
+    }
+    private_key = os.getenv("SOLANA_PRIVATE_KEY")
+    if private_key:
+        wallet = Keypair.from_base58_string(private_key)
+        actions["get-balance"] = (
+            lambda client: SolanaReadHelper.get_balance(client, wallet),
+            lambda: connection.get_balance(),
+        )
+    else:
+        print("SOLANA_PRIVATE_KEY not set, skipping get-balance\n")
+
+    print(f"{'action':<14} {'fresh p50':>10} {'fresh mean':>11} {'pooled p50':>11} {'pooled mean':>12}")
+    try:
+        for name, (make_coro, pooled) in actions.items():
+            fresh = time_calls(lambda: fresh_client_call(args.rpc, make_coro), args.runs)
+            # The first pooled call pays for the connection; later ones reuse it
+            pooled_latencies = time_calls(pooled, args.runs)
+            print(
+                f"{name:<14} {statistics.median(fresh) * 1000:>8.0f}ms "
+                f"{statistics.mean(fresh) * 1000:>9.0f}ms "
+                f"{statistics.median(pooled_latencies) * 1000:>9.0f}ms "
+                f"{statistics.mean(pooled_latencies) * 1000:>10.0f}ms"
+            )
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
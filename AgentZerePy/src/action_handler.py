@@ -3,6 +3,7 @@ import logging
 logger = logging.getLogger("action_handler")
 
 action_registry = {}    
+pregenerator_registry = {}
 
 def register_action(action_name):
     def decorator(func):
@@ -10,11 +11,25 @@ def register_action(action_name):
         return func
     return decorator
 
+def register_pregenerator(action_name):
+    """Register a function that prepares an action's output ahead of time.
+
+    It is called as func(agent, fires_at) and returns (value, context), or
+    None when there is nothing worth preparing for that time.
+    """
+    def decorator(func):
+        pregenerator_registry[action_name] = func
+        return func
+    return decorator
+
 def execute_action(agent, action_name, **kwargs):
     if action_name in action_registry:
        return action_registry[action_name](agent, **kwargs)
     else:
         logger.error(f"Action {action_name} not found")
         return None
-    
 
+def pregenerate(agent, action_name, fires_at):
+    if action_name not in pregenerator_registry:
+        return None
+    return pregenerator_registry[action_name](agent, fires_at)
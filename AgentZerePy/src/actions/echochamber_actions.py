@@ -1,7 +1,34 @@
 import time,random
-from src.action_handler import register_action
+from src.action_handler import register_action, register_pregenerator
+from src.helpers.post_dedup import generate_unique_post, get_post_index
 from src.prompts import REPLY_ECHOCHAMBER_PROMPT, POST_ECHOCHAMBER_PROMPT
 
+def _echochambers_context(agent):
+    # A pre-generated message is only valid for the room topic and tags it was written for
+    room_info = agent.state.get("room_info") or {}
+    return (agent.model_provider, room_info.get("topic"), tuple(room_info.get("tags", [])))
+
+def _generate_echochambers_message(agent, post_index):
+    # Recent posts are checked against the dedup index instead of pasted into the prompt
+    def generate(avoid):
+        prompt = POST_ECHOCHAMBER_PROMPT.format(
+            room_topic=agent.state['room_info']['topic'],
+            tags=", ".join(agent.state['room_info']['tags']),
+            previous_content=f"- {avoid}" if avoid else "- None"
+        )
+        return agent.prompt_llm(prompt)
+
+    return generate_unique_post(post_index, generate)
+
+@register_pregenerator("post-echochambers")
+def pregenerate_echochambers(agent, fires_at):
+    if not agent.state.get("room_info"):
+        return None
+    if fires_at - agent.state.get("echochambers_last_message", 0) <= agent.echochambers_message_interval:
+        return None
+    message = _generate_echochambers_message(agent, get_post_index(f"{agent.name}_echochambers"))
+    return (message, _echochambers_context(agent)) if message else None
+
 @register_action("post-echochambers")
 def post_echochambers(agent, **kwargs):
     current_time = time.time()
@@ -13,19 +40,14 @@ def post_echochambers(agent, **kwargs):
         agent.state["echochambers_replied_messages"] = set()
     
     if current_time - agent.state["echochambers_last_message"] > agent.echochambers_message_interval:
-        agent.logger.info("\n📝 GENERATING NEW ECHOCHAMBERS MESSAGE")
-        
-        # Generate message based on room topic and tags
-        previous_messages = agent.connection_manager.connections["echochambers"].sent_messages
-        previous_content = "\n".join([f"- {msg['content']}" for msg in previous_messages])
-        agent.logger.info(f"Found {len(previous_messages)} messages in post history")
-        
-        prompt  = POST_ECHOCHAMBER_PROMPT.format(
-            room_topic=agent.state['room_info']['topic'],
-            tags=", ".join(agent.state['room_info']['tags']),
-            previous_content=previous_content
-        )
-        message = agent.prompt_llm(prompt)
+        post_index = get_post_index(f"{agent.name}_echochambers")
+
+        message = agent.take_pregenerated("post-echochambers", _echochambers_context(agent))
+        if message and post_index.is_duplicate(message):
+            message = None
+        if not message:
+            agent.logger.info("\n📝 GENERATING NEW ECHOCHAMBERS MESSAGE")
+            message = _generate_echochambers_message(agent, post_index)
         
         if message:
             agent.logger.info(f"\n🚀 Posting message: '{message[:69]}...'")
@@ -34,6 +56,7 @@ def post_echochambers(agent, **kwargs):
                 action_name="send-message",
                 params=[message]  # Pass as list of values
             )
+            post_index.add(message)
             agent.state["echochambers_last_message"] = current_time
             agent.logger.info("✅ Message posted successfully!")
             return True
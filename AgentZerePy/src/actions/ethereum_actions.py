@@ -1,6 +1,4 @@
 import logging
-import os
-from dotenv import load_dotenv
 from src.action_handler import register_action
 
 logger = logging.getLogger("actions.ethereum_actions")
@@ -33,11 +31,7 @@ def get_eth_balance(agent, **kwargs):
     try:
         token_address = kwargs.get("token_address")
         
-        load_dotenv()
-        private_key = os.getenv('ETH_PRIVATE_KEY')
-        web3 = agent.connection_manager.connections["ethereum"]._web3
-        account = web3.eth.account.from_key(private_key)
-        address = account.address
+        address = agent.connection_manager.connections["ethereum"]._get_account().address
 
         balance = agent.connection_manager.connections["ethereum"].get_balance(
             address=address,
@@ -60,6 +60,23 @@ def sol_balance(agent, **kwargs):
         agent.logger.error(f"❌ Balance check failed: {str(e)}")
         return None
 
+@register_action("sol-portfolio")
+def sol_portfolio(agent, **kwargs):
+    """Get SOL and token balances with USD values"""
+    agent.logger.info("\n📒 FETCHING PORTFOLIO")
+    try:
+        result = agent.connection_manager.perform_action(
+            connection_name="solana",
+            action_name="get-portfolio",
+            # Omitted entirely when not given: the list cast would reject None
+            params=[kwargs['token_addresses']] if kwargs.get('token_addresses') else []
+        )
+        agent.logger.info(f"Portfolio value: {result.get('total_value_usd')}")
+        return result
+    except Exception as e:
+        agent.logger.error(f"❌ Portfolio fetch failed: {str(e)}")
+        return None
+
 @register_action("sol-stake")
 def sol_stake(agent, **kwargs):
     """Stake SOL"""
@@ -1,6 +1,4 @@
 import logging
-import os
-from dotenv import load_dotenv
 from src.action_handler import register_action
 
 logger = logging.getLogger("actions.sonic_actions")
@@ -38,11 +36,7 @@ def get_sonic_balance(agent, **kwargs):
         token_address = kwargs.get("token_address")
         
         if not address:
-            load_dotenv()
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            web3 = agent.connection_manager.connections["sonic"]._web3
-            account = web3.eth.account.from_key(private_key)
-            address = account.address
+            address = agent.connection_manager.connections["sonic"]._get_account().address
 
         # Direct passthrough to connection method - add your logic before/after this call!
         agent.connection_manager.connections["sonic"].get_balance(
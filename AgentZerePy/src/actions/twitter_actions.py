@@ -1,7 +1,32 @@
 import time 
-from src.action_handler import register_action
+from src.action_handler import register_action, register_pregenerator
 from src.helpers import print_h_bar
-from src.prompts import POST_TWEET_PROMPT, REPLY_TWEET_PROMPT
+from src.helpers.post_dedup import generate_unique_post, get_post_index
+from src.prompts import AVOID_DUPLICATE_POST_PROMPT, POST_TWEET_PROMPT, REPLY_TWEET_PROMPT
+
+
+def _tweet_context(agent):
+    # A pre-generated tweet is only valid for the persona and model it was written with
+    return (agent.model_provider, hash(agent._construct_system_prompt()))
+
+
+def _generate_tweet(agent, post_index):
+    def generate(avoid):
+        prompt = POST_TWEET_PROMPT.format(agent_name = agent.name)
+        if avoid:
+            prompt += AVOID_DUPLICATE_POST_PROMPT.format(previous_post=avoid)
+        return agent.prompt_llm(prompt)
+
+    return generate_unique_post(post_index, generate)
+
+
+@register_pregenerator("post-tweet")
+def pregenerate_tweet(agent, fires_at):
+    last_tweet_time = agent.state.get("last_tweet_time", 0)
+    if fires_at - last_tweet_time < agent.tweet_interval:
+        return None
+    tweet_text = _generate_tweet(agent, get_post_index(f"{agent.name}_twitter"))
+    return (tweet_text, _tweet_context(agent)) if tweet_text else None
 
 
 @register_action("post-tweet")
@@ -14,11 +39,15 @@ def post_tweet(agent, **kwargs):
         last_tweet_time = agent.state["last_tweet_time"]
 
     if current_time - last_tweet_time >= agent.tweet_interval:
-        agent.logger.info("\n📝 GENERATING NEW TWEET")
-        print_h_bar()
+        post_index = get_post_index(f"{agent.name}_twitter")
 
-        prompt = POST_TWEET_PROMPT.format(agent_name = agent.name)
-        tweet_text = agent.prompt_llm(prompt)
+        tweet_text = agent.take_pregenerated("post-tweet", _tweet_context(agent))
+        if tweet_text and post_index.is_duplicate(tweet_text):
+            tweet_text = None
+        if not tweet_text:
+            agent.logger.info("\n📝 GENERATING NEW TWEET")
+            print_h_bar()
+            tweet_text = _generate_tweet(agent, post_index)
 
         if tweet_text:
             agent.logger.info("\n🚀 Posting tweet:")
@@ -28,6 +57,7 @@ def post_tweet(agent, **kwargs):
                 action_name="post-tweet",
                 params=[tweet_text]
             )
+            post_index.add(tweet_text)
             agent.state["last_tweet_time"] = current_time
             agent.logger.info("\n✅ Tweet posted successfully!")
             return True
@@ -73,11 +103,16 @@ def like_tweet(agent, **kwargs):
         
         is_own_tweet = tweet.get('author_username', '').lower() == agent.username
         if is_own_tweet:
-            replies = agent.connection_manager.perform_action(
-                connection_name="twitter",
-                action_name="get-tweet-replies",
-                params=[tweet.get('author_id')]
-            )
+            # Fetched in one batch when the timeline was read
+            replies = agent.state.get("own_tweet_replies", {}).pop(tweet_id, None)
+            if replies is None:
+                result = agent.connection_manager.perform_action(
+                    connection_name="twitter",
+                    action_name="get-tweet-replies-batch",
+                    params=[[tweet_id], agent.own_tweet_replies_count]
+                )
+                # perform_action returns None when the lookup fails
+                replies = (result or {}).get(tweet_id, [])
             if replies:
                 agent.state["timeline_tweets"].extend(replies[:agent.own_tweet_replies_count])
             return True 
@@ -7,7 +7,10 @@ from pathlib import Path
 from dotenv import load_dotenv
 from src.connection_manager import ConnectionManager
 from src.helpers import print_h_bar
-from src.action_handler import execute_action
+from src.helpers.context_builder import ContextBuilder
+from src.helpers.llm_metrics import llm_usage_context
+from src.action_handler import execute_action, pregenerate
+from src.helpers.speculative import SpeculativeQueue
 import src.actions.twitter_actions  
 import src.actions.echochamber_actions
 import src.actions.solana_actions
@@ -15,6 +18,9 @@ from datetime import datetime
 
 REQUIRED_FIELDS = ["name", "bio", "traits", "examples", "loop_delay", "config", "tasks"]
 
+# Actions picked less often than this share of ticks are not pre-generated
+PREGENERATE_MIN_SHARE = 0.2
+
 logger = logging.getLogger("agent")
 
 class ZerePyAgent:
@@ -36,6 +42,14 @@ class ZerePyAgent:
             self.examples = agent_dict["examples"]
             self.example_accounts = agent_dict["example_accounts"]
             self.loop_delay = agent_dict["loop_delay"]
+            # Posts for the next action are generated during the loop delay
+            # and kept until they are published or go stale
+            self.pregenerate_posts = agent_dict.get("pregenerate_posts", True)
+            self.pregenerated = SpeculativeQueue(
+                ttl=agent_dict.get("pregenerate_ttl", self.loop_delay + 600)
+            )
+            # Action name -> when its output was last pre-generated
+            self._pregenerated_at = {}
             self.connection_manager = ConnectionManager(agent_dict["config"])
             self.use_time_based_weights = agent_dict["use_time_based_weights"]
             self.time_based_multipliers = agent_dict["time_based_multipliers"]
@@ -48,6 +62,12 @@ class ZerePyAgent:
                 self.tweet_interval = twitter_config.get("tweet_interval", 900)
                 self.own_tweet_replies_count = twitter_config.get("own_tweet_replies_count", 2)
 
+            # With stream ingestion, matching tweets are pushed instead of read from the timeline
+            self.twitter_stream = bool(
+                has_twitter_tasks and twitter_config and twitter_config.get("ingest") == "stream"
+            )
+            self.stream_min_delay = (twitter_config or {}).get("stream_min_delay", 30)
+
             # Extract Echochambers config
             echochambers_config = next((config for config in agent_dict["config"] if config["name"] == "echochambers"), None)
             if echochambers_config:
@@ -101,19 +121,57 @@ class ZerePyAgent:
                     prompt_parts.extend(f"- {example}" for example in self.examples)
 
                 if self.example_accounts:
-                    for example_account in self.example_accounts:
-                        tweets = self.connection_manager.perform_action(
-                            connection_name="twitter",
-                            action_name="get-latest-tweets",
-                            params=[example_account]
-                        )
-                        if tweets:
-                            prompt_parts.extend(f"- {tweet['text']}" for tweet in tweets)
+                    # One combined search covers many accounts
+                    tweets_by_account = self.connection_manager.perform_action(
+                        connection_name="twitter",
+                        action_name="get-latest-tweets-batch",
+                        params=[self.example_accounts]
+                    )
+                    for tweets in (tweets_by_account or {}).values():
+                        prompt_parts.extend(f"- {tweet['text']}" for tweet in tweets)
 
             self._system_prompt = "\n".join(prompt_parts)
 
         return self._system_prompt
     
+    def _stream_reply_task(self):
+        return next((task for task in self.tasks if task["name"] == "reply-to-tweet"), None)
+
+    def _fetch_own_tweet_replies(self, tweets) -> None:
+        """Look up replies to all of our own tweets in a read with one batched search"""
+        if not any(task["name"] == "like-tweet" for task in self.tasks):
+            return
+        cache = self.state.setdefault("own_tweet_replies", {})
+        # Our tweets start their own conversations, so the tweet id is the conversation id
+        own_ids = [
+            tweet["id"] for tweet in tweets or []
+            if tweet.get("id") and tweet.get("author_username", "").lower() == self.username
+            and tweet["id"] not in cache
+        ]
+        if not own_ids:
+            return
+        try:
+            replies = self.connection_manager.perform_action(
+                connection_name="twitter",
+                action_name="get-tweet-replies-batch",
+                params=[own_ids, self.own_tweet_replies_count]
+            )
+            cache.update(replies or {})
+        except Exception as e:
+            logger.warning(f"Could not fetch replies to own tweets: {e}")
+
+    def _wait_for_stream(self, remaining: float) -> bool:
+        """Sleep out the loop delay; returns True if a streamed tweet ended it early"""
+        remaining = max(remaining, 0)
+        if not self.twitter_stream or not self._stream_reply_task():
+            time.sleep(remaining)
+            return False
+        # A minimum gap keeps a busy stream from turning into a reply burst
+        min_delay = min(self.stream_min_delay, remaining)
+        time.sleep(min_delay)
+        twitter = self.connection_manager.connections["twitter"]
+        return twitter.wait_for_tweets(remaining - min_delay)
+
     def _adjust_weights_for_time(self, current_hour: int, task_weights: list) -> list:
         weights = task_weights.copy()
         
@@ -139,6 +197,12 @@ class ZerePyAgent:
         """Generate text using the configured LLM provider"""
         system_prompt = system_prompt or self._construct_system_prompt()
 
+        # Keep the prompt within the provider model's budget
+        model = self.connection_manager.connections[self.model_provider].config.get("model", "")
+        builder = ContextBuilder(model).reserve(system_prompt)
+        builder.add("prompt", prompt, ContextBuilder.HIGH)
+        prompt = builder.build()
+
         return self.connection_manager.perform_action(
             connection_name=self.model_provider,
             action_name="generate-text",
@@ -157,6 +221,51 @@ class ZerePyAgent:
         
         return random.choices(self.tasks, weights=task_weights, k=1)[0]
 
+    def take_pregenerated(self, action_name: str, context=None):
+        """Return output pre-generated for an action if still fresh for this context"""
+        return self.pregenerated.take(action_name, context)
+
+    def _warm_up_actions(self, delay: float) -> None:
+        """
+        Pre-generate output for actions that are likely to run after the delay.
+
+        The next action is still chosen after the delay, from current state;
+        this only prepares output that the action may use if picked. Only
+        actions with at least PREGENERATE_MIN_SHARE of the task weight are
+        warmed up, each at most once per TTL whether or not its output was
+        used, and take_pregenerated drops entries whose context changed.
+        """
+        if not self.pregenerate_posts:
+            return
+        shares = {}
+        for task, weight in zip(self.tasks, self.task_weights):
+            shares[task["name"]] = shares.get(task["name"], 0) + weight
+        total = sum(shares.values())
+        if total <= 0:
+            return
+
+        now = time.monotonic()
+        fires_at = time.time() + delay
+        for action_name, weight in shares.items():
+            if weight / total < PREGENERATE_MIN_SHARE:
+                continue
+            last = self._pregenerated_at.get(action_name)
+            if last is not None and now - last < self.pregenerated.ttl:
+                continue
+            if self.pregenerated.has(action_name):
+                continue
+            # Failed and discarded attempts count too
+            self._pregenerated_at[action_name] = now
+            try:
+                with llm_usage_context(agent=self.name, task=f"{action_name}:pregenerate"):
+                    result = pregenerate(self, action_name, fires_at)
+                if result:
+                    value, context = result
+                    self.pregenerated.put(action_name, value, context)
+                    logger.info(f"Pre-generated output for {action_name}")
+            except Exception as e:
+                logger.warning(f"Pre-generation for {action_name} failed: {e}")
+
     def loop(self):
         """Main agent loop for autonomous behavior"""
         if not self.is_llm_set:
@@ -172,13 +281,24 @@ class ZerePyAgent:
             logger.info(f"{i}...")
             time.sleep(1)
 
+        next_action = None
         try:
             while True:
                 success = False
                 try:
                     # REPLENISH INPUTS
                     # TODO: Add more inputs to complexify agent behavior
-                    if "timeline_tweets" not in self.state or self.state["timeline_tweets"] is None or len(self.state["timeline_tweets"]) == 0:
+                    if self.twitter_stream:
+                        streamed = self.connection_manager.perform_action(
+                            connection_name="twitter",
+                            action_name="read-stream-tweets",
+                            params=[]
+                        )
+                        if streamed:
+                            self.state.setdefault("timeline_tweets", [])
+                            self.state["timeline_tweets"].extend(streamed)
+                            self._fetch_own_tweet_replies(streamed)
+                    elif "timeline_tweets" not in self.state or self.state["timeline_tweets"] is None or len(self.state["timeline_tweets"]) == 0:
                         if any("tweet" in task["name"] for task in self.tasks):
                             logger.info("\n👀 READING TIMELINE")
                             self.state["timeline_tweets"] = self.connection_manager.perform_action(
@@ -186,6 +306,7 @@ class ZerePyAgent:
                                 action_name="read-timeline",
                                 params=[]
                             )
+                            self._fetch_own_tweet_replies(self.state["timeline_tweets"])
 
                     if "room_info" not in self.state or self.state["room_info"] is None:
                         if any("echochambers" in task["name"] for task in self.tasks):
@@ -199,15 +320,24 @@ class ZerePyAgent:
                     # CHOOSE AN ACTION
                     # TODO: Add agentic action selection
                     
-                    action = self.select_action(use_time_based_weights=self.use_time_based_weights)
+                    # Chosen from current state; only a streamed tweet that cut
+                    # the last delay short pre-selects the reply task
+                    action = next_action or self.select_action(use_time_based_weights=self.use_time_based_weights)
+                    next_action = None
                     action_name = action["name"]
 
                     # PERFORM ACTION
-                    success = execute_action(self, action_name)
+                    with llm_usage_context(agent=self.name, task=action_name):
+                        success = execute_action(self, action_name)
 
-                    logger.info(f"\n⏳ Waiting {self.loop_delay} seconds before next loop...")
+                    delay = self.loop_delay if success else 60
+                    logger.info(f"\n⏳ Waiting {delay} seconds before next loop...")
                     print_h_bar()
-                    time.sleep(self.loop_delay if success else 60)
+                    idle_started = time.monotonic()
+                    self._warm_up_actions(delay)
+                    if self._wait_for_stream(delay - (time.monotonic() - idle_started)):
+                        # A streamed tweet cut the wait short; answer it first
+                        next_action = self._stream_reply_task()
 
                 except Exception as e:
                     logger.error(f"\n❌ Error in agent loop iteration: {e}")
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import random
 import time
@@ -7,20 +8,23 @@ from pathlib import Path
 from dotenv import load_dotenv
 from src.connection_manager import ConnectionManager
 from src.helpers import print_h_bar
+from src.helpers.context_builder import ContextBuilder
+from src.helpers.llm_metrics import llm_usage_context
+from src.helpers.tool_executor import ToolCallingExecutor
 from datetime import datetime
-from langchain_core.messages import SystemMessage
-from langchain_openai import ChatOpenAI
-from langchain.agents import AgentExecutor, create_react_agent
-from langchain_core.prompts import MessagesPlaceholder, PromptTemplate
-from langchain.memory import ConversationBufferMemory
 from langchain.tools import Tool
-from langchain.callbacks import get_openai_callback
-from langchain_core.runnables import RunnableConfig
-from langchain_core.messages import HumanMessage, AIMessage
-from typing import Any
+from typing import Any, Dict, Iterable, Optional
 
 REQUIRED_FIELDS = ["name", "bio", "traits", "examples", "loop_delay", "config", "tasks"]
 
+# Fields that go into each item's prompt; a change to any of them is a new revision
+SNAPSHOT_ANALYSIS_FIELDS = ("title", "body")
+FORUM_ANALYSIS_FIELDS = ("title", "category", "author")
+MAX_STORED_ANALYSES = 500
+# A failed analysis is retried after 1, 2, 4... minutes, capped at an hour
+ANALYSIS_RETRY_BASE = 60
+ANALYSIS_RETRY_MAX = 3600
+
 logger = logging.getLogger("agent")
 
 
@@ -90,6 +94,15 @@ class ZerePyAgent:
             else:
                 logger.warning("No Discord configuration found in agent config")
 
+            # Replies go to the channel of the batch being processed
+            self._reply_channel_id = getattr(self, "discord_server_id", None)
+
+            # With gateway ingestion, messages arrive through on_message instead of REST polling
+            discord_connection = self.connection_manager.connections.get("discord")
+            self.discord_gateway = (
+                getattr(discord_connection, "ingest_mode", "poll") == "gateway"
+            )
+
             # Extract Snapshot config
             snapshot_config = next(
                 (
@@ -144,6 +157,10 @@ class ZerePyAgent:
                 "processed_message_ids": set(),  # Track processed Discord messages
             }
 
+            # Analyses of proposals/forum updates, keyed by item and content hash
+            self.analyses_file = Path("data") / f"{agent_name}_analyses.json"
+            self.state["analyses"] = self._load_analyses()
+
             # Initialize LangChain components
             self._setup_langchain_agent()
 
@@ -166,7 +183,7 @@ class ZerePyAgent:
                     func=lambda x: self.connection_manager.perform_action(
                         connection_name="discord",
                         action_name="post-message",
-                        params=[self.discord_server_id, x],
+                        params=[self._reply_channel_id, x],
                     ),
                     description="Send a message to Discord channel. Action Input: message (str) - The text message you want to send to Discord.",
                     return_direct=True,
@@ -189,87 +206,36 @@ class ZerePyAgent:
                     ),
                     description="Get forum article content. Action Input: url (str) - The full URL of the forum article to fetch.",
                 ),
+                Tool(
+                    name="Analysis_Get",
+                    func=lambda x: self.get_analysis(x)
+                    or "No earlier analysis found.",
+                    description="Look up this agent's earlier analysis of a Snapshot proposal or forum update. Action Input: query (str) - The proposal id, forum URL or title.",
+                ),
             ]
 
-            api_key = os.getenv("OPENAI_API_KEY")
-            if not api_key:
+            if not os.getenv("OPENAI_API_KEY"):
                 raise ValueError("OPENAI_API_KEY environment variable is not set")
 
-            llm = ChatOpenAI(
-                temperature=0.3,
-                api_key=api_key,
-                model="gpt-4o",  # Specify model explicitly
-            )
+            self.llm_model = "gpt-4o"
 
-            template = """Assistant is a helpful AI named {name}. {bio}
+            system_prompt = """Assistant is a helpful AI named {name}. {bio}
 
 {instructions}
 
-TOOLS:
-------
-
-You have access to the following tools:
-
-{tools}
-
-IMPORTANT: You must ALWAYS follow this process:
-
-1. First, think about whether you need to use a tool to complete instructions
-2. If you need a tool, use this format:
-```
-Thought: Do I need to use a tool? Yes
-Action: the action to take, should be one of [{tool_names}]
-Action Input: the input to the action
-Observation: the result of the action
-```
-3. After each observation, start the process again with a new thought
-4. Only when you have all needed information and don't need any more tools, use this format:
-```
-Thought: Do I need to use a tool? No
-Final Answer: [your response here]
-```
-
-RULES:
-- NEVER respond directly to the Human without going through the thought process
-- ALWAYS start with "Thought: Do I need to use a tool?"
-- ALWAYS use a tool at least once before giving a Final Answer
-- After using a tool, ALWAYS start with a new thought about the observation
-- If you're unsure, use more tools to gather information
-
-Begin!
+Call a tool only when the task needs it; if several independent tools are
+needed, call them together. When no tool is needed, answer directly.
 
 Previous conversation history:
-{chat_history}
-
-New input: {input}
-{agent_scratchpad}"""
-
-            prompt = PromptTemplate(
-                template=template,
-                input_variables=[
-                    "input",
-                    "agent_scratchpad",
-                    "name",
-                    "bio",
-                    "instructions",
-                    "chat_history",
-                ],
-                partial_variables={
-                    "tools": "\n".join(
-                        [f"{tool.name}: {tool.description}" for tool in tools]
-                    ),
-                    "tool_names": ", ".join([tool.name for tool in tools]),
-                },
-            )
+{chat_history}"""
 
-            agent = create_react_agent(llm=llm, tools=tools, prompt=prompt)
-
-            self.agent = AgentExecutor(
-                agent=agent,
+            self.agent = ToolCallingExecutor(
                 tools=tools,
-                verbose=True,
+                model=self.llm_model,
+                system_prompt=system_prompt,
+                temperature=0.3,
                 max_iterations=3,
-                handle_parsing_errors=True,
+                verbose=True,
             )
 
         except Exception as e:
@@ -318,23 +284,32 @@ New input: {input}
 - Sign messages with "- chAIrman 🪑\""""
 
             # Format message context
-            input_text = f"""Message from {message.get('author', 'Unknown')}:
-{message.get('message', '')}
-
-{discord_personality}
+            builder = ContextBuilder(self.llm_model)
+            builder.add(
+                "message",
+                f"Message from {message.get('author', 'Unknown')}:\n{message.get('message', '')}",
+                ContextBuilder.HIGH,
+            )
+            builder.add(
+                "instructions",
+                f"""{discord_personality}
 
 If the message needs a response, use Discord_Send with a helpful reply.
-If not, briefly explain why."""
-
-            response = self.agent.invoke(
-                {
-                    "input": input_text,
-                    "name": "chAIrman",
-                    "bio": "I am the chAIrman of CoW Protocol's community.",
-                    "instructions": "You are chAIrman, CoW Protocol's community bot. Keep responses helpful and engaging.",
-                    "chat_history": "",
-                }
+If not, briefly explain why.""",
+                ContextBuilder.REQUIRED,
             )
+            input_text = builder.build()
+
+            with llm_usage_context(agent=self.name, task="discord-message"):
+                response = self.agent.invoke(
+                    {
+                        "input": input_text,
+                        "name": "chAIrman",
+                        "bio": "I am the chAIrman of CoW Protocol's community.",
+                        "instructions": "You are chAIrman, CoW Protocol's community bot. Keep responses helpful and engaging.",
+                        "chat_history": "",
+                    },
+                )
 
             if response and "output" in response:
                 # Mark message as processed regardless of whether we responded
@@ -352,56 +327,98 @@ If not, briefly explain why."""
         """Fetch and update latest Discord messages"""
         try:
             if self.discord_server_id:
-                messages = self.perform_action(
+                # Only messages newer than the last read come back, from the
+                # gateway queue or from REST reads after each watched channel's cursor
+                if self.discord_gateway:
+                    new_messages = self.perform_action(
+                        connection_name="discord",
+                        action_name="read-queued-messages",
+                        params=[],
+                    )
+                else:
+                    new_messages = self.perform_action(
+                        connection_name="discord",
+                        action_name="read-watched-messages",
+                        params=[10],
+                    )
+                if not new_messages:
+                    return
+
+                # Channels arrive interleaved round-robin; keep that order so
+                # each active channel gets its batch in turn
+                by_channel = {}
+                for msg in new_messages:
+                    by_channel.setdefault(msg["channel_id"], []).append(msg)
+                for channel_id, channel_messages in by_channel.items():
+                    self._update_discord_channel(channel_id, channel_messages)
+
+                # Only now are these safe to skip after a restart
+                self.perform_action(
                     connection_name="discord",
-                    action_name="read-messages",
-                    params=[self.discord_server_id, 10],  # Get last 10 messages
+                    action_name="commit-cursors",
+                    params=[new_messages],
                 )
-                logger.info(f"Retrieved {len(messages)} Discord messages")
-
-                if messages:
-                    # Sort messages by timestamp if available
-                    messages.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-
-                    # Get unprocessed messages from the latest batch
-                    unprocessed_messages = [
-                        msg
-                        for msg in messages
-                        if msg["id"] not in self.state["processed_message_ids"]
-                        and msg.get("message")  # Only messages with content
-                        and not (self.discord_ignore_bots and msg.get("is_bot", False))
-                    ]
-
-                    # Update state with all messages for context
-                    self.state["discord_messages"] = messages
-                    self.state["last_message_timestamps"]["discord"] = datetime.now()
-
-                    if unprocessed_messages:
-                        # Get context from older messages
-                        processed_messages = [
-                            msg
-                            for msg in messages
-                            if msg["id"] in self.state["processed_message_ids"]
-                            and msg.get("message")
-                        ][
-                            :5
-                        ]  # Get up to 5 recent processed messages for context
-
-                        # Combine messages for processing
-                        batch = processed_messages + unprocessed_messages
-                        batch.sort(key=lambda x: x.get("timestamp", ""))  # Sort by time
-
-                        logger.info(
-                            f"\n📨 Processing {len(unprocessed_messages)} new messages with {len(processed_messages)} context messages"
-                        )
-                        self._process_discord_messages_batch(
-                            batch,
-                            new_message_ids=[msg["id"] for msg in unprocessed_messages],
-                        )
 
         except Exception as e:
             logger.error(f"Failed to update Discord messages: {str(e)}")
 
+    def _update_discord_channel(self, channel_id, new_messages):
+        """Merge new messages of one channel into its context window and process them"""
+        # Keep the 10 most recent messages of the channel as context
+        recent = {
+            msg["id"]: msg
+            for msg in self.state["discord_messages"]
+            if msg.get("channel_id") == channel_id
+        }
+        recent.update({msg["id"]: msg for msg in new_messages})
+        messages = sorted(recent.values(), key=lambda x: x.get("timestamp", ""))[-10:]
+        logger.info(f"Retrieved {len(messages)} Discord messages from channel {channel_id}")
+
+        if messages:
+            # Sort messages by timestamp if available
+            messages.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
+
+            # Get unprocessed messages from the latest batch
+            unprocessed_messages = [
+                msg
+                for msg in messages
+                if msg["id"] not in self.state["processed_message_ids"]
+                and msg.get("message")  # Only messages with content
+                and not (self.discord_ignore_bots and msg.get("is_bot", False))
+            ]
+
+            # Update state with all messages for context
+            self.state["discord_messages"] = [
+                msg
+                for msg in self.state["discord_messages"]
+                if msg.get("channel_id") != channel_id
+            ] + messages
+            self.state["last_message_timestamps"]["discord"] = datetime.now()
+
+            if unprocessed_messages:
+                # Get context from older messages
+                processed_messages = [
+                    msg
+                    for msg in messages
+                    if msg["id"] in self.state["processed_message_ids"]
+                    and msg.get("message")
+                ][
+                    :5
+                ]  # Get up to 5 recent processed messages for context
+
+                # Combine messages for processing
+                batch = processed_messages + unprocessed_messages
+                batch.sort(key=lambda x: x.get("timestamp", ""))  # Sort by time
+
+                logger.info(
+                    f"\n📨 Processing {len(unprocessed_messages)} new messages with {len(processed_messages)} context messages"
+                )
+                self._reply_channel_id = channel_id
+                self._process_discord_messages_batch(
+                    batch,
+                    new_message_ids=[msg["id"] for msg in unprocessed_messages],
+                )
+
     def _process_discord_messages_batch(self, messages, new_message_ids):
         """Process a batch of Discord messages with context
         Args:
@@ -409,27 +426,31 @@ If not, briefly explain why."""
             new_message_ids: List of IDs of new messages that need responses
         """
         try:
-            # Format all messages for context
-            messages_context = "\n".join(
-                [
-                    f"Message {i+1}:\n"
-                    f"Author: {msg.get('author', 'Unknown')}\n"
-                    f"Content: {msg.get('message', '')}\n"
-                    f"Is New: {'Yes' if msg['id'] in new_message_ids else 'No (Context)'}\n"
-                    for i, msg in enumerate(messages)
-                ]
-            )
-
             discord_personality = """You are chAIrman 🪑, the CoW Protocol community bot.
 - Use emojis for engagement (🐮 for CoW, 📊 for trading)
 - Be helpful and clear
 - Sign messages with "- chAIrman 🪑\""""
 
-            input_text = f"""Here are Discord messages (older to newer):
-
-{messages_context}
-
-{discord_personality}
+            # New messages outrank context messages; the oldest context goes first
+            builder = ContextBuilder(self.llm_model)
+            builder.add(
+                "header",
+                "Here are Discord messages (older to newer):",
+                ContextBuilder.REQUIRED,
+            )
+            for i, msg in enumerate(messages):
+                is_new = msg["id"] in new_message_ids
+                builder.add(
+                    f"message-{msg['id']}",
+                    f"Message {i+1}:\n"
+                    f"Author: {msg.get('author', 'Unknown')}\n"
+                    f"Content: {msg.get('message', '')}\n"
+                    f"Is New: {'Yes' if is_new else 'No (Context)'}",
+                    ContextBuilder.HIGH if is_new else ContextBuilder.LOW,
+                )
+            builder.add(
+                "instructions",
+                f"""{discord_personality}
 
 Analyze the messages marked as "Is New: Yes" and decide if they need responses.
 Use the context from older messages to understand the conversation flow.
@@ -439,17 +460,21 @@ For each new message that needs a response:
 2. Keep responses relevant to the conversation context
 3. Always sign your messages with "- chAIrman 🪑"
 
-You can respond to multiple messages if needed. Focus on continuing the conversation naturally."""
-
-            response = self.agent.invoke(
-                {
-                    "input": input_text,
-                    "name": "chAIrman",
-                    "bio": "I am the chAIrman of CoW Protocol's community.",
-                    "instructions": "You are chAIrman, CoW Protocol's community bot. Keep responses helpful and engaging.",
-                    "chat_history": "",
-                }
+You can respond to multiple messages if needed. Focus on continuing the conversation naturally.""",
+                ContextBuilder.REQUIRED,
             )
+            input_text = builder.build()
+
+            with llm_usage_context(agent=self.name, task="discord-batch"):
+                response = self.agent.invoke(
+                    {
+                        "input": input_text,
+                        "name": "chAIrman",
+                        "bio": "I am the chAIrman of CoW Protocol's community.",
+                        "instructions": "You are chAIrman, CoW Protocol's community bot. Keep responses helpful and engaging.",
+                        "chat_history": "",
+                    },
+                )
 
             if response and "output" in response:
                 # Mark only new messages as processed
@@ -510,70 +535,213 @@ You can respond to multiple messages if needed. Focus on continuing the conversa
                     and not (self.discord_ignore_bots and msg.get("is_bot", False))
                 ]
                 if unprocessed:
+                    # A batch stays within one channel so the reply lands there
+                    channel_id = unprocessed[0].get("channel_id", self.discord_server_id)
+                    batch = [
+                        msg
+                        for msg in unprocessed
+                        if msg.get("channel_id", self.discord_server_id) == channel_id
+                    ][:3]
+                    self._reply_channel_id = channel_id
                     self._process_discord_messages_batch(
-                        unprocessed[:3]
+                        batch,
+                        new_message_ids=[msg["id"] for msg in batch],
                     )  # Process up to 3 messages
 
-            # Process Snapshot proposals
+            # Process Snapshot proposals, only new or edited ones reach the LLM
             if self.state["snapshot_proposals"]:
-                for proposal in self.state["snapshot_proposals"]:
+                for key, content_hash, proposal in self._changed_items(
+                    "snapshot", self.state["snapshot_proposals"], SNAPSHOT_ANALYSIS_FIELDS
+                ):
                     try:
-                        input_text = f"""Review this Snapshot proposal:
-Title: {proposal.get('title', 'Unknown')}
-Body: {proposal.get('body', 'No body')}
-
-Should we take any action on this proposal?"""
-
-                        response = self.agent.invoke(
-                            {
-                                "input": input_text,
-                                "name": self.name,
-                                "bio": (
-                                    self.bio[0] if self.bio else "I am an AI assistant."
-                                ),
-                                "instructions": "You are a governance assistant. Review proposals and suggest actions if needed.",
-                                "chat_history": "",
-                            }
+                        builder = ContextBuilder(self.llm_model)
+                        builder.add(
+                            "title",
+                            f"Review this Snapshot proposal:\nTitle: {proposal.get('title', 'Unknown')}",
+                            ContextBuilder.REQUIRED,
+                        )
+                        builder.add(
+                            "body",
+                            f"Body: {proposal.get('body', 'No body')}",
+                            ContextBuilder.NORMAL,
                         )
+                        builder.add(
+                            "question",
+                            "Should we take any action on this proposal?",
+                            ContextBuilder.REQUIRED,
+                        )
+                        input_text = builder.build()
+
+                        with llm_usage_context(agent=self.name, task="snapshot-proposal"):
+                            response = self.agent.invoke(
+                                {
+                                    "input": input_text,
+                                    "name": self.name,
+                                    "bio": (
+                                        self.bio[0] if self.bio else "I am an AI assistant."
+                                    ),
+                                    "instructions": "You are a governance assistant. Review proposals and suggest actions if needed.",
+                                    "chat_history": "",
+                                },
+                            )
                         if response and "output" in response:
+                            self._store_analysis(
+                                key, content_hash, response["output"], proposal.get("title")
+                            )
                             logger.info(
                                 f"Agent analysis for proposal [{proposal.get('title', 'Unknown')}]: {response['output']}"
                             )
+                        else:
+                            self._store_failure(key, content_hash, proposal.get("title"))
                     except Exception as e:
                         logger.error(f"Error processing Snapshot proposal: {str(e)}")
+                        self._store_failure(key, content_hash, proposal.get("title"))
 
-            # Process forum updates
+            # Process forum updates, only new or edited ones reach the LLM
             if self.state["forum_updates"]:
-                for update in self.state["forum_updates"]:
+                for key, content_hash, update in self._changed_items(
+                    "forum", self.state["forum_updates"], FORUM_ANALYSIS_FIELDS
+                ):
                     try:
-                        input_text = f"""Review this forum update:
+                        builder = ContextBuilder(self.llm_model)
+                        builder.add(
+                            "update",
+                            f"""Review this forum update:
 Title: {update.get('title', 'Unknown')}
 Category: {update.get('category', 'Unknown')}
-Author: {update.get('author', 'Unknown')}
-
-Should we get more details about this update using Forum_Get?"""
-
-                        response = self.agent.invoke(
-                            {
-                                "input": input_text,
-                                "name": self.name,
-                                "bio": (
-                                    self.bio[0] if self.bio else "I am an AI assistant."
-                                ),
-                                "instructions": "You are a forum moderator. Review updates and fetch details if interesting.",
-                                "chat_history": "",
-                            }
+Author: {update.get('author', 'Unknown')}""",
+                            ContextBuilder.HIGH,
+                        )
+                        builder.add(
+                            "question",
+                            "Should we get more details about this update using Forum_Get?",
+                            ContextBuilder.REQUIRED,
                         )
+                        input_text = builder.build()
+
+                        with llm_usage_context(agent=self.name, task="forum-update"):
+                            response = self.agent.invoke(
+                                {
+                                    "input": input_text,
+                                    "name": self.name,
+                                    "bio": (
+                                        self.bio[0] if self.bio else "I am an AI assistant."
+                                    ),
+                                    "instructions": "You are a forum moderator. Review updates and fetch details if interesting.",
+                                    "chat_history": "",
+                                },
+                            )
                         if response and "output" in response:
+                            self._store_analysis(
+                                key, content_hash, response["output"], update.get("title")
+                            )
                             logger.info(
                                 f"Agent review for forum update [{update.get('title', 'Unknown')}]: {response['output']}"
                             )
+                        else:
+                            self._store_failure(key, content_hash, update.get("title"))
                     except Exception as e:
                         logger.error(f"Error processing forum update: {str(e)}")
+                        self._store_failure(key, content_hash, update.get("title"))
 
         except Exception as e:
             logger.error(f"Error in _process_messages: {str(e)}")
 
+    def _load_analyses(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            if self.analyses_file.exists():
+                with open(self.analyses_file, "r") as f:
+                    return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load stored analyses: {str(e)}")
+        return {}
+
+    def _save_analyses(self):
+        analyses = self.state["analyses"]
+        if len(analyses) > MAX_STORED_ANALYSES:
+            newest = sorted(
+                analyses.items(), key=lambda kv: kv[1]["analyzed_at"], reverse=True
+            )
+            self.state["analyses"] = analyses = dict(newest[:MAX_STORED_ANALYSES])
+        try:
+            self.analyses_file.parent.mkdir(exist_ok=True)
+            tmp_path = self.analyses_file.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(analyses, f, indent=2)
+            os.replace(tmp_path, self.analyses_file)
+        except OSError as e:
+            logger.warning(f"Could not save analyses: {str(e)}")
+
+    @staticmethod
+    def _analysis_key(kind: str, item: dict) -> str:
+        item_id = item.get("id") or item.get("url") or item.get("title", "Unknown")
+        return f"{kind}:{item_id}"
+
+    @staticmethod
+    def _content_hash(item: dict, fields: Iterable[str]) -> str:
+        content = json.dumps(
+            {field: item.get(field) for field in fields}, sort_keys=True, default=str
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _changed_items(self, kind: str, items: list, fields: Iterable[str]) -> list:
+        """Return (key, content_hash, item) for items not yet analyzed at this revision"""
+        changed = []
+        now = time.time()
+        for item in items:
+            key = self._analysis_key(kind, item)
+            content_hash = self._content_hash(item, fields)
+            stored = self.state["analyses"].get(key)
+            if stored is None or stored["hash"] != content_hash:
+                changed.append((key, content_hash, item))
+            elif stored.get("output") is None and now >= stored.get("retry_at", 0):
+                # Failed last time and the backoff has passed
+                changed.append((key, content_hash, item))
+        return changed
+
+    def _store_analysis(
+        self, key: str, content_hash: str, output: str, title: Optional[str] = None
+    ):
+        self.state["analyses"][key] = {
+            "hash": content_hash,
+            "title": title,
+            "output": output,
+            "analyzed_at": datetime.now().isoformat(),
+        }
+        self._save_analyses()
+
+    def _store_failure(self, key: str, content_hash: str, title: Optional[str] = None):
+        """Mark this revision as failed so it is not re-sent on every tick"""
+        stored = self.state["analyses"].get(key)
+        failures = 1
+        if stored and stored["hash"] == content_hash and stored.get("output") is None:
+            failures = stored.get("failures", 0) + 1
+        delay = min(ANALYSIS_RETRY_BASE * 2 ** (failures - 1), ANALYSIS_RETRY_MAX)
+        self.state["analyses"][key] = {
+            "hash": content_hash,
+            "title": title,
+            "output": None,
+            "failures": failures,
+            "retry_at": time.time() + delay,
+            "analyzed_at": datetime.now().isoformat(),
+        }
+        logger.info(f"Analysis of {key} failed, retrying in {delay}s")
+        self._save_analyses()
+
+    def get_analysis(self, query: str) -> Optional[str]:
+        """Return the stored analysis of a proposal/forum update by id, URL or title"""
+        query = str(query).strip().lower()
+        if not query:
+            return None
+        for key, stored in self.state["analyses"].items():
+            if stored.get("output") is None:
+                continue
+            item_id = key.split(":", 1)[-1].lower()
+            title = (stored.get("title") or "").lower()
+            if query in (item_id, title) or (len(query) > 3 and query in title):
+                return stored["output"]
+        return None
+
     def _should_check_discord(self) -> bool:
         current_time = time.time()
         if current_time - self.last_discord_check >= self.discord_check_interval:
@@ -626,11 +794,14 @@ Should we get more details about this update using Forum_Get?"""
         try:
             while True:
                 try:
-                    # Update Discord messages every 20 seconds
-                    if self._should_check_discord():
-                        logger.info("\n👀 Checking Discord messages...")
+                    # Update Discord messages every 20 seconds, or every tick
+                    # when the gateway is queueing them
+                    if self.discord_gateway or self._should_check_discord():
+                        # The gateway check runs every tick, so keep it out of the info log
+                        level = logging.DEBUG if self.discord_gateway else logging.INFO
+                        logger.log(level, "\n👀 Checking Discord messages...")
                         self._update_discord_messages()
-                        logger.info("Discord messages updated")
+                        logger.log(level, "Discord messages updated")
 
                     # Update other services every minute
                     if self._should_check_services():
@@ -641,8 +812,11 @@ Should we get more details about this update using Forum_Get?"""
                     # Process all messages using LangChain agent
                     self._process_messages()
 
-                    # Short sleep to prevent CPU overuse
-                    time.sleep(1)
+                    # Short sleep to prevent CPU overuse; the gateway wakes us early
+                    if self.discord_gateway:
+                        self.connection_manager.connections["discord"].wait_for_messages(1)
+                    else:
+                        time.sleep(1)
 
                 except Exception as e:
                     logger.error(f"\n❌ Error in agent loop iteration: {e}")
@@ -5,13 +5,12 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 from datetime import datetime
-from langchain_openai import ChatOpenAI
-from langchain.agents import AgentExecutor, create_react_agent
-from langchain_core.prompts import PromptTemplate
 from langchain.tools import Tool
-from typing import Any
 from src.connection_manager import ConnectionManager
-from langchain_openai import OpenAI
+from src.helpers.context_builder import ContextBuilder
+from src.helpers.llm_metrics import llm_usage_context
+from src.helpers.proposal_store import ProposalStore, extract_cip_number
+from src.helpers.tool_executor import ToolCallingExecutor
 
 # Load environment variables
 load_dotenv()
@@ -53,18 +52,28 @@ class ZerePyAgent:
             self.discord_ignore_bots = discord_config.get("ignore_bots", True)
             self.connection_manager = ConnectionManager(agent_dict["config"])
 
+            # With gateway ingestion, messages arrive through on_message instead of REST polling
+            self.discord = self.connection_manager.connections["discord"]
+            self.discord_gateway = self.discord.ingest_mode == "gateway"
+            # Replies go to the channel of the batch being processed
+            self._reply_channel_id = self.discord_server_id
+
             # Initialize state
             self.state = {
                 "discord_messages": [],
                 "processed_message_ids": set(),
                 "last_check": 0,
                 "last_proposals_check": 0,
+                # Paces proposal refreshes in the gateway loop, where
+                # last_check moves with every ingested message
+                "last_proposals_poll": 0,
             }
 
-            self.proposals_file = Path("data") / f"{agent_name}_proposals.json"
-            self.proposals_file.parent.mkdir(exist_ok=True)
-            if not self.proposals_file.exists():
-                self._save_proposals([])
+            # Analyses from the old JSON file are imported on first run
+            self.proposal_store = ProposalStore(
+                Path("data") / f"{agent_name}_proposals.db",
+                legacy_json=Path("data") / f"{agent_name}_proposals.json",
+            )
 
             # Initialize LangChain agent
             self._setup_langchain_agent()
@@ -82,10 +91,10 @@ class ZerePyAgent:
                     func=lambda x: self.connection_manager.perform_action(
                         connection_name="discord",
                         action_name="post-message",
-                        params=[self.discord_server_id, x],
+                        params=[self._reply_channel_id, x],
                     ),
                     description="Send a message to Discord channel. Action Input: message (str) - The text message you want to send to Discord.",
-                    return_direct=False,
+                    return_direct=True,
                 ),
                 Tool(
                     name="Get_Analysis",
@@ -93,6 +102,12 @@ class ZerePyAgent:
                     description="Get analysis about CoW DAO proposals (CIPs). Action Input: proposal_number (str) - CIP number (e.g., '61' for CIP-61).",
                     return_direct=False,
                 ),
+                Tool(
+                    name="Search_Analyses",
+                    func=lambda x: self._search_analyses(x),
+                    description="Search stored CoW DAO proposal analyses by keywords when the CIP number is unknown. Action Input: keywords (str) - e.g. 'solver rewards'.",
+                    return_direct=False,
+                ),
                 Tool(
                     name="Get_Insight",
                     func=lambda x: self._get_insight(x),
@@ -101,59 +116,24 @@ class ZerePyAgent:
                 ),
             ]
 
-            llm = ChatOpenAI(
-                temperature=0.3,
-                model="gpt-4o",
-                api_key=os.getenv("OPENAI_API_KEY"),
-            )
-
-            template = """Answer the following questions as best you can. You have access to the following tools:
-
-{tools}
-
-Use the following format:
+            self.llm_model = "gpt-4o"
 
-Question: the input question you must answer
-Thought: you should always think about what to do
-Action: the action to take, should be one of [{tool_names}]
-Action Input: the input to the action
-Observation: the result of the action
-... (this Thought/Action/Action Input/Observation can repeat N times)
-Thought: I now know the final answer
-Final Answer: the final answer to the original input question
+            system_prompt = """Answer the following questions as best you can, using the tools when needed.
 
-For CIP-related queries, you must:
-1. First get the insight/analysis using appropriate tool
-2. Then use Discord_Send to share the information
-3. Only then provide the final answer
+For CIP-related queries, first get the insight/analysis using the appropriate tool,
+then use Discord_Send to share the information. Sending a message ends the turn.
+If nothing needs to be sent, answer directly without calling a tool.
 
-Begin!
+Previous conversation history:
+{chat_history}"""
 
-Question: {input}
-Thought:{agent_scratchpad}"""
-
-            prompt = PromptTemplate(
-                template=template,
-                input_variables=[
-                    "input",
-                    "agent_scratchpad",
-                ],
-                partial_variables={
-                    "tools": "\n".join(
-                        [f"{tool.name}: {tool.description}" for tool in tools]
-                    ),
-                    "tool_names": ", ".join([tool.name for tool in tools]),
-                },
-            )
-
-            agent = create_react_agent(llm=llm, tools=tools, prompt=prompt)
-            self.agent = AgentExecutor(
-                agent=agent,
+            self.agent = ToolCallingExecutor(
                 tools=tools,
-                verbose=True,
+                model=self.llm_model,
+                system_prompt=system_prompt,
+                temperature=0.3,
                 max_iterations=6,
-                handle_parsing_errors=True,
-                early_stopping_method="force",
+                verbose=True,
             )
             logger.info("✅ LangChain agent setup complete")
 
@@ -189,8 +169,11 @@ Thought:{agent_scratchpad}"""
 
             chat_history_str = "\n".join(chat_history[-5:])
 
-            input_text = f"""
-You are chAIrman 🪑, the CoW Protocol community bot.
+            # New messages outrank context messages; the oldest context goes first
+            builder = ContextBuilder(self.llm_model)
+            builder.add(
+                "instructions",
+                f"""You are chAIrman 🪑, the CoW Protocol community bot.
 - Use emojis for engagement (🐮 for CoW, 📊 for trading)
 - Sign messages with "- chAIrman 🪑"
 - IGNORE STUPID MESSAGES
@@ -206,19 +189,31 @@ IMPORTANT:
 - DO NOT respond to other bot messages
 - DO NOT respond to messages marked as "Is New: No"
 
-Here are Discord messages (older to newer):
-
-{messages_context}
-"""
-            response = self.agent.invoke(
-                {
-                    "input": input_text,
-                    "name": "chAIrman",
-                    "bio": "I am the chAIrman of CoW Protocol's community.",
-                    "instructions": "You are chAIrman, CoW Protocol's community bot. Keep responses helpful and engaging.",
-                    "chat_history": chat_history_str,
-                }
+Here are Discord messages (older to newer):""",
+                ContextBuilder.REQUIRED,
             )
+            for i, msg in enumerate(messages):
+                is_new = msg["id"] in new_message_ids
+                builder.add(
+                    f"message-{msg['id']}",
+                    f"Message {i+1}:\n"
+                    f"Author: {msg.get('author', 'Unknown')}\n"
+                    f"Content: {msg.get('message', '')}\n"
+                    f"Is New: {'Yes' if is_new else 'No (Context)'}\n"
+                    f"Timestamp: {msg.get('timestamp', 'Unknown')}",
+                    ContextBuilder.HIGH if is_new else ContextBuilder.LOW,
+                )
+            input_text = builder.build()
+            with llm_usage_context(agent=self.name, task="discord-batch"):
+                response = self.agent.invoke(
+                    {
+                        "input": input_text,
+                        "name": "chAIrman",
+                        "bio": "I am the chAIrman of CoW Protocol's community.",
+                        "instructions": "You are chAIrman, CoW Protocol's community bot. Keep responses helpful and engaging.",
+                        "chat_history": chat_history_str,
+                    },
+                )
 
             if response and "output" in response:
                 for msg_id in new_message_ids:
@@ -231,13 +226,47 @@ Here are Discord messages (older to newer):
             logger.error(f"Messages context: {messages_context}")
 
     def _update_messages(self):
-        try:
-            messages = self.connection_manager.perform_action(
+        # Only messages newer than the last read come back, from the gateway
+        # queue or from REST reads after each watched channel's cursor
+        if self.discord_gateway:
+            new_messages = self.connection_manager.perform_action(
                 connection_name="discord",
-                action_name="read-messages",
-                params=[self.discord_server_id, 4],
+                action_name="read-queued-messages",
+                params=[],
             )
-
+        else:
+            new_messages = self.connection_manager.perform_action(
+                connection_name="discord",
+                action_name="read-watched-messages",
+                params=[4],
+            )
+        if not new_messages:
+            return
+
+        # Channels arrive interleaved round-robin; keep that order so each
+        # active channel gets its batch in turn
+        by_channel = {}
+        for msg in new_messages:
+            by_channel.setdefault(msg["channel_id"], []).append(msg)
+        for channel_id, channel_messages in by_channel.items():
+            self._update_channel_messages(channel_id, channel_messages)
+
+        # Only now are these safe to skip after a restart
+        self.connection_manager.perform_action(
+            connection_name="discord",
+            action_name="commit-cursors",
+            params=[new_messages],
+        )
+
+    def _update_channel_messages(self, channel_id, new_messages):
+        try:
+            # Previously seen messages of the channel stay in the window as context
+            seen = [
+                msg
+                for msg in self.state["discord_messages"]
+                if msg.get("channel_id") == channel_id
+            ]
+            messages = seen[-4:] + new_messages
             if not messages:
                 logger.info("No messages received from Discord")
                 return
@@ -294,6 +323,7 @@ Here are Discord messages (older to newer):
                     logger.info(
                         f"Processing batch of {len(batch)} messages ({len(context_messages)} context, {len(new_messages)} new, {len(messages_to_process)} to process)"
                     )
+                    self._reply_channel_id = channel_id
                     self._process_messages_batch(
                         batch,
                         new_message_ids=[
@@ -305,27 +335,24 @@ Here are Discord messages (older to newer):
             else:
                 logger.info("No new messages")
 
-            self.state["discord_messages"] = valid_messages
+            self.state["discord_messages"] = [
+                msg
+                for msg in self.state["discord_messages"]
+                if msg.get("channel_id") != channel_id
+            ] + valid_messages
             self.state["last_check"] = time.time()
 
         except Exception as e:
             logger.error(f"Failed to update messages: {str(e)}")
             raise e
 
-    def _save_proposals(self, analyzed_proposals):
-        with open(self.proposals_file, "w") as f:
-            json.dump(analyzed_proposals, f)
-
     def _get_formatted_analyses(self):
         try:
-            proposals = self._load_proposals()
+            proposals = self.proposal_store.all()
             if not proposals:
                 return "No stored proposals found."
 
-            formatted_analyses = []
-            for p in proposals:
-                if isinstance(p, dict) and "analysis" in p:
-                    formatted_analyses.append(p["analysis"])
+            formatted_analyses = [p["analysis"] for p in proposals if p.get("analysis")]
 
             if not formatted_analyses:
                 return "No valid analyses found in stored proposals."
@@ -392,15 +419,32 @@ Priority Level: [High/Medium/Low]"""
                 f"{base_prompt}\n{custom_prompt}" if custom_prompt else base_prompt
             )
 
-            response = self.agent.invoke(
-                {
-                    "input": f"Analyze this proposal:\n{json.dumps(proposal, indent=2)}\n\nInstructions: {final_prompt}",
-                    "name": self.name,
-                    "bio": self.bio,
-                    "instructions": final_prompt,
-                    "chat_history": "",
-                }
+            # Proposal metadata goes in as compact JSON; the body is the
+            # only part worth truncating when the proposal is long
+            builder = ContextBuilder(self.llm_model)
+            builder.add_json(
+                "proposal",
+                {k: v for k, v in proposal.items() if k != "body"},
+                ContextBuilder.HIGH,
+                prefix="Analyze this proposal:\n",
+            )
+            builder.add(
+                "body", f"Body:\n{proposal.get('body', '')}", ContextBuilder.NORMAL
             )
+            builder.add(
+                "instructions", f"Instructions: {final_prompt}", ContextBuilder.REQUIRED
+            )
+
+            with llm_usage_context(agent=self.name, task="analyze-proposal"):
+                response = self.agent.invoke(
+                    {
+                        "input": builder.build(),
+                        "name": self.name,
+                        "bio": self.bio,
+                        "instructions": final_prompt,
+                        "chat_history": "",
+                    },
+                )
 
             analysis_text = response.get("output", "Failed to analyze proposal")
             if analysis_text == "Failed to analyze proposal":
@@ -419,12 +463,6 @@ Priority Level: [High/Medium/Low]"""
             logger.error(f"Failed to analyze proposal: {str(e)}")
             return None
 
-    def _load_proposals(self):
-        if self.proposals_file.exists():
-            with open(self.proposals_file, "r") as f:
-                return json.load(f)
-        return []
-
     def _update_proposals(self, space_id: str):
         try:
             current_time = time.time()
@@ -440,24 +478,17 @@ Priority Level: [High/Medium/Low]"""
             )
 
             if raw_proposals:
-                # Load existing analyzed proposals
-                existing_analyses = self._load_proposals()
-                existing_ids = {p["id"] for p in existing_analyses}
-
-                # Analyze new proposals
-                new_analyses = []
+                # Analyze new proposals, appending each to the store as it lands
+                added = 0
                 for proposal in raw_proposals:
-                    if proposal.get("id") not in existing_ids:
+                    if not self.proposal_store.has(proposal.get("id")):
                         analysis = self._analyze_proposal(proposal)
-                        if analysis:
-                            new_analyses.append(analysis)
+                        if analysis and self.proposal_store.add(analysis):
+                            added += 1
                             logger.info(f"Analyzed new proposal: {proposal.get('id')}")
 
-                # Update storage with new analyses
-                if new_analyses:
-                    all_analyses = existing_analyses + new_analyses
-                    self._save_proposals(all_analyses)
-                    logger.info(f"Added {len(new_analyses)} new proposal analyses")
+                if added:
+                    logger.info(f"Added {added} new proposal analyses")
 
                 self.state["last_proposals_check"] = current_time
 
@@ -472,6 +503,16 @@ Priority Level: [High/Medium/Low]"""
             while True:
                 try:
                     current_time = time.time()
+                    if self.discord_gateway:
+                        # Wakes as soon as the gateway queues a message
+                        if self.discord.wait_for_messages(1):
+                            self._update_messages()
+                        # The wait can take up to a second, so re-read the clock
+                        now = time.time()
+                        if now - self.state["last_proposals_poll"] >= 15:
+                            self.state["last_proposals_poll"] = now
+                            self._update_proposals("cow.eth")
+                        continue
                     if current_time - self.state["last_check"] >= 15:
                         self.state["last_check"] = current_time
                         self._update_messages()
@@ -507,15 +548,26 @@ Priority Level: [High/Medium/Low]"""
             return "Error retrieving insight"
 
     def _get_analysis(self, cip_number: str) -> str:
+        # Accepts "61", "CIP-61" or "cip 61"
+        text = str(cip_number).strip()
+        number = int(text) if text.isdigit() else extract_cip_number(text)
+        cip_id = f"CIP-{number if number is not None else text}"
         try:
-            proposals = self._load_proposals()
-            cip_id = f"CIP-{cip_number}"
-
-            for proposal in proposals:
-                if cip_id.lower() in proposal.get("analysis", "").lower():
-                    return proposal["analysis"]
+            proposal = self.proposal_store.get_by_cip(number) if number else None
+            if proposal:
+                return proposal["analysis"]
 
             return f"No analysis found for {cip_id}. Please check if this proposal exists and has been analyzed."
         except Exception as e:
             logger.error(f"Error getting CIP insight: {str(e)}")
             return f"Error retrieving insight for {cip_id}"
+
+    def _search_analyses(self, query: str) -> str:
+        try:
+            results = self.proposal_store.search(query)
+            if not results:
+                return f"No stored analyses match '{query}'."
+            return "\n\n---\n\n".join(r["analysis"] for r in results)
+        except Exception as e:
+            logger.error(f"Error searching analyses: {str(e)}")
+            return "Error searching stored analyses"
@@ -4,13 +4,13 @@ import os
 import httpx
 from pathlib import Path
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
-from langchain.agents import AgentExecutor, create_react_agent
-from langchain_core.prompts import PromptTemplate
 from langchain.tools import Tool
 from src.connections.safe_connection import SafeConnection
 from src.connections.cowprotocol_connection import CowProtocolConnection
 from src.connection_manager import ConnectionManager
+from src.helpers.context_builder import ContextBuilder
+from src.helpers.llm_metrics import llm_usage_context
+from src.helpers.tool_executor import ToolCallingExecutor
 
 load_dotenv()
 logger = logging.getLogger("agent")
@@ -137,51 +137,14 @@ class ZerePyAgent:
             ),
         ]
 
-        llm = ChatOpenAI(
-            temperature=0.3,
-            model="gpt-4",
-            api_key=os.getenv("OPENAI_API_KEY"),
-        )
-
-        template = """Answer the following questions as best you can. You have access to the following tools:
-
-{tools}
-
-Use the following format:
-
-Question: the input question you must answer
-Thought: you should always think about what to do
-Action: the action to take, should be one of [{tool_names}]
-Action Input: the input to the action
-Observation: the result of the action
-... (this Thought/Action/Action Input/Observation can repeat N times)
-Thought: I now know the final answer
-Final Answer: the final answer to the original input question
-
-Begin!
-
-Question: {input}
-Thought:{agent_scratchpad}"""
-
-        prompt = PromptTemplate(
-            template=template,
-            input_variables=["input", "agent_scratchpad"],
-            partial_variables={
-                "tools": "\n".join(
-                    [f"{tool.name}: {tool.description}" for tool in tools]
-                ),
-                "tool_names": ", ".join([tool.name for tool in tools]),
-            },
-        )
-
-        agent = create_react_agent(llm=llm, tools=tools, prompt=prompt)
-        self.agent = AgentExecutor(
-            agent=agent,
+        self.llm_model = "gpt-4"
+        self.agent = ToolCallingExecutor(
             tools=tools,
-            verbose=True,
+            model=self.llm_model,
+            system_prompt="Answer the following questions as best you can, using the tools when needed.",
+            temperature=0.3,
             max_iterations=6,
-            handle_parsing_errors=True,
-            early_stopping_method="force",
+            verbose=True,
         )
         logger.info("✅ LangChain agent setup complete")
 
@@ -232,7 +195,10 @@ Thought:{agent_scratchpad}"""
 
     def run_prompt(self, prompt: str) -> str:
         try:
-            input_context = f"""You are {self.name}, {self.bio}
+            builder = ContextBuilder(self.llm_model)
+            builder.add(
+                "instructions",
+                f"""You are {self.name}, {self.bio}
 
 Tools usage chain:
 
@@ -249,17 +215,18 @@ ETH_ADDRESS=0xeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeee
 COW_ADDRESS=0x0625aFB445C3B6B7B929342a04A22599fd5dBB59
 
 IF SOME OF TOOLS RETURN NONE, STOP THE LOOP
-
-
-User Query: {prompt}
-"""
-            response = self.agent.invoke(
-                {
-                    "input": input_context,
-                    "name": self.name,
-                    "bio": self.bio,
-                }
+""",
+                ContextBuilder.REQUIRED,
             )
+            builder.add("query", f"User Query: {prompt}", ContextBuilder.HIGH)
+            with llm_usage_context(agent=self.name, task="prompt"):
+                response = self.agent.invoke(
+                    {
+                        "input": builder.build(),
+                        "name": self.name,
+                        "bio": self.bio,
+                    },
+                )
             return response.get("output", "Failed to process prompt")
         except Exception as e:
             logger.error(f"Error processing prompt: {str(e)}")
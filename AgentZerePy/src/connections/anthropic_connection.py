@@ -1,9 +1,12 @@
 import logging
 import os
+import time
 from typing import Dict, Any
-from dotenv import load_dotenv, set_key
+from dotenv import set_key
 from anthropic import Anthropic, NotFoundError
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_cache
+from src.helpers.llm_metrics import usage_tracker
 
 logger = logging.getLogger("connections.anthropic_connection")
 
@@ -23,6 +26,8 @@ class AnthropicConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        # Credential version whose key last passed validation
+        self._validated_version = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -70,7 +75,7 @@ class AnthropicConnection(BaseConnection):
     def _get_client(self) -> Anthropic:
         """Get or create Anthropic client"""
         if not self._client:
-            api_key = os.getenv("ANTHROPIC_API_KEY")
+            api_key = credential_cache.get("ANTHROPIC_API_KEY")
             if not api_key:
                 raise AnthropicConfigurationError("Anthropic API key not found in environment")
             self._client = Anthropic(api_key=api_key)
@@ -114,13 +119,16 @@ class AnthropicConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if Anthropic API key is configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv('ANTHROPIC_API_KEY')
+            version = credential_cache.refresh()
+            api_key = credential_cache.get('ANTHROPIC_API_KEY')
             if not api_key:
                 return False
 
-            client = Anthropic(api_key=api_key)
-            client.models.list()
+            # Only a changed .env needs another round trip to validate
+            if self._validated_version != version:
+                client = Anthropic(api_key=api_key)
+                client.models.list()
+                self._validated_version = version
             return True
             
         except Exception as e:
@@ -137,6 +145,7 @@ class AnthropicConnection(BaseConnection):
             if not model:
                 model = self.config["model"]
 
+            started = time.monotonic()
             message = client.messages.create(
                 model=model,
                 max_tokens=1000,
@@ -154,6 +163,16 @@ class AnthropicConnection(BaseConnection):
                     }
                 ]
             )
+            usage = message.usage
+            cached_tokens = getattr(usage, "cache_read_input_tokens", 0) or 0
+            usage_tracker.record(
+                "anthropic",
+                model,
+                prompt_tokens=usage.input_tokens + cached_tokens,
+                completion_tokens=usage.output_tokens,
+                cached_tokens=cached_tokens,
+                latency=time.monotonic() - started,
+            )
             return message.content[0].text
             
         except Exception as e:
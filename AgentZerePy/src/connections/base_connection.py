@@ -22,8 +22,12 @@ class Action:
             if param.required and param.name not in params:
                 errors.append(f"Missing required parameter: {param.name}")
             elif param.name in params:
+                value = params[param.name]
+                if param.type is list and isinstance(value, str):
+                    # From the CLI or an agent: "a,b" or a single bare value
+                    value = [item.strip() for item in value.split(",") if item.strip()]
                 try:
-                    params[param.name] = param.type(params[param.name])
+                    params[param.name] = param.type(value)
                 except ValueError:
                     errors.append(f"Invalid type for {param.name}. Expected {param.type.__name__}")
         return errors
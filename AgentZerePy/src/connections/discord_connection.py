@@ -1,17 +1,53 @@
+import atexit
 import os
+import re
+import time
 import logging
 import asyncio
-from typing import Dict, Any
-from dotenv import set_key, load_dotenv
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from dotenv import set_key
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from src.helpers import print_h_bar
+from src.helpers.async_loop import BackgroundEventLoop
+from src.helpers.credentials import credential_cache
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import discord
 from discord.ext import commands
 
 logger = logging.getLogger("connections.discord_connection")
 
+DEFAULT_MESSAGE_QUEUE_SIZE = 500
+DEFAULT_READ_WORKERS = 8
+
+# Discord returns at most 100 messages per request
+MAX_PAGE_SIZE = 100
+MAX_CATCH_UP_PAGES = 10
+CURSORS_FILE = Path("data") / "discord_cursors.json"
+# Committed cursors are written to disk at most this often
+CURSOR_SAVE_INTERVAL = 10
+
+# Discord allows 50 requests per second per bot across all routes
+GLOBAL_RATE_LIMIT = 50
+MAX_RATE_LIMIT_RETRIES = 5
+# Window assumed for a refilled bucket until a response tells the real reset
+FALLBACK_RESET_AFTER = 1.0
+# Connect/read timeout for each REST request
+REQUEST_TIMEOUT = 15
+
+# How long the blocking send helpers wait for their future
+SEND_TIMEOUT = 30
+
+# Top-level resource ids get their own buckets; other ids and emoji share one
+_MAJOR_PARAMETER = re.compile(r"^/(channels|guilds|webhooks)/(\d+)")
+_MINOR_ID = re.compile(r"/\d{15,}")
+_REACTION_EMOJI = re.compile(r"/reactions/[^/]+")
+
 
 class DiscordConnectionError(Exception):
     """Base exception for Discord connection errors"""
@@ -31,12 +67,126 @@ class DiscordAPIError(DiscordConnectionError):
     pass
 
 
+class DiscordRateLimiter:
+    """
+    Client-side view of Discord's rate limits.
+
+    Requests are grouped into routes (method plus path with minor ids
+    stripped). The X-RateLimit-Bucket header maps each route to a shared
+    bucket, whose Remaining/Reset-After headers tell how many more requests
+    fit before the reset. A request that would overdraw its bucket, or the
+    global per-second limit, waits until it fits instead of drawing a 429.
+    """
+
+    def __init__(self, global_limit: int = GLOBAL_RATE_LIMIT):
+        self.global_limit = global_limit
+        self._lock = threading.Lock()
+        self._route_buckets: Dict[str, str] = {}
+        self._buckets: Dict[str, Dict[str, Any]] = {}
+        self._recent = deque()
+        self._global_blocked_until = 0.0
+
+    @staticmethod
+    def route(method: str, url_path: str) -> str:
+        path = url_path.split("?", 1)[0]
+        match = _MAJOR_PARAMETER.match(path)
+        major = match.group(0) if match else ""
+        rest = _MINOR_ID.sub("/:id", path[len(major):])
+        rest = _REACTION_EMOJI.sub("/reactions/:emoji", rest)
+        return f"{method} {major}{rest}"
+
+    def _bucket_key(self, route: str) -> str:
+        major = route.split(" ", 1)[1]
+        match = _MAJOR_PARAMETER.match(major)
+        bucket_hash = self._route_buckets.get(route)
+        if bucket_hash is None:
+            return route
+        return f"{bucket_hash}:{match.group(0) if match else ''}"
+
+    def acquire(self, route: str) -> None:
+        """Block until a request on route fits in its bucket and the global limit"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = self._global_blocked_until - now
+
+                while self._recent and self._recent[0] <= now - 1:
+                    self._recent.popleft()
+                if len(self._recent) >= self.global_limit:
+                    wait = max(wait, self._recent[0] + 1 - now)
+
+                bucket = self._buckets.get(self._bucket_key(route))
+                if bucket is not None:
+                    if bucket["reset_at"] <= now:
+                        # The next response tells when the new window really
+                        # resets; a finite guess keeps a lost response from
+                        # blocking the bucket forever
+                        bucket["remaining"] = bucket["limit"]
+                        bucket["reset_at"] = now + FALLBACK_RESET_AFTER
+                    if bucket["remaining"] <= 0:
+                        wait = max(wait, bucket["reset_at"] - now)
+
+                if wait <= 0:
+                    if bucket is not None:
+                        bucket["remaining"] -= 1
+                    self._recent.append(now)
+                    return
+            # Short naps so a response that refills the bucket is picked up
+            time.sleep(min(wait, 0.25))
+
+    def release(self, route: str) -> None:
+        """Give back a slot taken by acquire() for a request that got no rate limit headers"""
+        with self._lock:
+            bucket = self._buckets.get(self._bucket_key(route))
+            if bucket is not None and bucket["reset_at"] > time.monotonic():
+                bucket["remaining"] = min(bucket["remaining"] + 1, bucket["limit"])
+
+    def update(self, route: str, headers) -> bool:
+        """Sync a route's bucket with X-RateLimit-* response headers, True if they were present"""
+        bucket_hash = headers.get("X-RateLimit-Bucket")
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset_after = headers.get("X-RateLimit-Reset-After")
+        if bucket_hash is None or remaining is None or reset_after is None:
+            return False
+        with self._lock:
+            self._route_buckets[route] = bucket_hash
+            key = self._bucket_key(route)
+            bucket = self._buckets.get(key)
+            limit = int(headers.get("X-RateLimit-Limit", remaining))
+            remaining = int(remaining)
+            # Requests still in flight were already counted against remaining
+            if bucket is not None and bucket["reset_at"] > time.monotonic():
+                remaining = min(remaining, bucket["remaining"])
+            self._buckets[key] = {
+                "limit": limit,
+                "remaining": remaining,
+                "reset_at": time.monotonic() + float(reset_after),
+            }
+        return True
+
+    def block(self, route: str, retry_after: float, is_global: bool) -> None:
+        """Hold back requests after a 429"""
+        with self._lock:
+            until = time.monotonic() + retry_after
+            if is_global:
+                self._global_blocked_until = max(self._global_blocked_until, until)
+                return
+            key = self._bucket_key(route)
+            bucket = self._buckets.setdefault(
+                key, {"limit": 1, "remaining": 0, "reset_at": until}
+            )
+            bucket["remaining"] = 0
+            bucket["reset_at"] = max(bucket["reset_at"], until)
+
+
 class DiscordConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.base_url = "https://discord.com/api/v10"
         self.bot_username = None
-        self.token = config.get("DISCORD_TOKEN") or os.getenv("DISCORD_TOKEN")
+        self.token = config.get("DISCORD_TOKEN") or credential_cache.get("DISCORD_TOKEN")
+        # Credential version whose token last passed _test_connection
+        self._validated_version = None
         if not self.token:
             raise ValueError("Discord token is required")
 
@@ -45,11 +195,48 @@ class DiscordConnection(BaseConnection):
         intents.message_content = True
         self.client = discord.Client(intents=intents)
 
-        # Start bot in background
-        self.bg_task = None
-        self.loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self.loop)
-        self.bg_task = self.loop.create_task(self.client.start(self.token))
+        # Channels the agent watches; server_id alone keeps the single-channel setup
+        self.channels = list(
+            dict.fromkeys(str(c) for c in config.get("channels") or [config["server_id"]])
+        )
+        # With a guild id, one channel listing tells which channels have new messages
+        self.guild_id = config.get("guild_id")
+        self.read_workers = config.get("read_workers", DEFAULT_READ_WORKERS)
+        self._next_channel = 0
+
+        # "gateway" pushes new messages from on_message into bounded per-channel
+        # queues; "poll" (default) leaves reading to the REST read actions
+        self.ingest_mode = config.get("ingest", "poll")
+        self.message_queue_size = config.get(
+            "message_queue_size", DEFAULT_MESSAGE_QUEUE_SIZE
+        )
+        self._channel_queues: Dict[str, deque] = {}
+        self._queue_lock = threading.Lock()
+        self._messages_available = threading.Event()
+        self._watched_channels = set(self.channels)
+
+        # REST calls share keep-alive connections and one view of the rate limits
+        self.rate_limiter = DiscordRateLimiter()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.read_workers)
+        self._session.mount("https://", adapter)
+
+        # Per-channel id of the newest message the agent has handled, kept
+        # across restarts, and of the newest message read so far. Messages
+        # read but not committed are read again after a restart.
+        self._cursors_lock = threading.Lock()
+        self._cursors: Dict[str, str] = self._load_cursors()
+        self._read_positions: Dict[str, str] = dict(self._cursors)
+        self._cursors_dirty = False
+        self._cursors_saved_at = 0.0
+        atexit.register(self.flush_cursors)
+        self.client.event(self.on_message)
+
+        # The client lives on its own loop thread, which keeps the gateway
+        # connection alive and runs sends submitted from any thread
+        self._client_loop = BackgroundEventLoop("discord-client").start()
+        self.loop = self._client_loop.loop
+        self.bg_task = self._client_loop.submit(self.client.start(self.token))
 
         # Test the token
         self._test_connection(self.token)
@@ -80,6 +267,12 @@ class DiscordConnection(BaseConnection):
             raise ValueError("message_emoji_name must be a valid string")
         if not isinstance(config["server_id"], str) or len(config["server_id"]) <= 0:
             raise ValueError("server_id must be a valid string")
+        if "channels" in config and (
+            not isinstance(config["channels"], list)
+            or not config["channels"]
+            or not all(isinstance(c, str) and c for c in config["channels"])
+        ):
+            raise ValueError("channels must be a non-empty list of channel id strings")
 
         return config
 
@@ -104,6 +297,36 @@ class DiscordConnection(BaseConnection):
                 ],
                 description="Get the latest messages from a channel",
             ),
+            "read-new-messages": Action(
+                name="read-new-messages",
+                parameters=[
+                    ActionParameter(
+                        "channel_id",
+                        True,
+                        str,
+                        "The channel id to get messages from",
+                    ),
+                    ActionParameter(
+                        "count",
+                        False,
+                        int,
+                        "Number of messages to retrieve on the first read",
+                    ),
+                ],
+                description="Get the messages posted in a channel since the last read",
+            ),
+            "read-watched-messages": Action(
+                name="read-watched-messages",
+                parameters=[
+                    ActionParameter(
+                        "count",
+                        False,
+                        int,
+                        "Number of messages to retrieve on the first read of a channel",
+                    ),
+                ],
+                description="Get the messages posted in all watched channels since the last read",
+            ),
             "read-mentioned-messages": Action(
                 name="read-mentioned-messages",
                 parameters=[
@@ -174,6 +397,36 @@ class DiscordConnection(BaseConnection):
                 ],
                 description="Post a new message",
             ),
+            "read-queued-messages": Action(
+                name="read-queued-messages",
+                parameters=[
+                    ActionParameter(
+                        "count",
+                        False,
+                        int,
+                        "Maximum number of messages to take from the queue",
+                    ),
+                    ActionParameter(
+                        "timeout",
+                        False,
+                        float,
+                        "Seconds to wait for a message if the queue is empty",
+                    ),
+                ],
+                description="Take messages pushed by the gateway since the last read (ingest: gateway)",
+            ),
+            "commit-cursors": Action(
+                name="commit-cursors",
+                parameters=[
+                    ActionParameter(
+                        "messages",
+                        True,
+                        list,
+                        "Messages the agent has finished handling",
+                    ),
+                ],
+                description="Mark messages as handled so they are not read again after a restart",
+            ),
             "list-channels": Action(
                 name="list-channels",
                 parameters=[
@@ -227,13 +480,19 @@ class DiscordConnection(BaseConnection):
 
     def is_configured(self, verbose=False) -> bool:
         """Check if Discord API key is configured and valid"""
+        # A logged-in gateway session already proves the token works
+        if self.client.is_ready():
+            return True
         try:
-            load_dotenv()
-            api_key = os.getenv("DISCORD_TOKEN")
+            version = credential_cache.refresh()
+            api_key = credential_cache.get("DISCORD_TOKEN")
             if not api_key:
                 return False
 
-            self._test_connection(api_key)
+            # Only a changed .env needs another round trip to validate
+            if self._validated_version != version:
+                self._test_connection(api_key)
+                self._validated_version = version
             return True
         except Exception as e:
             if verbose:
@@ -250,7 +509,7 @@ class DiscordConnection(BaseConnection):
             raise ValueError(f"Invalid parameters: {', '.join(errors)}")
 
         # Add config parameters if not provided
-        if action_name == "read-messages":
+        if action_name in ("read-messages", "read-new-messages", "read-watched-messages"):
             if "count" not in kwargs:
                 kwargs["count"] = self.config["message_read_count"]
         elif action_name == "read-mentioned-messages":
@@ -288,6 +547,166 @@ class DiscordConnection(BaseConnection):
         logger.info(f"Retrieved {len(formatted_response)} messages")
         return formatted_response
 
+    def _load_cursors(self) -> Dict[str, str]:
+        try:
+            if CURSORS_FILE.exists():
+                with open(CURSORS_FILE, "r") as f:
+                    return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load Discord read cursors: {e}")
+        return {}
+
+    def _save_cursors(self) -> None:
+        try:
+            CURSORS_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = CURSORS_FILE.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self._cursors, f)
+            os.replace(tmp_path, CURSORS_FILE)
+            self._cursors_dirty = False
+            self._cursors_saved_at = time.monotonic()
+        except OSError as e:
+            logger.warning(f"Could not save Discord read cursors: {e}")
+
+    def get_cursor(self, channel_id: str) -> Optional[str]:
+        """Id of the newest message read from the channel"""
+        with self._cursors_lock:
+            return self._read_positions.get(str(channel_id))
+
+    def _advance_read_position(self, channel_id: str, message_id: str) -> None:
+        with self._cursors_lock:
+            current = self._read_positions.get(str(channel_id))
+            if current is None or int(message_id) > int(current):
+                self._read_positions[str(channel_id)] = message_id
+
+    def commit_cursors(self, messages: List[dict], **kwargs) -> None:
+        """Persist the newest handled message per channel, at most every CURSOR_SAVE_INTERVAL"""
+        newest = {}
+        for message in messages:
+            channel_id = str(message["channel_id"])
+            newest[channel_id] = max(newest.get(channel_id, 0), int(message["id"]))
+        with self._cursors_lock:
+            for channel_id, message_id in newest.items():
+                current = self._cursors.get(channel_id)
+                if current is None or message_id > int(current):
+                    self._cursors[channel_id] = str(message_id)
+                    self._cursors_dirty = True
+                # Also covers gateway messages, which never went through a REST read
+                read = self._read_positions.get(channel_id)
+                if read is None or message_id > int(read):
+                    self._read_positions[channel_id] = str(message_id)
+            if (
+                self._cursors_dirty
+                and time.monotonic() - self._cursors_saved_at >= CURSOR_SAVE_INTERVAL
+            ):
+                self._save_cursors()
+
+    def flush_cursors(self) -> None:
+        """Write committed cursors that are still waiting for the save interval"""
+        with self._cursors_lock:
+            if self._cursors_dirty:
+                self._save_cursors()
+
+    def read_new_messages(self, channel_id: str, count: int, **kwargs) -> List[dict]:
+        """Read messages posted after the channel's cursor, oldest first"""
+        cursor = self.get_cursor(channel_id)
+        if cursor is None:
+            # First read of this channel: start from the latest messages
+            raw_messages = self._get_request(
+                f"/channels/{channel_id}/messages?limit={min(count, MAX_PAGE_SIZE)}"
+            )
+        else:
+            # Page forward from the cursor until a short page shows we caught up
+            raw_messages = []
+            after = cursor
+            for _ in range(MAX_CATCH_UP_PAGES):
+                page = self._get_request(
+                    f"/channels/{channel_id}/messages?after={after}&limit={MAX_PAGE_SIZE}"
+                )
+                raw_messages.extend(page)
+                if len(page) < MAX_PAGE_SIZE:
+                    break
+                after = max(page, key=lambda m: int(m["id"]))["id"]
+            else:
+                logger.warning(
+                    f"Channel {channel_id} has more than {MAX_CATCH_UP_PAGES * MAX_PAGE_SIZE} "
+                    "unread messages, the rest is picked up on the next read"
+                )
+
+        # Snowflakes sort by creation time
+        raw_messages.sort(key=lambda m: int(m["id"]))
+        # The cursor on disk only moves once the caller commits these
+        if raw_messages:
+            self._advance_read_position(channel_id, raw_messages[-1]["id"])
+
+        formatted_response = self._format_messages(raw_messages)
+        logger.info(f"Retrieved {len(formatted_response)} new messages")
+        return formatted_response
+
+    def _active_channels(self) -> List[str]:
+        """Watched channels that may have messages past their cursor"""
+        if not self.guild_id:
+            return list(self.channels)
+        try:
+            # One request covers every channel, so idle channels cost nothing
+            guild_channels = self._get_request(f"/guilds/{self.guild_id}/channels")
+        except DiscordAPIError as e:
+            logger.warning(f"Could not list channels of guild {self.guild_id}: {e}")
+            return list(self.channels)
+        last_message_ids = {
+            str(c["id"]): c.get("last_message_id") for c in guild_channels
+        }
+        active = []
+        for channel_id in self.channels:
+            last_message_id = last_message_ids.get(channel_id)
+            cursor = self.get_cursor(channel_id)
+            if channel_id not in last_message_ids or cursor is None:
+                active.append(channel_id)
+            elif last_message_id and int(last_message_id) > int(cursor):
+                active.append(channel_id)
+        return active
+
+    def _rotate_channels(self, channels: List[str]) -> List[str]:
+        """Start each round at the next channel so none is always served last"""
+        if not channels:
+            return channels
+        start = self._next_channel % len(channels)
+        self._next_channel += 1
+        return channels[start:] + channels[:start]
+
+    @staticmethod
+    def _interleave(groups: List[List[dict]]) -> List[dict]:
+        """Merge per-channel lists round-robin, keeping each channel's order"""
+        merged = []
+        for i in range(max((len(g) for g in groups), default=0)):
+            merged.extend(g[i] for g in groups if i < len(g))
+        return merged
+
+    def read_watched_messages(self, count: int, **kwargs) -> List[dict]:
+        """Read new messages from every watched channel concurrently"""
+        channels = self._rotate_channels(self._active_channels())
+        if not channels:
+            return []
+
+        def read(channel_id):
+            try:
+                return self.read_new_messages(channel_id, count)
+            except DiscordAPIError as e:
+                # One unreadable channel should not hide the others
+                logger.warning(f"Could not read channel {channel_id}: {e}")
+                return []
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.read_workers, len(channels)))
+        ) as executor:
+            groups = list(executor.map(read, channels))
+
+        messages = self._interleave(groups)
+        logger.info(
+            f"Retrieved {len(messages)} new messages from {len(channels)}/{len(self.channels)} channels"
+        )
+        return messages
+
     def read_mentioned_messages(self, channel_id: str, count: int, **kwargs) -> dict:
         """Reads messages in a channel and filters for bot mentioned messages"""
         messages = self.read_messages(channel_id, count)
@@ -296,19 +715,87 @@ class DiscordConnection(BaseConnection):
         logger.info(f"Retrieved {len(mentioned_messages)} mentioned messages")
         return mentioned_messages
 
-    def post_message(self, channel_id: str, message: str, **kwargs) -> dict:
-        """Send a new message using Discord client"""
+    async def on_message(self, message) -> None:
+        """Gateway event: queue new messages from watched channels"""
+        if self.ingest_mode != "gateway":
+            return
+        if self.client.user and message.author.id == self.client.user.id:
+            return
+        if str(message.channel.id) not in self._watched_channels:
+            return
+
+        formatted_message = {
+            "id": str(message.id),
+            "channel_id": str(message.channel.id),
+            "author": message.author.name,
+            "message": message.content,
+            "timestamp": message.created_at.isoformat(),
+            "mentions": [
+                {"id": str(user.id), "username": user.name} for user in message.mentions
+            ],
+            "is_bot": message.author.bot,
+        }
+        with self._queue_lock:
+            channel_queue = self._channel_queues.setdefault(
+                formatted_message["channel_id"], deque()
+            )
+            if len(channel_queue) >= self.message_queue_size:
+                # Keep the newest messages; the oldest are least worth answering
+                dropped = channel_queue.popleft()
+                logger.warning(
+                    f"Discord message queue for channel {dropped['channel_id']} full, "
+                    f"dropped message {dropped['id']}"
+                )
+            channel_queue.append(formatted_message)
+        self._messages_available.set()
 
-        async def _send_message():
-            channel = await self.client.fetch_channel(int(channel_id))
-            sent_message = await channel.send(content=message)
-            return sent_message
+    def _has_queued_messages(self) -> bool:
+        with self._queue_lock:
+            return any(self._channel_queues.values())
 
-        try:
-            # Run the async function in the event loop
-            sent_message = self.loop.run_until_complete(_send_message())
+    def wait_for_messages(self, timeout: float) -> bool:
+        """Block until the gateway queued a message or the timeout passed"""
+        if self._has_queued_messages():
+            return True
+        self._messages_available.clear()
+        # Re-check after clearing so a message queued in between is not missed
+        if self._has_queued_messages():
+            return True
+        return self._messages_available.wait(timeout)
+
+    def read_queued_messages(self, count: int = None, timeout: float = 0, **kwargs) -> List[dict]:
+        """Take queued gateway messages round-robin across channels, oldest first per channel"""
+        if timeout and not self._has_queued_messages():
+            self.wait_for_messages(timeout)
+
+        with self._queue_lock:
+            # A busy channel cannot use up count before quieter ones get a turn
+            channels = self._rotate_channels(
+                [c for c, q in self._channel_queues.items() if q]
+            )
+            groups = [list(self._channel_queues[c]) for c in channels]
+            messages = self._interleave(groups)
+            if count is not None:
+                messages = messages[:count]
+            taken = {m["id"] for m in messages}
+            for channel_id in channels:
+                channel_queue = self._channel_queues[channel_id]
+                while channel_queue and channel_queue[0]["id"] in taken:
+                    channel_queue.popleft()
+        if messages:
+            # commit_cursors() moves the cursors once these are handled, so a
+            # switch to polling does not re-read them
+            logger.info(f"Took {len(messages)} queued messages")
+        return messages
+
+    def submit_message(self, channel_id: str, message: str) -> Future:
+        """Schedule a new message on the client loop; the Future resolves to the posted message"""
 
-            formatted_response = self._format_posted_message(
+        async def _send_message():
+            await self.client.wait_until_ready()
+            channel = self.client.get_partial_messageable(int(channel_id))
+            sent_message = await channel.send(content=message)
+            return self._format_posted_message(
                 {
                     "id": str(sent_message.id),
                     "channel_id": str(sent_message.channel.id),
@@ -321,6 +808,26 @@ class DiscordConnection(BaseConnection):
                 }
             )
 
+        return self._client_loop.submit(_send_message())
+
+    def submit_reply(self, channel_id: str, message_id: str, message: str) -> Future:
+        """Schedule a reply; it goes through the rate-limited REST path off the loop thread"""
+        return self._client_loop.submit(
+            asyncio.to_thread(self._send_reply, channel_id, message_id, message)
+        )
+
+    def submit_reaction(self, channel_id: str, message_id: str, emoji_name: str) -> Future:
+        """Schedule a reaction; it goes through the rate-limited REST path off the loop thread"""
+        return self._client_loop.submit(
+            asyncio.to_thread(self._send_reaction, channel_id, message_id, emoji_name)
+        )
+
+    def post_message(self, channel_id: str, message: str, **kwargs) -> dict:
+        """Send a new message using Discord client"""
+        try:
+            formatted_response = self.submit_message(channel_id, message).result(
+                SEND_TIMEOUT
+            )
             logger.info("Message posted successfully")
             return formatted_response
 
@@ -332,6 +839,21 @@ class DiscordConnection(BaseConnection):
         self, channel_id: str, message_id: str, message: str, **kwargs
     ) -> dict:
         """Reply to a message"""
+        formatted_response = self.submit_reply(channel_id, message_id, message).result(
+            SEND_TIMEOUT
+        )
+        logger.info("Reply message posted successfully")
+        return formatted_response
+
+    def react_to_message(
+        self, channel_id: str, message_id: str, emoji_name: str, **kwargs
+    ) -> None:
+        """React to a message"""
+        self.submit_reaction(channel_id, message_id, emoji_name).result(SEND_TIMEOUT)
+        logger.info("Reacted to message successfully")
+        return
+
+    def _send_reply(self, channel_id: str, message_id: str, message: str) -> dict:
         logger.debug("Replying to a message")
 
         request_path = f"/channels/{channel_id}/messages"
@@ -345,15 +867,9 @@ class DiscordConnection(BaseConnection):
             }
         )
         response = self._post_request(request_path, payload)
-        formatted_response = self._format_reply_message(response)
+        return self._format_reply_message(response)
 
-        logger.info("Reply message posted successfully")
-        return formatted_response
-
-    def react_to_message(
-        self, channel_id: str, message_id: str, emoji_name: str, **kwargs
-    ) -> None:
-        """React to a message"""
+    def _send_reaction(self, channel_id: str, message_id: str, emoji_name: str) -> None:
         logger.debug("Reacting to a message")
 
         request_path = (
@@ -361,9 +877,6 @@ class DiscordConnection(BaseConnection):
         )
         self._put_request(request_path)
 
-        logger.info("Reacted to message successfully")
-        return
-
     def _format_reply_message(self, reply_message: dict) -> dict:
         """Helper method to format reply messages"""
         mentions = []
@@ -424,14 +937,55 @@ class DiscordConnection(BaseConnection):
             formatted_channels.append(formatted_channel)
         return formatted_channels
 
-    def _put_request(self, url_path: str) -> None:
-        """Helper method to make PUT request"""
+    def _request(self, method: str, url_path: str, payload: str = None) -> requests.Response:
+        """Send a REST request within the rate limits, retrying 429s"""
         url = f"{self.base_url}{url_path}"
         headers = {
             "Accept": "application/json",
             "Authorization": self._get_request_auth_token(),
         }
-        response = requests.request("PUT", url, headers=headers, data={})
+        if payload is not None:
+            headers["Content-Type"] = "application/json"
+        route = self.rate_limiter.route(method, url_path)
+
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            self.rate_limiter.acquire(route)
+            synced = False
+            try:
+                response = self._session.request(
+                    method,
+                    url,
+                    headers=headers,
+                    data=payload if payload is not None else {},
+                    timeout=REQUEST_TIMEOUT,
+                )
+                synced = self.rate_limiter.update(route, response.headers)
+            finally:
+                if not synced:
+                    self.rate_limiter.release(route)
+            if response.status_code != 429 or attempt == MAX_RATE_LIMIT_RETRIES:
+                return response
+
+            try:
+                body = response.json()
+            except ValueError:
+                body = {}
+            retry_after = float(
+                body.get("retry_after") or response.headers.get("Retry-After") or 1
+            )
+            is_global = bool(body.get("global")) or (
+                response.headers.get("X-RateLimit-Global") == "true"
+            )
+            self.rate_limiter.block(route, retry_after, is_global)
+            logger.warning(
+                f"Discord rate limited on {route}{' (global)' if is_global else ''}, "
+                f"retrying in {retry_after:.2f}s (attempt {attempt + 1}/{MAX_RATE_LIMIT_RETRIES})"
+            )
+        return response
+
+    def _put_request(self, url_path: str) -> None:
+        """Helper method to make PUT request"""
+        response = self._request("PUT", url_path)
         if response.status_code != 204:
             raise DiscordAPIError(
                 f"Failed to called PUT to Discord: {response.status_code} - {response.text}"
@@ -440,13 +994,7 @@ class DiscordConnection(BaseConnection):
 
     def _post_request(self, url_path: str, payload: str) -> dict:
         """Helper method to make POST request"""
-        url = f"{self.base_url}{url_path}"
-        headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "Authorization": self._get_request_auth_token(),
-        }
-        response = requests.request("POST", url, headers=headers, data=payload)
+        response = self._request("POST", url_path, payload)
         if response.status_code != 200:
             raise DiscordAPIError(
                 f"Failed to call POST to Discord: {response.status_code} - {response.text}"
@@ -455,13 +1003,7 @@ class DiscordConnection(BaseConnection):
 
     def _get_request(self, url_path: str) -> str:
         """Helper method to make GET request"""
-        url = f"{self.base_url}{url_path}"
-        headers = {
-            "Accept": "application/json",
-            "Authorization": self._get_request_auth_token(),
-        }
-        print(headers)
-        response = requests.request("GET", url, headers=headers, data={})
+        response = self._request("GET", url_path)
         if response.status_code != 200:
             raise DiscordAPIError(
                 f"Failed to call GET to Discord: {response.status_code} - {response.text}"
@@ -469,7 +1011,7 @@ class DiscordConnection(BaseConnection):
         return json.loads(response.text)
 
     def _get_request_auth_token(self) -> str:
-        return f"Bot {os.getenv('DISCORD_TOKEN')}"
+        return f"Bot {credential_cache.get('DISCORD_TOKEN')}"
 
     def _test_connection(self, api_key: str) -> None:
         """Helper method to check if Discord is reachable"""
@@ -509,9 +1051,7 @@ class DiscordConnection(BaseConnection):
 
     def stop(self):
         """Stop the Discord client"""
-        if self.bg_task and not self.bg_task.cancelled():
-            self.bg_task.cancel()
-        if self.client:
-            self.loop.run_until_complete(self.client.close())
-        if self.loop:
-            self.loop.close()
+        try:
+            self._client_loop.run(self.client.close(), timeout=10)
+        finally:
+            self._client_loop.stop()
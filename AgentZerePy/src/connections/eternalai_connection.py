@@ -1,10 +1,15 @@
 import logging
 import os
+import time
 import json
-from typing import Dict, Any
-from dotenv import load_dotenv, set_key
+from pathlib import Path
+from typing import Dict, Any, Optional
+from dotenv import set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_cache
+from src.helpers.llm_metrics import record_completion_usage
+from src.helpers.llm_pool import AsyncLLMClientPool, get_client_pool
 from web3 import Web3
 import requests
 
@@ -12,6 +17,9 @@ logger = logging.getLogger("connections.eternalai_connection")
 IPFS = "ipfs://"
 LIGHTHOUSE_IPFS = "https://gateway.lighthouse.storage/ipfs/"
 GCS_ETERNAL_AI_BASE_URL = "https://cdn.eternalai.org/upload/"
+# On-chain prompt pointers are re-read this often; content behind an IPFS CID never changes
+DEFAULT_PROMPT_REVALIDATE_SECONDS = 300
+IPFS_CACHE_DIR = Path("data") / "ipfs_cache"
 AGENT_CONTRACT_ABI = [{"inputs": [{"internalType": "uint256","name": "_agentId","type": "uint256"}],"name": "getAgentSystemPrompt","outputs": [{"internalType": "bytes[]","name": "","type": "bytes[]"}],"stateMutability": "view","type": "function"}]
 
 class EternalAIConnectionError(Exception):
@@ -33,6 +41,12 @@ class EternalAIConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        # Credential version whose key last passed validation
+        self._validated_version = None
+        self._pool = None
+        self._web3: Dict[str, Web3] = {}
+        # (chain_id, contract_address, agent_id) -> {"pointer", "prompt", "checked_at"}
+        self._on_chain_prompts: Dict[tuple, Dict[str, Any]] = {}
 
     @property
     def is_llm_provider(self) -> bool:
@@ -80,13 +94,30 @@ class EternalAIConnection(BaseConnection):
     def _get_client(self) -> OpenAI:
         """Get or create EternalAI client"""
         if not self._client:
-            api_key = os.getenv("EternalAI_API_KEY")
-            api_url = os.getenv("EternalAI_API_URL")
+            api_key = credential_cache.get("EternalAI_API_KEY")
+            api_url = credential_cache.get("EternalAI_API_URL")
             if not api_key or not api_url:
                 raise EternalAIConfigurationError("EternalAI credentials not found in environment")
             self._client = OpenAI(api_key=api_key, base_url=api_url)
         return self._client
 
+    def _get_pool(self) -> AsyncLLMClientPool:
+        """Get or create the shared async EternalAI client pool"""
+        if not self._pool:
+            api_key = credential_cache.get("EternalAI_API_KEY")
+            api_url = credential_cache.get("EternalAI_API_URL")
+            if not api_key or not api_url:
+                raise EternalAIConfigurationError("EternalAI credentials not found in environment")
+            self._pool = get_client_pool(
+                "eternalai",
+                api_key,
+                base_url=api_url,
+                rpm_limit=self.config.get("rpm_limit"),
+                tpm_limit=self.config.get("tpm_limit"),
+                max_concurrency=self.config.get("max_concurrency"),
+            )
+        return self._pool
+
     def configure(self) -> bool:
         """Sets up EternalAI API authentication"""
         logger.info("\n🤖 EternalAI API SETUP")
@@ -128,14 +159,17 @@ class EternalAIConnection(BaseConnection):
     def is_configured(self, verbose=False) -> bool:
         """Check if EternalAI API credentials are configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv('EternalAI_API_KEY')
-            api_url = os.getenv('EternalAI_API_URL')
+            version = credential_cache.refresh()
+            api_key = credential_cache.get('EternalAI_API_KEY')
+            api_url = credential_cache.get('EternalAI_API_URL')
             if not api_key or not api_url:
                 return False
 
-            client = OpenAI(api_key=api_key, base_url=api_url)
-            client.models.list()
+            # Only a changed .env needs another round trip to validate
+            if self._validated_version != version:
+                client = OpenAI(api_key=api_key, base_url=api_url)
+                client.models.list()
+                self._validated_version = version
             return True
 
         except Exception as e:
@@ -143,30 +177,91 @@ class EternalAIConnection(BaseConnection):
                 logger.debug(f"Configuration check failed: {e}")
             return False
 
+    @staticmethod
+    def _ipfs_cache_path(on_chain_data: str) -> Path:
+        cid = on_chain_data[on_chain_data.index(IPFS) + len(IPFS):].strip()
+        return IPFS_CACHE_DIR / cid.replace("/", "_")
+
     @staticmethod
     def get_on_chain_system_prompt_content(on_chain_data: str) -> str:
         if IPFS in on_chain_data:
+            # IPFS content is addressed by its CID, so a cached copy never goes stale
+            cache_path = EternalAIConnection._ipfs_cache_path(on_chain_data)
+            if cache_path.exists():
+                return cache_path.read_text(encoding="utf-8")
+
             light_house = on_chain_data.replace(IPFS, LIGHTHOUSE_IPFS)
-            response = requests.get(light_house)
-            if response.status_code == 200:
-                return response.text
-            else:
+            response = requests.get(light_house, timeout=30)
+            if response.status_code != 200:
                 gcs = on_chain_data.replace(IPFS, GCS_ETERNAL_AI_BASE_URL)
-                response = requests.get(gcs)
-                if response.status_code == 200:
-                    return response.text
-                else:
+                response = requests.get(gcs, timeout=30)
+                if response.status_code != 200:
                     raise Exception(f"invalid on-chain system prompt response status{response.status_code}")
+
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = cache_path.with_suffix(".tmp")
+                tmp_path.write_text(response.text, encoding="utf-8")
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                logger.warning(f"Could not cache IPFS content {cache_path.name}: {e}")
+            return response.text
         else:
             if len(on_chain_data) > 0:
                 return on_chain_data
             else:
                 raise Exception(f"invalid on-chain system prompt")
 
+    def _get_web3(self, rpc: str) -> Web3:
+        if rpc not in self._web3:
+            self._web3[rpc] = Web3(Web3.HTTPProvider(rpc))
+            logger.info(f"web3 connected to {rpc} {self._web3[rpc].is_connected()}")
+        return self._web3[rpc]
+
+    def _get_on_chain_system_prompt(self, chain_id: str, contract_address: str, agent_id, rpc: str) -> Optional[str]:
+        """
+        Resolve the agent's on-chain system prompt, cached per (chain, contract, agent).
+
+        The cached prompt is served until it is older than the revalidate
+        interval; the pointer stored on-chain is then re-read (one eth_call)
+        and the content is only fetched again if the pointer changed.
+        """
+        key = (chain_id, contract_address, agent_id)
+        cached = self._on_chain_prompts.get(key)
+        ttl = self.config.get("prompt_revalidate_seconds", DEFAULT_PROMPT_REVALIDATE_SECONDS)
+        now = time.monotonic()
+        if cached and now - cached["checked_at"] < ttl:
+            return cached["prompt"]
+
+        try:
+            contract = self._get_web3(rpc).eth.contract(address=contract_address, abi=AGENT_CONTRACT_ABI)
+            result = contract.functions.getAgentSystemPrompt(agent_id).call()
+        except Exception as e:
+            logger.error(f"get on-chain system_prompt fail {e}")
+            # Keep serving the last known prompt while the RPC is unavailable
+            return cached["prompt"] if cached else None
+
+        if len(result) == 0:
+            return None
+        pointer = result[0].decode("utf-8")
+        if cached and cached["pointer"] == pointer:
+            cached["checked_at"] = now
+            return cached["prompt"]
+
+        logger.info(f"on-chain system_prompt: {pointer}")
+        try:
+            system_prompt = self.get_on_chain_system_prompt_content(pointer)
+        except Exception as e:
+            logger.error(f"get on-chain system_prompt fail {e}")
+            return cached["prompt"] if cached else None
+        self._on_chain_prompts[key] = {"pointer": pointer, "prompt": system_prompt, "checked_at": now}
+        logger.info(f"new system_prompt: {system_prompt}")
+        return system_prompt
+
     def generate_text(self, prompt: str, system_prompt: str, model: str = None, chain_id: str = None, **kwargs) -> str:
         """Generate text using EternalAI models"""
         try:
-            client = self._get_client()
+            pool = self._get_pool()
             model = model or self.config["model"]
             logger.info(f"model {model}")
 
@@ -181,20 +276,12 @@ class EternalAIConnection(BaseConnection):
 
             if agent_id and contract_address and rpc:
                 logger.info(f"agent_id: {agent_id}, contract_address: {contract_address}")
-                # call on-chain system prompt
-                web3 = Web3(Web3.HTTPProvider(rpc))
-                logger.info(f"web3 connected to {rpc} {web3.is_connected()}")
-                contract = web3.eth.contract(address=contract_address, abi=AGENT_CONTRACT_ABI)
-                result = contract.functions.getAgentSystemPrompt(agent_id).call()
-                logger.info(f"on-chain system_prompt: {result}")
-                if len(result) > 0:
-                    try:
-                        system_prompt = self.get_on_chain_system_prompt_content(result[0].decode("utf-8"))
-                        logging.info(f"new system_prompt: {system_prompt}")
-                    except Exception as e:
-                        logger.error(f"get on-chain system_prompt fail {e}")
-
-            completion = client.chat.completions.create(
+                on_chain_prompt = self._get_on_chain_system_prompt(chain_id, contract_address, agent_id, rpc)
+                if on_chain_prompt:
+                    system_prompt = on_chain_prompt
+
+            started = time.monotonic()
+            completion = pool.chat_completion(
                 model=model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -202,6 +289,7 @@ class EternalAIConnection(BaseConnection):
                 ],
                 extra_body={"chain_id": chain_id}
             )
+            record_completion_usage("eternalai", model, completion, started)
 
             if completion.choices is None:
                 raise EternalAIAPIError(f"Text generation failed: completion.choices is None")
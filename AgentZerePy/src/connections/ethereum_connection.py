@@ -3,12 +3,13 @@ import os
 import time
 import requests
 from typing import Dict, Any, Optional, Union
-from dotenv import load_dotenv, set_key
+from dotenv import set_key
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
 from src.constants.networks import EVM_NETWORKS
 from src.constants.abi import ERC20_ABI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_cache
 
 logger = logging.getLogger("connections.ethereum_connection")
 
@@ -20,6 +21,7 @@ class EthereumConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Ethereum connection...")
         self._web3 = None
+        self._validated_version = None
         self.NATIVE_TOKEN = "0xEeeeeEeeeEeEeeEeEeEeeEEEeeeeEeeeeeeeEEeE"
         
         # Get network configuration
@@ -143,10 +145,6 @@ class EthereumConnection(BaseConnection):
             if len(private_key) != 66 or not all(c in '0123456789abcdefABCDEF' for c in private_key[2:]):
                 raise ValueError("Invalid private key format")
             
-            # Test private key by deriving address
-            account = self._web3.eth.account.from_key(private_key)
-            logger.info(f"\nDerived address: {account.address}")
-            
             # Get optional block explorer API key
             explorer_key = input("\nEnter your block explorer API key (optional, press Enter to skip): ")
             
@@ -154,6 +152,11 @@ class EthereumConnection(BaseConnection):
             set_key('.env', 'ETH_PRIVATE_KEY', private_key)
             if explorer_key:
                 set_key('.env', f'ETH_EXPLORER_KEY', explorer_key)
+            credential_cache.invalidate()
+
+            # Test private key by deriving address
+            account = self._get_account()
+            logger.info(f"\nDerived address: {account.address}")
 
             logger.info("\n✅ Ethereum configuration saved successfully!")
             return True
@@ -162,13 +165,18 @@ class EthereumConnection(BaseConnection):
             logger.error(f"Configuration failed: {str(e)}")
             return False
 
+    def _get_account(self, required: bool = True):
+        """The wallet account, derived once and reused until .env changes"""
+        account = credential_cache.evm_account('ETH_PRIVATE_KEY')
+        if account is None and required:
+            raise EthereumConnectionError("No wallet private key configured in .env")
+        return account
+
     def is_configured(self, verbose: bool = False) -> bool:
         """Check if Ethereum connection is properly configured"""
         try:
-            load_dotenv()
-            
             # Check private key exists
-            private_key = os.getenv('ETH_PRIVATE_KEY')
+            private_key = credential_cache.get('ETH_PRIVATE_KEY')
             if not private_key:
                 if verbose:
                     logger.error("Missing ETH_PRIVATE_KEY in .env")
@@ -180,9 +188,12 @@ class EthereumConnection(BaseConnection):
                     logger.error("Not connected to Ethereum network")
                 return False
                 
-            # Test account access
-            account = self._web3.eth.account.from_key(private_key)
-            balance = self._web3.eth.get_balance(account.address)
+            # Test account access, once per version of .env
+            version = credential_cache.refresh()
+            if self._validated_version != version:
+                account = self._get_account()
+                self._web3.eth.get_balance(account.address)
+                self._validated_version = version
                 
             return True
 
@@ -193,8 +204,7 @@ class EthereumConnection(BaseConnection):
 
     def get_address(self) -> str:
         try:
-            private_key = os.getenv('ETH_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             return f"Your Ethereum address: {account.address}"
         except Exception as e:
             return f"Failed to get address: {str(e)}"
@@ -279,12 +289,10 @@ class EthereumConnection(BaseConnection):
         """
         try:
             # Get wallet address from private key
-            private_key = os.getenv('ETH_PRIVATE_KEY')
-            if not private_key:
+            account = self._get_account(required=False)
+            if account is None:
                 return "No wallet private key configured in .env"
             
-            account = self._web3.eth.account.from_key(private_key)
-            
             # If no token address provided, use native token (ETH)
             if token_address is None:
                 # Get native token (ETH) balance
@@ -336,8 +344,7 @@ class EthereumConnection(BaseConnection):
     ) -> Dict[str, Any]:
         """Prepare transfer transaction with proper gas estimation"""
         try:
-            private_key = os.getenv('ETH_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             
             # Get latest nonce and gas price
             nonce = self._web3.eth.get_transaction_count(account.address)
@@ -395,8 +402,7 @@ class EthereumConnection(BaseConnection):
 
             # Prepare and send transaction
             tx = self._prepare_transfer_tx(to_address, amount, token_address)
-            private_key = os.getenv('ETH_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             
             signed = account.sign_transaction(tx)
             tx_hash = self._web3.eth.send_raw_transaction(signed.rawTransaction)
@@ -464,8 +470,7 @@ class EthereumConnection(BaseConnection):
     ) -> Dict[str, Any]:
         """Build swap transaction using route data"""
         try:
-            private_key = os.getenv('ETH_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             
             url = f"{self.aggregator_api}/route/build"
             headers = {"x-client-id": "zerepy"}
@@ -519,8 +524,7 @@ class EthereumConnection(BaseConnection):
         ) -> Optional[str]:
             """Handle token approval for spender, returns tx hash if approval needed"""
             try:
-                private_key = os.getenv('ETH_PRIVATE_KEY')
-                account = self._web3.eth.account.from_key(private_key)
+                account = self._get_account()
                 
                 token_contract = self._web3.eth.contract(
                     address=Web3.to_checksum_address(token_address),
@@ -579,8 +583,7 @@ class EthereumConnection(BaseConnection):
     ) -> str:
         """Execute token swap using Kyberswap aggregator"""
         try:
-            private_key = os.getenv('ETH_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
 
             # Validate balance
             current_balance = self.get_balance(
@@ -633,8 +636,6 @@ class EthereumConnection(BaseConnection):
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
 
-        load_dotenv()
-        
         if not self.is_configured(verbose=True):
             raise EthereumConnectionError("Ethereum connection is not properly configured")
 
@@ -1,11 +1,15 @@
 import logging
 import os
+import time
 from typing import Dict, Any
 
 import requests
-from dotenv import load_dotenv, set_key
+from dotenv import set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_cache
+from src.helpers.llm_metrics import record_completion_usage
+from src.helpers.llm_pool import AsyncLLMClientPool, get_client_pool
 
 logger = logging.getLogger("connections.galadriel_connection")
 
@@ -27,6 +31,9 @@ class GaladrielConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        # Credential version whose key last passed validation
+        self._validated_version = None
+        self._pool = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -63,16 +70,37 @@ class GaladrielConnection(BaseConnection):
     def _get_client(self) -> OpenAI:
         """Get or create Galadriel client"""
         if not self._client:
-            api_key = os.getenv("GALADRIEL_API_KEY")
+            api_key = credential_cache.get("GALADRIEL_API_KEY")
             if not api_key:
                 raise GaladrielConfigurationError("Galadriel API key not found in environment")
 
             headers = {}
-            if fine_tune_api_key := os.getenv("GALADRIEL_FINE_TUNE_API_KEY"):
+            if fine_tune_api_key := credential_cache.get("GALADRIEL_FINE_TUNE_API_KEY"):
                 headers["Fine-Tune-Authorization"] = f"Bearer {fine_tune_api_key}"
             self._client = OpenAI(api_key=api_key, base_url=API_BASE_URL, default_headers=headers)
         return self._client
 
+    def _get_pool(self) -> AsyncLLMClientPool:
+        """Get or create the shared async Galadriel client pool"""
+        if not self._pool:
+            api_key = credential_cache.get("GALADRIEL_API_KEY")
+            if not api_key:
+                raise GaladrielConfigurationError("Galadriel API key not found in environment")
+
+            headers = {}
+            if fine_tune_api_key := credential_cache.get("GALADRIEL_FINE_TUNE_API_KEY"):
+                headers["Fine-Tune-Authorization"] = f"Bearer {fine_tune_api_key}"
+            self._pool = get_client_pool(
+                "galadriel",
+                api_key,
+                base_url=API_BASE_URL,
+                default_headers=headers,
+                rpm_limit=self.config.get("rpm_limit"),
+                tpm_limit=self.config.get("tpm_limit"),
+                max_concurrency=self.config.get("max_concurrency"),
+            )
+        return self._pool
+
     def configure(self) -> bool:
         """Sets up Galadriel API authentication"""
         logger.info("\n🤖 GALADRIEL API SETUP")
@@ -115,12 +143,17 @@ class GaladrielConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if Galadriel API key is configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv('GALADRIEL_API_KEY')
+            version = credential_cache.refresh()
+            api_key = credential_cache.get('GALADRIEL_API_KEY')
             if not api_key:
                 return False
 
-            return self._is_api_key_valid(api_key)
+            # Only a changed .env needs another round trip to validate
+            if self._validated_version != version:
+                if not self._is_api_key_valid(api_key):
+                    return False
+                self._validated_version = version
+            return True
         except Exception as e:
             if verbose:
                 logger.debug(f"Configuration check failed: {e}")
@@ -139,19 +172,21 @@ class GaladrielConnection(BaseConnection):
     def generate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
         """Generate text using Galadriel models"""
         try:
-            client = self._get_client()
+            pool = self._get_pool()
 
             # Use configured model if none provided
             if not model:
                 model = self.config["model"]
 
-            completion = client.chat.completions.create(
+            started = time.monotonic()
+            completion = pool.chat_completion(
                 model=model,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": prompt},
                 ],
             )
+            record_completion_usage("galadriel", model, completion, started)
 
             return completion.choices[0].message.content
 
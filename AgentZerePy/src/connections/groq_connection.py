@@ -1,9 +1,13 @@
 import logging
 import os
+import time
 from typing import Dict, Any
-from dotenv import load_dotenv, set_key
+from dotenv import set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_cache
+from src.helpers.llm_metrics import record_completion_usage
+from src.helpers.llm_pool import AsyncLLMClientPool, get_client_pool
 
 logger = logging.getLogger("connections.groq_connection")
 
@@ -23,6 +27,9 @@ class GroqConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        # Credential version whose key last passed validation
+        self._validated_version = None
+        self._pool = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -71,7 +78,7 @@ class GroqConnection(BaseConnection):
     def _get_client(self) -> OpenAI:
         """Get or create Groq client"""
         if not self._client:
-            api_key = os.getenv("GROQ_API_KEY")
+            api_key = credential_cache.get("GROQ_API_KEY")
             if not api_key:
                 raise GroqConfigurationError("Groq API key not found in environment")
             self._client = OpenAI(
@@ -80,6 +87,22 @@ class GroqConnection(BaseConnection):
             )
         return self._client
 
+    def _get_pool(self) -> AsyncLLMClientPool:
+        """Get or create the shared async Groq client pool"""
+        if not self._pool:
+            api_key = credential_cache.get("GROQ_API_KEY")
+            if not api_key:
+                raise GroqConfigurationError("Groq API key not found in environment")
+            self._pool = get_client_pool(
+                "groq",
+                api_key,
+                base_url="https://api.groq.com/openai/v1",
+                rpm_limit=self.config.get("rpm_limit"),
+                tpm_limit=self.config.get("tpm_limit"),
+                max_concurrency=self.config.get("max_concurrency"),
+            )
+        return self._pool
+
     def configure(self) -> bool:
         """Sets up Groq API authentication"""
         logger.info("\n🤖 GROQ API SETUP")
@@ -120,16 +143,19 @@ class GroqConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if Groq API key is configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv('GROQ_API_KEY')
+            version = credential_cache.refresh()
+            api_key = credential_cache.get('GROQ_API_KEY')
             if not api_key:
                 return False
 
-            client = OpenAI(
-                api_key=api_key,
-                base_url="https://api.groq.com/openai/v1"
-            )
-            client.models.list()
+            # Only a changed .env needs another round trip to validate
+            if self._validated_version != version:
+                client = OpenAI(
+                    api_key=api_key,
+                    base_url="https://api.groq.com/openai/v1"
+                )
+                client.models.list()
+                self._validated_version = version
             return True
             
         except Exception as e:
@@ -140,13 +166,14 @@ class GroqConnection(BaseConnection):
     def generate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
         """Generate text using Groq models"""
         try:
-            client = self._get_client()
+            pool = self._get_pool()
             
             # Use configured model if none provided
             if not model:
                 model = self.config["model"]
 
-            completion = client.chat.completions.create(
+            started = time.monotonic()
+            completion = pool.chat_completion(
                 model=model,
                 messages=[
                     {"role": "system", "content": system_prompt},
@@ -154,6 +181,7 @@ class GroqConnection(BaseConnection):
                 ],
                 
             )
+            record_completion_usage("groq", model, completion, started)
 
             return completion.choices[0].message.content
             
@@ -196,9 +224,6 @@ class GroqConnection(BaseConnection):
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
 
-        # Explicitly reload environment variables
-        load_dotenv()
-        
         if not self.is_configured(verbose=True):
             raise GroqConfigurationError("Groq is not properly configured")
 
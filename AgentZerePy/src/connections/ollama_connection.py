@@ -1,11 +1,27 @@
 import logging
+import threading
+import time
 import requests
 import json
+from requests.adapters import HTTPAdapter
 from typing import Dict, Any
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.llm_metrics import usage_tracker
 
 logger = logging.getLogger("connections.ollama_connection")
 
+# How long Ollama keeps the model in memory after a request
+DEFAULT_KEEP_ALIVE = "30m"
+# Model loads on CPU-only hosts can take minutes
+WARMUP_TIMEOUT = 600
+
+# Ollama reports durations in nanoseconds
+TIMING_FIELDS = {
+    "load_duration": "load_seconds",
+    "prompt_eval_duration": "prompt_eval_seconds",
+    "eval_duration": "eval_seconds",
+}
+
 
 class OllamaConnectionError(Exception):
     """Base exception for Ollama connection errors"""
@@ -21,6 +37,12 @@ class OllamaConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self.base_url = config.get("base_url", "http://localhost:11434")  # Default to local Ollama setup
+        self.keep_alive = config.get("keep_alive", DEFAULT_KEEP_ALIVE)
+        self._session = requests.Session()
+        self._session.mount("http://", HTTPAdapter(pool_maxsize=4))
+        self._session.mount("https://", HTTPAdapter(pool_maxsize=4))
+        if config.get("preload", True):
+            threading.Thread(target=self.warm_up, name="ollama-warmup", daemon=True).start()
 
     @property
     def is_llm_provider(self) -> bool:
@@ -79,12 +101,32 @@ class OllamaConnection(BaseConnection):
         """Test if Ollama is reachable"""
         try:
             url = f"{self.base_url}/v1/models"
-            response = requests.get(url)
+            response = self._session.get(url, timeout=10)
             if response.status_code != 200:
                 raise OllamaAPIError(f"Failed to connect to Ollama: {response.status_code} - {response.text}")
         except Exception as e:
             raise OllamaConnectionError(f"Connection test failed: {e}")
 
+    def warm_up(self, model: str = None) -> bool:
+        """Load the model into memory so the first generation skips the load"""
+        model = model or self.config["model"]
+        try:
+            # A generate request without a prompt only loads the model
+            response = self._session.post(
+                f"{self.base_url}/api/generate",
+                json={"model": model, "keep_alive": self.keep_alive},
+                timeout=WARMUP_TIMEOUT,
+            )
+            if response.status_code != 200:
+                logger.warning(f"Ollama warm-up for {model} failed: {response.status_code} - {response.text}")
+                return False
+            load_seconds = response.json().get("load_duration", 0) / 1e9
+            logger.info(f"Ollama model {model} loaded in {load_seconds:.2f}s (keep_alive={self.keep_alive})")
+            return True
+        except Exception as e:
+            logger.warning(f"Ollama warm-up for {model} failed: {e}")
+            return False
+
     def is_configured(self, verbose=False) -> bool:
         """Check if Ollama is reachable"""
         try:
@@ -99,18 +141,22 @@ class OllamaConnection(BaseConnection):
         """Generate text using Ollama API with streaming support"""
         try:
             url = f"{self.base_url}/api/generate"
+            model = model or self.config["model"]
             payload = {
-                "model": model or self.config["model"],
+                "model": model,
                 "prompt": prompt,
                 "system": system_prompt,
+                "keep_alive": self.keep_alive,
             }
-            response = requests.post(url, json=payload, stream=True)
+            started = time.monotonic()
+            response = self._session.post(url, json=payload, stream=True)
 
             if response.status_code != 200:
                 raise OllamaAPIError(f"API error: {response.status_code} - {response.text}")
 
             # Initialize an empty string to store the complete response
             full_response = ""
+            data = {}
 
             # Process each line of the response as a JSON object
             for line in response.iter_lines():
@@ -123,6 +169,18 @@ class OllamaConnection(BaseConnection):
                     except json.JSONDecodeError as e:
                         raise OllamaAPIError(f"Failed to parse JSON: {e}")
 
+            # The final streamed object carries the token counts and timings
+            usage_tracker.record(
+                "ollama",
+                model,
+                prompt_tokens=data.get("prompt_eval_count", 0),
+                completion_tokens=data.get("eval_count", 0),
+                latency=time.monotonic() - started,
+                timings={
+                    name: data.get(field, 0) / 1e9
+                    for field, name in TIMING_FIELDS.items()
+                },
+            )
             return full_response
 
         except Exception as e:
@@ -1,9 +1,13 @@
 import logging
 import os
+import time
 from typing import Dict, Any
-from dotenv import load_dotenv, set_key
+from dotenv import set_key
 from openai import OpenAI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_cache
+from src.helpers.llm_metrics import record_completion_usage
+from src.helpers.llm_pool import AsyncLLMClientPool, get_client_pool
 
 logger = logging.getLogger("connections.openai_connection")
 
@@ -23,6 +27,9 @@ class OpenAIConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        # Credential version whose key last passed validation
+        self._validated_version = None
+        self._pool = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -71,12 +78,27 @@ class OpenAIConnection(BaseConnection):
     def _get_client(self) -> OpenAI:
         """Get or create OpenAI client"""
         if not self._client:
-            api_key = os.getenv("OPENAI_API_KEY")
+            api_key = credential_cache.get("OPENAI_API_KEY")
             if not api_key:
                 raise OpenAIConfigurationError("OpenAI API key not found in environment")
             self._client = OpenAI(api_key=api_key)
         return self._client
 
+    def _get_pool(self) -> AsyncLLMClientPool:
+        """Get or create the shared async OpenAI client pool"""
+        if not self._pool:
+            api_key = credential_cache.get("OPENAI_API_KEY")
+            if not api_key:
+                raise OpenAIConfigurationError("OpenAI API key not found in environment")
+            self._pool = get_client_pool(
+                "openai",
+                api_key,
+                rpm_limit=self.config.get("rpm_limit"),
+                tpm_limit=self.config.get("tpm_limit"),
+                max_concurrency=self.config.get("max_concurrency"),
+            )
+        return self._pool
+
     def configure(self) -> bool:
         """Sets up OpenAI API authentication"""
         logger.info("\n🤖 OPENAI API SETUP")
@@ -116,13 +138,16 @@ class OpenAIConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if OpenAI API key is configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv('OPENAI_API_KEY')
+            version = credential_cache.refresh()
+            api_key = credential_cache.get('OPENAI_API_KEY')
             if not api_key:
                 return False
 
-            client = OpenAI(api_key=api_key)
-            client.models.list()
+            # Only a changed .env needs another round trip to validate
+            if self._validated_version != version:
+                client = OpenAI(api_key=api_key)
+                client.models.list()
+                self._validated_version = version
             return True
             
         except Exception as e:
@@ -133,19 +158,21 @@ class OpenAIConnection(BaseConnection):
     def generate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
         """Generate text using OpenAI models"""
         try:
-            client = self._get_client()
+            pool = self._get_pool()
             
             # Use configured model if none provided
             if not model:
                 model = self.config["model"]
 
-            completion = client.chat.completions.create(
+            started = time.monotonic()
+            completion = pool.chat_completion(
                 model=model,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": prompt},
                 ],
             )
+            record_completion_usage("openai", model, completion, started)
 
             return completion.choices[0].message.content
             
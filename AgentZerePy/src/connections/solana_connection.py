@@ -1,8 +1,10 @@
+import atexit
 import logging
 import os
 import requests
-import asyncio
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import Future
+from typing import Dict, Any, List, Optional
 
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from src.types import JupiterTokenData
@@ -16,9 +18,12 @@ from src.helpers.solana.token_deploy import TokenDeploymentManager
 from src.helpers.solana.performance import SolanaPerformanceTracker
 from src.helpers.solana.transfer import SolanaTransferHelper
 from src.helpers.solana.read import SolanaReadHelper
+from src.helpers.credentials import credential_cache
+from src.helpers.async_loop import BackgroundEventLoop
+from src.helpers.solana.confirmations import get_signature_tracker
 
 
-from dotenv import load_dotenv, set_key
+from dotenv import set_key
 
 from jupiter_python_sdk.jupiter import Jupiter
 
@@ -47,29 +52,59 @@ class SolanaConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         logger.info("Initializing Solana connection...")
         super().__init__(config)
+        # One RPC client (and its HTTP connection pool) and one Jupiter
+        # instance serve every action; they are only used on this loop
+        self._loop = BackgroundEventLoop("solana-rpc")
+        self._async_client: Optional[AsyncClient] = None
+        self._jupiter: Optional[Jupiter] = None
+        self._jupiter_wallet = None
+        self._clients_lock = threading.Lock()
+        atexit.register(self.close)
 
     @property
     def is_llm_provider(self) -> bool:
         return False
 
     def _get_connection_async(self) -> AsyncClient:
-        conn = AsyncClient(self.config["rpc"])
-        return conn
-
-    def _get_wallet(self):
-        creds = self._get_credentials()
-        return Keypair.from_base58_string(creds["SOLANA_PRIVATE_KEY"])
+        with self._clients_lock:
+            if self._async_client is None:
+                self._async_client = AsyncClient(self.config["rpc"])
+                # Sends on this client confirm through one shared PubSub socket
+                get_signature_tracker(self._async_client, self.config.get("ws_url"))
+            return self._async_client
+
+    def _run(self, coro) -> Any:
+        """Run a coroutine on the connection's loop and wait for the result"""
+        return self._loop.run(coro)
+
+    def close(self) -> None:
+        """Close the RPC client and stop the loop thread"""
+        with self._clients_lock:
+            client, self._async_client = self._async_client, None
+            self._jupiter = None
+            self._jupiter_wallet = None
+        if client is not None and self._loop.is_running:
+            try:
+                self._loop.run(get_signature_tracker(client).close(), timeout=5)
+                self._loop.run(client.close(), timeout=5)
+            except Exception as e:
+                logger.debug(f"Error closing Solana RPC client: {e}")
+        self._loop.stop()
+
+    def _get_wallet(self) -> Keypair:
+        """The wallet keypair, parsed once and reused until .env changes"""
+        self._get_credentials()
+        return credential_cache.solana_keypair()
 
     def _get_credentials(self) -> Dict[str, str]:
         """Get Solana credentials from environment with validation"""
         logger.debug("Retrieving Solana Credentials")
-        load_dotenv()
         required_vars = {"SOLANA_PRIVATE_KEY": "solana wallet private key"}
         credentials = {}
         missing = []
 
         for env_var, description in required_vars.items():
-            value = os.getenv(env_var)
+            value = credential_cache.get(env_var)
             if not value:
                 missing.append(description)
             credentials[env_var] = value
@@ -78,11 +113,16 @@ class SolanaConnection(BaseConnection):
             error_msg = f"Missing Solana credentials: {', '.join(missing)}"
             raise SolanaConfigurationError(error_msg)
 
-        Keypair.from_base58_string(credentials["SOLANA_PRIVATE_KEY"])
+        # Validates the key format; the parsed keypair is cached for _get_wallet
+        credential_cache.solana_keypair()
         logger.debug("All required credentials found")
         return credentials
 
     def _get_jupiter(self, keypair, async_client):
+        # Reused until the wallet changes
+        with self._clients_lock:
+            if self._jupiter is not None and self._jupiter_wallet == keypair.pubkey():
+                return self._jupiter
         jupiter = Jupiter(
             async_client=async_client,
             keypair=keypair,
@@ -94,6 +134,9 @@ class SolanaConnection(BaseConnection):
             query_order_history_api_url="https://jup.ag/api/limit/v1/orderHistory",
             query_trade_history_api_url="https://jup.ag/api/limit/v1/tradeHistory",
         )
+        with self._clients_lock:
+            self._jupiter = jupiter
+            self._jupiter_wallet = keypair.pubkey()
         return jupiter
 
     def validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
@@ -108,6 +151,9 @@ class SolanaConnection(BaseConnection):
         if not isinstance(config["rpc"], str):
             raise ValueError("rpc must be a positive integer")
 
+        if "ws_url" in config and not isinstance(config["ws_url"], str):
+            raise ValueError("ws_url must be a string")
+
         return config
 
     def register_actions(self) -> None:
@@ -155,6 +201,18 @@ class SolanaConnection(BaseConnection):
                 ],
                 description="Check SOL or token balance",
             ),
+            "get-portfolio": Action(
+                name="get-portfolio",
+                parameters=[
+                    ActionParameter(
+                        "token_addresses",
+                        False,
+                        list,
+                        "Token mint addresses to include (default: all held tokens)",
+                    )
+                ],
+                description="Get SOL and token balances with USD values",
+            ),
             "stake": Action(
                 name="stake",
                 parameters=[
@@ -244,7 +302,7 @@ class SolanaConnection(BaseConnection):
                     f.write("")
 
             set_key(".env", "SOLANA_PRIVATE_KEY", private_key)
-            load_dotenv(override=True)
+            credential_cache.invalidate()
 
             logger.info("\n✅ Solana configuration successfully saved!")
             logger.info("Your private key has been stored in the .env file.")
@@ -258,15 +316,14 @@ class SolanaConnection(BaseConnection):
         """Check if Solana credentials are configured and valid"""
         try:
             # First check if credentials exist and key is valid
-            load_dotenv(override=True)
-            private_key = os.getenv("SOLANA_PRIVATE_KEY")
+            private_key = credential_cache.get("SOLANA_PRIVATE_KEY")
             if not private_key:
                 if verbose:
                     logger.debug("Solana private key not found in environment")
                 return False
 
-            # Validate the key format
-            Keypair.from_base58_string(private_key)
+            # Validate the key format (parsed once per key, then cached)
+            credential_cache.solana_keypair()
 
             # We successfully validated the private key exists and is in correct format
             if verbose:
@@ -283,42 +340,62 @@ class SolanaConnection(BaseConnection):
                 logger.debug(f"Solana Configuration validation failed: {error_msg}")
             return False
 
+    def submit_transfer(
+        self, to_address: str, amount: float, token_mint: Optional[str] = None
+    ) -> Future:
+        """Start a transfer without blocking; the future resolves to the confirmed signature"""
+        return self._loop.submit(
+            SolanaTransferHelper.transfer(
+                self._get_connection_async(),
+                self._get_wallet(),
+                to_address,
+                amount,
+                token_mint,
+            )
+        )
+
     def transfer(
         self, to_address: str, amount: float, token_mint: Optional[str] = None
     ) -> str:
-        res = SolanaTransferHelper.transfer(
-            self._get_connection_async(),
-            self._get_wallet(),
-            to_address,
-            amount,
-            token_mint,
-        )
-        res = asyncio.run(res)
+        res = self.submit_transfer(to_address, amount, token_mint).result()
         logger.debug(f"Transferred {amount} to {to_address}\nTransaction ID: {res}")
         return res
 
-    # todo: test on mainnet
-    def trade(
+    def submit_trade(
         self,
         output_mint: str,
         input_amount: float,
         input_mint: Optional[str] = SPL_TOKENS["USDC"],
         slippage_bps: int = 100,
-    ) -> str:
-        logger.info(f"Swapping {input_amount} for {output_mint}")
+    ) -> Future:
+        """Start a swap without blocking; the future resolves to the confirmed signature"""
         wallet = self._get_wallet()
         async_client = self._get_connection_async()
         jupiter = self._get_jupiter(wallet, async_client)
-        res = TradeManager.trade(
-            async_client,
-            wallet,
-            jupiter,
-            output_mint,
-            input_amount,
-            input_mint,
-            slippage_bps,
+        return self._loop.submit(
+            TradeManager.trade(
+                async_client,
+                wallet,
+                jupiter,
+                output_mint,
+                input_amount,
+                input_mint,
+                slippage_bps,
+            )
         )
-        res = asyncio.run(res)
+
+    # todo: test on mainnet
+    def trade(
+        self,
+        output_mint: str,
+        input_amount: float,
+        input_mint: Optional[str] = SPL_TOKENS["USDC"],
+        slippage_bps: int = 100,
+    ) -> str:
+        logger.info(f"Swapping {input_amount} for {output_mint}")
+        res = self.submit_trade(
+            output_mint, input_amount, input_mint, slippage_bps
+        ).result()
         return res
 
     def get_balance(self, token_address: str = None) -> float:
@@ -329,7 +406,15 @@ class SolanaConnection(BaseConnection):
         res = SolanaReadHelper.get_balance(
             self._get_connection_async(), self._get_wallet(), token_address
         )
-        res = asyncio.run(res)
+        res = self._run(res)
+        return res
+
+    def get_portfolio(self, token_addresses: Optional[List[str]] = None) -> Dict[str, Any]:
+        logger.info("Getting portfolio")
+        res = SolanaReadHelper.get_portfolio(
+            self._get_connection_async(), self._get_wallet(), token_addresses
+        )
+        res = self._run(res)
         return res
 
     def stake(self, amount: float) -> str:
@@ -337,7 +422,7 @@ class SolanaConnection(BaseConnection):
         res = StakeManager.stake_with_jup(
             self._get_connection_async(), self._get_wallet(), amount
         )
-        res = asyncio.run(res)
+        res = self._run(res)
         logger.debug(f"Staked {amount} SOL\nTransaction ID: {res}")
         return res
 
@@ -348,14 +433,16 @@ class SolanaConnection(BaseConnection):
         # res = AssetLender.lend_asset(
         #     self._get_connection_async(), self._get_wallet(), amount
         # )
-        # res = asyncio.run(res)
+        # res = self._run(res)
         # logger.debug(f"Lent {amount} USDC\nTransaction ID: {res}")
         # return res
 
     def request_faucet(self) -> str:
         logger.info("Requesting faucet funds")
-        res = FaucetManager.request_faucet_funds(self)
-        res = asyncio.run(res)
+        res = FaucetManager.request_faucet_funds(
+            self._get_connection_async(), self._get_wallet()
+        )
+        res = self._run(res)
         logger.debug(f"Requested faucet funds\nTransaction ID: {res}")
         return res
 
@@ -365,7 +452,7 @@ class SolanaConnection(BaseConnection):
         # res = TokenDeploymentManager.deploy_token(
         #     self._get_connection_async(), self._get_wallet(), decimals
         # )
-        # res = asyncio.run(res)
+        # res = self._run(res)
         # logger.debug(
         #     f"Deployed token with {decimals} decimals\nToken Mint: {res['mint']}"
         # )
@@ -377,7 +464,7 @@ class SolanaConnection(BaseConnection):
     # todo: test on mainnet
     def get_tps(self) -> int:
         res = SolanaPerformanceTracker.fetch_current_tps(self._get_connection_async())
-        res = asyncio.run(res)
+        res = self._run(res)
         return res
 
     def get_token_by_ticker(self, ticker: str) -> str:
@@ -409,7 +496,7 @@ class SolanaConnection(BaseConnection):
         #    image_url,
         #    options,
         # )
-        # res = asyncio.run(res)
+        # res = self._run(res)
         # logger.debug(
         #    f"Launched Pump & Fun token {token_ticker}\nToken Mint: {res['mint']}"
         # )
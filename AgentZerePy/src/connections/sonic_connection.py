@@ -3,11 +3,12 @@ import os
 import requests
 import time
 from typing import Dict, Any, Optional
-from dotenv import load_dotenv, set_key
+from dotenv import set_key
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
 from src.constants.abi import ERC20_ABI
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_cache
 from src.constants.networks import SONIC_NETWORKS
 
 logger = logging.getLogger("connections.sonic_connection")
@@ -161,11 +162,12 @@ class SonicConnection(BaseConnection):
             if not private_key.startswith('0x'):
                 private_key = '0x' + private_key
             set_key('.env', 'SONIC_PRIVATE_KEY', private_key)
+            credential_cache.invalidate()
 
             if not self._web3.is_connected():
                 raise SonicConnectionError("Failed to connect to Sonic network")
 
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             logger.info(f"\n✅ Successfully connected with address: {account.address}")
             return True
 
@@ -173,10 +175,16 @@ class SonicConnection(BaseConnection):
             logger.error(f"Configuration failed: {e}")
             return False
 
+    def _get_account(self, required: bool = True):
+        """The wallet account, derived once and reused until .env changes"""
+        account = credential_cache.evm_account('SONIC_PRIVATE_KEY')
+        if account is None and required:
+            raise SonicConnectionError("No wallet configured")
+        return account
+
     def is_configured(self, verbose: bool = False) -> bool:
         try:
-            load_dotenv()
-            if not os.getenv('SONIC_PRIVATE_KEY'):
+            if not credential_cache.get('SONIC_PRIVATE_KEY'):
                 if verbose:
                     logger.error("Missing SONIC_PRIVATE_KEY in .env")
                 return False
@@ -196,10 +204,9 @@ class SonicConnection(BaseConnection):
         """Get balance for an address or the configured wallet"""
         try:
             if not address:
-                private_key = os.getenv('SONIC_PRIVATE_KEY')
-                if not private_key:
+                account = self._get_account(required=False)
+                if account is None:
                     raise SonicConnectionError("No wallet configured")
-                account = self._web3.eth.account.from_key(private_key)
                 address = account.address
 
             if token_address:
@@ -221,8 +228,7 @@ class SonicConnection(BaseConnection):
     def transfer(self, to_address: str, amount: float, token_address: Optional[str] = None) -> str:
         """Transfer $S or tokens to an address"""
         try:
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             chain_id = self._web3.eth.chain_id
             
             if token_address:
@@ -305,8 +311,7 @@ class SonicConnection(BaseConnection):
     def _get_encoded_swap_data(self, route_summary: Dict, slippage: float = 0.5) -> str:
         """Get encoded swap data from Kyberswap API"""
         try:
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             
             url = f"{self.aggregator_api}/route/build"
             headers = {"x-client-id": "zerepy"}
@@ -336,8 +341,7 @@ class SonicConnection(BaseConnection):
     def _handle_token_approval(self, token_address: str, spender_address: str, amount: int) -> None:
         """Handle token approval for spender"""
         try:
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
             
             token_contract = self._web3.eth.contract(
                 address=Web3.to_checksum_address(token_address),
@@ -375,8 +379,7 @@ class SonicConnection(BaseConnection):
     def swap(self, token_in: str, token_out: str, amount: float, slippage: float = 0.5) -> str:
         """Execute a token swap using the KyberSwap router"""
         try:
-            private_key = os.getenv('SONIC_PRIVATE_KEY')
-            account = self._web3.eth.account.from_key(private_key)
+            account = self._get_account()
 
             # Check token balance before proceeding
             current_balance = self.get_balance(
@@ -443,8 +446,6 @@ class SonicConnection(BaseConnection):
         if action_name not in self.actions:
             raise KeyError(f"Unknown action: {action_name}")
 
-        load_dotenv()
-        
         if not self.is_configured(verbose=True):
             raise SonicConnectionError("Sonic is not properly configured")
 
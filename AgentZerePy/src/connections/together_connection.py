@@ -1,11 +1,15 @@
 import logging
 import os
+import time
 from typing import Dict, Any
-from dotenv import load_dotenv, set_key
+from dotenv import set_key
 from together import Together
 from together.types.models import ModelObject, ModelType
 
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_cache
+from src.helpers.llm_metrics import record_completion_usage
+from src.helpers.llm_pool import AsyncLLMClientPool, get_client_pool
 
 logger = logging.getLogger("connections.together_ai_connection")
 
@@ -25,6 +29,9 @@ class TogetherAIConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        # Credential version whose key last passed validation
+        self._validated_version = None
+        self._pool = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -72,12 +79,28 @@ class TogetherAIConnection(BaseConnection):
     def _get_client(self) -> Together:
         """Get or create Together AI client"""
         if not self._client:
-            api_key = os.getenv("TOGETHER_API_KEY")
+            api_key = credential_cache.get("TOGETHER_API_KEY")
             if not api_key:
                 raise TogetherAIConfigurationError("Together API key not found in environment")
             self._client = Together(api_key=api_key)
         return self._client
 
+    def _get_pool(self) -> AsyncLLMClientPool:
+        """Get or create the shared async Together AI client pool"""
+        if not self._pool:
+            api_key = credential_cache.get("TOGETHER_API_KEY")
+            if not api_key:
+                raise TogetherAIConfigurationError("Together API key not found in environment")
+            self._pool = get_client_pool(
+                "together",
+                api_key,
+                base_url="https://api.together.xyz/v1",
+                rpm_limit=self.config.get("rpm_limit"),
+                tpm_limit=self.config.get("tpm_limit"),
+                max_concurrency=self.config.get("max_concurrency"),
+            )
+        return self._pool
+
     def configure(self) -> bool:
         """Sets up Together AI API authentication"""
         logger.info("\n🤖 TOGETHER AI API SETUP")
@@ -116,13 +139,16 @@ class TogetherAIConnection(BaseConnection):
     def is_configured(self, verbose=False) -> bool:
         """Check if Together AI API key is configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv('TOGETHER_API_KEY')
+            version = credential_cache.refresh()
+            api_key = credential_cache.get('TOGETHER_API_KEY')
             if not api_key:
                 return False
 
-            client = Together(api_key=api_key)
-            client.models.list()
+            # Only a changed .env needs another round trip to validate
+            if self._validated_version != version:
+                client = Together(api_key=api_key)
+                client.models.list()
+                self._validated_version = version
             return True
             
         except Exception as e:
@@ -133,7 +159,7 @@ class TogetherAIConnection(BaseConnection):
     def generate_text(self, prompt: str, system_prompt: str, model: str = None, **kwargs) -> str:
         """Generate text using Together AI models"""
         try:
-            client = self._get_client()
+            pool = self._get_pool()
             
             # Use configured model if none provided
             if not model:
@@ -141,10 +167,12 @@ class TogetherAIConnection(BaseConnection):
 
             messages = [{"role": "user", "content": prompt},{"role": "system", "content": system_prompt},] 
 
-            completion = client.chat.completions.create(
+            started = time.monotonic()
+            completion = pool.chat_completion(
                 model=model,
                 messages=messages,
             )
+            record_completion_usage("together", model, completion, started)
 
             return completion.choices[0].message.content
             
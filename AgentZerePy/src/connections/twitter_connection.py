@@ -1,13 +1,36 @@
 import os
+import re
+import json
+import time
 import logging
-from typing import Dict, Any, List, Tuple
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+import requests
 from requests_oauthlib import OAuth1Session
-from dotenv import set_key, load_dotenv
+from dotenv import set_key
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
 from src.helpers import print_h_bar
+from src.helpers.credentials import credential_cache
 
 logger = logging.getLogger("connections.twitter_connection")
 
+TIMELINE_STATE_FILE = Path("data") / "twitter_timeline.json"
+
+# Recent search takes queries up to 512 characters (1024 on higher access tiers)
+DEFAULT_SEARCH_QUERY_LENGTH = 512
+MAX_SEARCH_PAGES = 3
+
+STREAM_URL = "https://api.twitter.com/2/tweets/search/stream"
+DEFAULT_STREAM_QUEUE_SIZE = 500
+# Twitter sends a keep-alive newline every 20 seconds
+STREAM_READ_TIMEOUT = 90
+STREAM_RULE_LENGTH = 512
+STREAM_RULE_TAG = "zerepy"
+
+_NUMERIC_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
 class TwitterConnectionError(Exception):
     """Base exception for Twitter connection errors"""
     pass
@@ -24,6 +47,28 @@ class TwitterConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._oauth_session = None
+        # Credential version the OAuth session was built from / last validated at
+        self._oauth_version = None
+        self._validated_version = None
+        # Latest x-rate-limit-* headers per endpoint
+        self.rate_limits: Dict[str, Dict[str, int]] = {}
+        self._rate_limits_lock = threading.Lock()
+        # Newest timeline tweet already read, so restarts do not re-read it
+        self._timeline_state: Dict[str, Dict[str, str]] = self._load_timeline_state()
+
+        # "stream" keeps a filtered-stream connection open and queues matching
+        # tweets; "poll" (default) leaves reading to the timeline/search actions
+        self.ingest_mode = config.get("ingest", "poll")
+        self.stream_queue: deque = deque(
+            maxlen=config.get("stream_queue_size", DEFAULT_STREAM_QUEUE_SIZE)
+        )
+        self._stream_lock = threading.Lock()
+        self._tweets_available = threading.Event()
+        self._stream_stop = threading.Event()
+        self._stream_response = None
+        self._stream_thread = None
+        if self.ingest_mode == "stream":
+            self.start_stream()
 
     @property
     def is_llm_provider(self) -> bool:
@@ -91,13 +136,40 @@ class TwitterConnection(BaseConnection):
                     ActionParameter("tweet_id", True, str, "ID of the tweet to query for replies")
                 ],
                 description="Fetch tweet replies"
+            ),
+            "get-latest-tweets-batch": Action(
+                name="get-latest-tweets-batch",
+                parameters=[
+                    ActionParameter("usernames", True, list, "Twitter usernames to get tweets from"),
+                    ActionParameter("count", False, int, "Number of tweets to retrieve per user")
+                ],
+                description="Get the latest tweets of several users with combined search queries"
+            ),
+            "get-tweet-replies-batch": Action(
+                name="get-tweet-replies-batch",
+                parameters=[
+                    ActionParameter("tweet_ids", True, list, "IDs of the tweets to query for replies"),
+                    ActionParameter("count", False, int, "Number of replies to retrieve per tweet")
+                ],
+                description="Fetch replies to several tweets with combined search queries"
+            ),
+            "read-stream-tweets": Action(
+                name="read-stream-tweets",
+                parameters=[
+                    ActionParameter("count", False, int, "Maximum number of tweets to take from the queue")
+                ],
+                description="Take tweets pushed by the filtered stream since the last read (ingest: stream)"
+            ),
+            "get-rate-limits": Action(
+                name="get-rate-limits",
+                parameters=[],
+                description="Show the remaining request quota per endpoint"
             )
         }
 
     def _get_credentials(self) -> Dict[str, str]:
         """Get Twitter credentials from environment with validation"""
         logger.debug("Retrieving Twitter credentials")
-        load_dotenv()
 
         required_vars = {
             'TWITTER_CONSUMER_KEY': 'consumer key',
@@ -111,7 +183,7 @@ class TwitterConnection(BaseConnection):
         missing = []
 
         for env_var, description in required_vars.items():
-            value = os.getenv(env_var)
+            value = credential_cache.get(env_var)
             if not value:
                 missing.append(description)
             credentials[env_var] = value
@@ -136,11 +208,19 @@ class TwitterConnection(BaseConnection):
             Dict containing the API response
         """
         logger.debug(f"Making {method.upper()} request to {endpoint}")
+        limit_key = self._rate_limit_key(method, endpoint)
+        quota = self.rate_limits.get(limit_key)
+        if quota and quota["remaining"] <= 0 and quota["reset"] > time.time():
+            # The request would only come back 429 and still count against the cap
+            raise TwitterAPIError(
+                f"Rate limit for {limit_key} exhausted, resets in {int(quota['reset'] - time.time())}s"
+            )
         try:
             oauth = self._get_oauth()
             full_url = f"https://api.twitter.com/2/{endpoint.lstrip('/')}"
 
             response = getattr(oauth, method.lower())(full_url, **kwargs)
+            self._record_rate_limits(limit_key, response.headers)
 
             if response.status_code not in [200, 201]:
                 logger.error(
@@ -156,9 +236,64 @@ class TwitterConnection(BaseConnection):
         except Exception as e:
             raise TwitterAPIError(f"API request failed: {str(e)}")
 
+    @staticmethod
+    def _rate_limit_key(method: str, endpoint: str) -> str:
+        return f"{method.upper()} {_NUMERIC_SEGMENT.sub('/:id', '/' + endpoint.lstrip('/'))}"
+
+    def _record_rate_limits(self, limit_key: str, headers) -> None:
+        """Keep the x-rate-limit-* (and 24 hour app/user cap) headers of a response"""
+        quota = {}
+        for name, field in (
+            ("x-rate-limit-limit", "limit"),
+            ("x-rate-limit-remaining", "remaining"),
+            ("x-rate-limit-reset", "reset"),
+            ("x-app-limit-24hour-remaining", "app_24h_remaining"),
+            ("x-user-limit-24hour-remaining", "user_24h_remaining"),
+        ):
+            value = headers.get(name)
+            if value is not None:
+                try:
+                    quota[field] = int(value)
+                except ValueError:
+                    pass
+        if "remaining" not in quota or "reset" not in quota:
+            return
+        with self._rate_limits_lock:
+            self.rate_limits[limit_key] = quota
+        if quota["remaining"] <= max(1, quota.get("limit", 0) // 10):
+            logger.warning(
+                f"Twitter quota for {limit_key} low: {quota['remaining']} left, "
+                f"resets in {max(int(quota['reset'] - time.time()), 0)}s"
+            )
+
+    def get_rate_limits(self, **kwargs) -> Dict[str, Dict[str, int]]:
+        """Remaining quota per endpoint, as last reported by the API"""
+        with self._rate_limits_lock:
+            return {key: dict(quota) for key, quota in self.rate_limits.items()}
+
+    def _load_timeline_state(self) -> Dict[str, Dict[str, str]]:
+        try:
+            if TIMELINE_STATE_FILE.exists():
+                with open(TIMELINE_STATE_FILE, "r") as f:
+                    return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load Twitter timeline state: {e}")
+        return {}
+
+    def _save_timeline_state(self) -> None:
+        try:
+            TIMELINE_STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = TIMELINE_STATE_FILE.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self._timeline_state, f, indent=2)
+            os.replace(tmp_path, TIMELINE_STATE_FILE)
+        except OSError as e:
+            logger.warning(f"Could not save Twitter timeline state: {e}")
+
     def _get_oauth(self) -> OAuth1Session:
         """Get or create OAuth session using stored credentials"""
-        if self._oauth_session is None:
+        version = credential_cache.refresh()
+        if self._oauth_session is None or self._oauth_version != version:
             logger.debug("Creating new OAuth session")
             try:
                 credentials = self._get_credentials()
@@ -169,6 +304,7 @@ class TwitterConnection(BaseConnection):
                     resource_owner_secret=credentials[
                         'TWITTER_ACCESS_TOKEN_SECRET'],
                 )
+                self._oauth_version = version
                 logger.debug("OAuth session created successfully")
             except Exception as e:
                 logger.error(f"Failed to create OAuth session: {str(e)}")
@@ -289,6 +425,7 @@ class TwitterConnection(BaseConnection):
                 resource_owner_secret=oauth_tokens.get('oauth_token_secret'))
 
             self._oauth_session = temp_oauth
+            self._oauth_version = credential_cache.refresh()
             user_id, username = self._get_authenticated_user_info()
 
             # Save to .env
@@ -329,8 +466,14 @@ class TwitterConnection(BaseConnection):
             # check if credentials exist
             self._get_credentials()
 
+            # The users/me check only has to run again when .env changed
+            version = credential_cache.refresh()
+            if self._validated_version == version:
+                return True
+
             # Test the configuration by making a simple API call
             self._get_authenticated_user_info()
+            self._validated_version = version
             logger.debug("Twitter configuration is valid")
             return True
 
@@ -364,26 +507,53 @@ class TwitterConnection(BaseConnection):
         return method(**kwargs)
 
     def read_timeline(self, count: int = None, **kwargs) -> list:
-        """Read tweets from the user's timeline"""
+        """
+        Read tweets from the user's timeline that were not read before.
+
+        The newest tweet id already seen is kept as since_id. When more new
+        tweets arrived than fit one page, the pagination token is kept and the
+        following calls page through the rest before since_id moves forward.
+        """
         if count is None:
             count = self.config["timeline_read_count"]
             
         logger.debug(f"Reading timeline, count: {count}")
         credentials = self._get_credentials()
+        user_id = credentials['TWITTER_USER_ID']
+        state = self._timeline_state.setdefault(user_id, {})
 
         params = {
             "tweet.fields": "created_at,author_id,attachments",
             "expansions": "author_id",
             "user.fields": "name,username",
-            "max_results": count
+            # The endpoint accepts 1-100 results per page
+            "max_results": min(max(count, 1), 100)
         }
+        if state.get("since_id"):
+            params["since_id"] = state["since_id"]
+        if state.get("pagination_token"):
+            params["pagination_token"] = state["pagination_token"]
 
         response = self._make_request(
             'get',
-            f"users/{credentials['TWITTER_USER_ID']}/timelines/reverse_chronological",
+            f"users/{user_id}/timelines/reverse_chronological",
             params=params
         )
 
+        meta = response.get("meta", {})
+        if not state.get("pagination_token"):
+            # First page of a new window: its newest tweet becomes the next since_id
+            state["pending_since_id"] = meta.get("newest_id") or state.get("since_id")
+        if meta.get("next_token") and state.get("since_id"):
+            state["pagination_token"] = meta["next_token"]
+        else:
+            # Window fully read (or first run, which does not backfill older tweets)
+            if state.get("pending_since_id"):
+                state["since_id"] = state["pending_since_id"]
+            state.pop("pagination_token", None)
+            state.pop("pending_since_id", None)
+        self._save_timeline_state()
+
         tweets = response.get("data", [])
         user_info = response.get("includes", {}).get("users", [])
 
@@ -409,28 +579,82 @@ class TwitterConnection(BaseConnection):
         logger.debug(f"Retrieved {len(tweets)} tweets")
         return tweets
 
+    def _pack_search_queries(self, clauses: List[str], suffix: str) -> List[List[str]]:
+        """Group OR clauses so each '(a OR b ...) suffix' query stays within the length limit"""
+        max_length = self.config.get("search_query_length", DEFAULT_SEARCH_QUERY_LENGTH)
+        groups, current = [], []
+        for clause in clauses:
+            candidate = current + [clause]
+            query = f"({' OR '.join(candidate)}) {suffix}"
+            if current and len(query) > max_length:
+                groups.append(current)
+                current = [clause]
+            else:
+                current = candidate
+        if current:
+            groups.append(current)
+        return groups
+
+    def _batched_search(self, keys: List[str], clause, suffix: str, key_of, count: int, params: dict) -> Dict[str, list]:
+        """
+        Run recent searches for many keys with as few requests as possible.
+
+        Each key becomes an OR clause; clauses are packed into queries up to the
+        length limit and results are split back per key with key_of(tweet, includes).
+        A query is paged (up to MAX_SEARCH_PAGES) until every key in it has count
+        results or the results run out.
+        """
+        results: Dict[str, list] = {key: [] for key in keys}
+        clause_keys = {clause(key): key for key in keys}
+        for group in self._pack_search_queries(list(clause_keys), suffix):
+            group_keys = [clause_keys[c] for c in group]
+            request_params = dict(params)
+            request_params["query"] = f"({' OR '.join(group)}) {suffix}"
+            request_params["max_results"] = min(max(count * len(group), 10), 100)
+            for _ in range(MAX_SEARCH_PAGES):
+                response = self._make_request('get', "tweets/search/recent", params=request_params)
+                includes = response.get("includes", {})
+                for tweet in response.get("data", []):
+                    key = key_of(tweet, includes)
+                    if key in results and len(results[key]) < count:
+                        results[key].append(tweet)
+                next_token = response.get("meta", {}).get("next_token")
+                if not next_token or all(len(results[k]) >= count for k in group_keys):
+                    break
+                request_params["next_token"] = next_token
+        return results
+
+    def get_latest_tweets_batch(self, usernames: List[str], count: int = 10, **kwargs) -> Dict[str, list]:
+        """Get latest tweets for several users, keyed by username"""
+        usernames = list(dict.fromkeys(u.lstrip("@") for u in usernames))
+        logger.debug(f"Getting latest tweets for {len(usernames)} users, count: {count}")
+        by_lower = {u.lower(): u for u in usernames}
+
+        def author_of(tweet, includes):
+            users = {user["id"]: user["username"] for user in includes.get("users", [])}
+            return by_lower.get(users.get(tweet.get("author_id"), "").lower())
+
+        results = self._batched_search(
+            usernames,
+            clause=lambda username: f"from:{username}",
+            suffix="-is:retweet -is:reply",
+            key_of=author_of,
+            count=count,
+            params={
+                "tweet.fields": "created_at,text,author_id",
+                "expansions": "author_id",
+                "user.fields": "username",
+            },
+        )
+        logger.debug(f"Retrieved {sum(len(t) for t in results.values())} tweets")
+        return results
+
     def get_latest_tweets(self,
                           username: str,
                           count: int = 10,
                           **kwargs) -> list:
         """Get latest tweets for a user"""
-        logger.debug(f"Getting latest tweets for {username}, count: {count}")
-
-        credentials = self._get_credentials()
-        params = {
-            "tweet.fields": "created_at,text",
-            "max_results": min(count, 100),
-            "query": f"from:{username} -is:retweet -is:reply"
-        }
-
-        response = self._make_request('get',
-                                      f"tweets/search/recent",
-                                      params=params)
-
-        tweets = response.get("data", [])
-        logger.debug(f"Retrieved {len(tweets)} tweets")
-        return tweets
-
+        return self.get_latest_tweets_batch([username], count)[username.lstrip("@")]
 
     def post_tweet(self, message: str, **kwargs) -> dict:
         """Post a new tweet"""
@@ -472,18 +696,208 @@ class TwitterConnection(BaseConnection):
         logger.info("Tweet liked successfully")
         return response
     
+    def get_tweet_replies_batch(self, tweet_ids: List[str], count: int = 10, **kwargs) -> Dict[str, List[dict]]:
+        """Fetch replies to several tweets, keyed by tweet id"""
+        tweet_ids = list(dict.fromkeys(str(t) for t in tweet_ids))
+        logger.debug(f"Fetching replies for {len(tweet_ids)} tweets, count: {count}")
+
+        replies = self._batched_search(
+            tweet_ids,
+            clause=lambda tweet_id: f"conversation_id:{tweet_id}",
+            suffix="is:reply",
+            key_of=lambda tweet, includes: tweet.get("conversation_id"),
+            count=count,
+            params={"tweet.fields": "author_id,created_at,text,conversation_id"},
+        )
+        logger.info(f"Retrieved {sum(len(r) for r in replies.values())} replies")
+        return replies
+
     def get_tweet_replies(self, tweet_id: str, count: int = 10, **kwargs) -> List[dict]:
         """Fetch replies to a specific tweet"""
-        logger.debug(f"Fetching replies for tweet {tweet_id}, count: {count}")
-        
-        params = {
-            "query": f"conversation_id:{tweet_id} is:reply",
-            "tweet.fields": "author_id,created_at,text",
-            "max_results": min(count, 100)
-        }
-        
-        response = self._make_request('get', 'tweets/search/recent', params=params)
-        replies = response.get("data", [])
-        
-        logger.info(f"Retrieved {len(replies)} replies")
-        return replies
\ No newline at end of file
+        return self.get_tweet_replies_batch([tweet_id], count)[str(tweet_id)]
+
+    def _get_bearer_token(self) -> str:
+        token = credential_cache.get("TWITTER_BEARER_TOKEN")
+        if not token:
+            raise TwitterConfigurationError(
+                "The filtered stream needs TWITTER_BEARER_TOKEN (app-only auth)"
+            )
+        return token
+
+    def _stream_rules(self) -> List[Dict[str, str]]:
+        """Rules for mentions, watched accounts and keywords from the config"""
+        rules = []
+        if self.config.get("stream_mentions", True):
+            username = credential_cache.get("TWITTER_USERNAME")
+            if username:
+                rules.append({"value": f"@{username} -is:retweet", "tag": f"{STREAM_RULE_TAG}:mentions"})
+        for kind, clause, suffix in (
+            ("accounts", lambda a: f"from:{a.lstrip('@')}", "-is:retweet"),
+            ("keywords", lambda k: f'"{k}"' if " " in k else k, "-is:retweet"),
+        ):
+            clauses = [clause(v) for v in self.config.get(f"stream_{kind}", [])]
+            groups, current = [], []
+            for c in clauses:
+                if current and len(f"({' OR '.join(current + [c])}) {suffix}") > STREAM_RULE_LENGTH:
+                    groups.append(current)
+                    current = []
+                current.append(c)
+            if current:
+                groups.append(current)
+            for i, group in enumerate(groups):
+                rules.append({"value": f"({' OR '.join(group)}) {suffix}", "tag": f"{STREAM_RULE_TAG}:{kind}:{i}"})
+        return rules
+
+    def _sync_stream_rules(self, headers: Dict[str, str]) -> None:
+        """Replace our stream rules with the configured ones, leaving other rules alone"""
+        response = requests.get(f"{STREAM_URL}/rules", headers=headers, timeout=30)
+        if response.status_code != 200:
+            raise TwitterAPIError(f"Could not list stream rules: {response.status_code} - {response.text}")
+        existing = [
+            r for r in response.json().get("data", [])
+            if r.get("tag", "").startswith(STREAM_RULE_TAG)
+        ]
+        wanted = self._stream_rules()
+        wanted_keys = {(r["value"], r["tag"]) for r in wanted}
+        existing_keys = {(r["value"], r["tag"]) for r in existing}
+
+        stale = [r["id"] for r in existing if (r["value"], r["tag"]) not in wanted_keys]
+        if stale:
+            response = requests.post(f"{STREAM_URL}/rules", headers=headers, json={"delete": {"ids": stale}}, timeout=30)
+            if response.status_code != 200:
+                raise TwitterAPIError(f"Could not delete stream rules: {response.status_code} - {response.text}")
+        missing = [r for r in wanted if (r["value"], r["tag"]) not in existing_keys]
+        if missing:
+            response = requests.post(f"{STREAM_URL}/rules", headers=headers, json={"add": missing}, timeout=30)
+            if response.status_code not in (200, 201):
+                raise TwitterAPIError(f"Could not add stream rules: {response.status_code} - {response.text}")
+        logger.info(f"Stream rules synced: {len(wanted)} active, {len(missing)} added, {len(stale)} removed")
+
+    def start_stream(self) -> None:
+        """Start the filtered-stream reader thread"""
+        if self._stream_thread and self._stream_thread.is_alive():
+            return
+        self._stream_stop.clear()
+        self._stream_thread = threading.Thread(
+            target=self._run_stream, name="twitter-stream", daemon=True
+        )
+        self._stream_thread.start()
+
+    def _run_stream(self) -> None:
+        """Keep the stream connected, backing off as Twitter asks clients to"""
+        network_delay = 0.0
+        http_delay = 0.0
+        rules_synced = False
+        while not self._stream_stop.is_set():
+            try:
+                headers = {"Authorization": f"Bearer {self._get_bearer_token()}"}
+                if not rules_synced:
+                    self._sync_stream_rules(headers)
+                    rules_synced = True
+
+                response = requests.get(
+                    STREAM_URL,
+                    headers=headers,
+                    params={
+                        "tweet.fields": "created_at,author_id,conversation_id,attachments",
+                        "expansions": "author_id",
+                        "user.fields": "name,username",
+                    },
+                    stream=True,
+                    timeout=(10, STREAM_READ_TIMEOUT),
+                )
+                if response.status_code != 200:
+                    response.close()
+                    # Exponential backoff: 5s for HTTP errors, 60s after a 429, capped
+                    first, cap = (60, 960) if response.status_code == 429 else (5, 320)
+                    http_delay = min(http_delay * 2, cap) if http_delay else first
+                    logger.warning(
+                        f"Twitter stream refused ({response.status_code}: {response.text[:200]}), "
+                        f"reconnecting in {http_delay:.0f}s"
+                    )
+                    self._stream_stop.wait(http_delay)
+                    continue
+
+                logger.info("Twitter filtered stream connected")
+                self._stream_response = response
+                network_delay = http_delay = 0.0
+                for line in response.iter_lines():
+                    if self._stream_stop.is_set():
+                        break
+                    if line:
+                        self._on_stream_line(line)
+                if not self._stream_stop.is_set():
+                    raise requests.ConnectionError("stream closed by server")
+            except TwitterConfigurationError as e:
+                logger.error(f"Twitter stream disabled: {e}")
+                return
+            except TwitterAPIError as e:
+                http_delay = min(http_delay * 2, 320) if http_delay else 5
+                logger.warning(f"{e}, retrying in {http_delay:.0f}s")
+                self._stream_stop.wait(http_delay)
+            except requests.RequestException as e:
+                if self._stream_stop.is_set():
+                    break
+                # Linear backoff for network errors, 250ms steps up to 16s
+                network_delay = min(network_delay + 0.25, 16)
+                logger.warning(f"Twitter stream disconnected ({e}), reconnecting in {network_delay:.2f}s")
+                self._stream_stop.wait(network_delay)
+            finally:
+                self._stream_response = None
+        logger.info("Twitter filtered stream stopped")
+
+    def _on_stream_line(self, line: bytes) -> None:
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            logger.debug(f"Skipping malformed stream line: {line[:100]!r}")
+            return
+        tweet = payload.get("data")
+        if not tweet:
+            if payload.get("errors"):
+                logger.warning(f"Twitter stream error: {payload['errors']}")
+            return
+
+        users = {u["id"]: u for u in payload.get("includes", {}).get("users", [])}
+        author = users.get(tweet.get("author_id"), {})
+        tweet.update({
+            "author_name": author.get("name", "Unknown"),
+            "author_username": author.get("username", "Unknown"),
+            "matching_rules": [r.get("tag") for r in payload.get("matching_rules", [])],
+        })
+        with self._stream_lock:
+            if len(self.stream_queue) == self.stream_queue.maxlen:
+                # Keep the newest tweets; the oldest are least worth answering
+                logger.warning(f"Twitter stream queue full, dropped tweet {self.stream_queue[0].get('id')}")
+            self.stream_queue.append(tweet)
+        self._tweets_available.set()
+
+    def wait_for_tweets(self, timeout: float) -> bool:
+        """Block until the stream queued a tweet or the timeout passed"""
+        if self.stream_queue:
+            return True
+        self._tweets_available.clear()
+        # Re-check after clearing so a tweet queued in between is not missed
+        if self.stream_queue:
+            return True
+        return self._tweets_available.wait(timeout)
+
+    def read_stream_tweets(self, count: int = None, **kwargs) -> List[dict]:
+        """Take queued stream tweets, oldest first"""
+        tweets = []
+        with self._stream_lock:
+            while self.stream_queue and (count is None or len(tweets) < count):
+                tweets.append(self.stream_queue.popleft())
+        if tweets:
+            logger.info(f"Took {len(tweets)} streamed tweets")
+        return tweets
+
+    def stop_stream(self) -> None:
+        """Disconnect the filtered stream"""
+        self._stream_stop.set()
+        response = self._stream_response
+        if response is not None:
+            response.close()
+        if self._stream_thread:
+            self._stream_thread.join(timeout=5)
+            self._stream_thread = None
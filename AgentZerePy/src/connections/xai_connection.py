@@ -1,9 +1,13 @@
 import logging
 import os
+import time
 from typing import Dict, Any
 from openai import OpenAI
-from dotenv import set_key, load_dotenv
+from dotenv import set_key
 from src.connections.base_connection import BaseConnection, Action, ActionParameter
+from src.helpers.credentials import credential_cache
+from src.helpers.llm_metrics import record_completion_usage
+from src.helpers.llm_pool import AsyncLLMClientPool, get_client_pool
 
 logger = logging.getLogger("connections.XAI_connection")
 
@@ -23,6 +27,9 @@ class XAIConnection(BaseConnection):
     def __init__(self, config: Dict[str, Any]):
         super().__init__(config)
         self._client = None
+        # Credential version whose key last passed validation
+        self._validated_version = None
+        self._pool = None
 
     @property
     def is_llm_provider(self) -> bool:
@@ -70,7 +77,7 @@ class XAIConnection(BaseConnection):
     def _get_client(self) -> OpenAI:
         """Get or create XAI client using OpenAI's client with custom base URL"""
         if not self._client:
-            api_key = os.getenv("XAI_API_KEY")
+            api_key = credential_cache.get("XAI_API_KEY")
             if not api_key:
                 raise XAIConfigurationError("XAI API key not found in environment")
             self._client = OpenAI(
@@ -79,6 +86,22 @@ class XAIConnection(BaseConnection):
             )
         return self._client
 
+    def _get_pool(self) -> AsyncLLMClientPool:
+        """Get or create the shared async XAI client pool"""
+        if not self._pool:
+            api_key = credential_cache.get("XAI_API_KEY")
+            if not api_key:
+                raise XAIConfigurationError("XAI API key not found in environment")
+            self._pool = get_client_pool(
+                "xai",
+                api_key,
+                base_url="https://api.x.ai/v1",
+                rpm_limit=self.config.get("rpm_limit"),
+                tpm_limit=self.config.get("tpm_limit"),
+                max_concurrency=self.config.get("max_concurrency"),
+            )
+        return self._pool
+
     def configure(self) -> bool:
         """Sets up XAI API authentication"""
         logger.info("\n🤖 XAI API SETUP")
@@ -117,13 +140,16 @@ class XAIConnection(BaseConnection):
     def is_configured(self, verbose = False) -> bool:
         """Check if XAI API key is configured and valid"""
         try:
-            load_dotenv()
-            api_key = os.getenv('XAI_API_KEY')
+            version = credential_cache.refresh()
+            api_key = credential_cache.get('XAI_API_KEY')
             if not api_key:
                 return False
 
-            client = self._get_client()
-            client.models.list()
+            # Only a changed .env needs another round trip to validate
+            if self._validated_version != version:
+                client = self._get_client()
+                client.models.list()
+                self._validated_version = version
             return True
             
         except Exception as e:
@@ -134,19 +160,21 @@ class XAIConnection(BaseConnection):
     def generate_text(self, prompt: str, system_prompt: str = None, model: str = None, **kwargs) -> str:
         """Generate text using XAI models"""
         try:
-            client = self._get_client()
+            pool = self._get_pool()
             
             # Use configured model if none provided
             if not model:
                 model = self.config["model"]
 
-            response = client.chat.completions.create(
+            started = time.monotonic()
+            response = pool.chat_completion(
                 model=model,
                 messages=[
                     {"role": "system", "content": system_prompt} if system_prompt else {"role": "system", "content": ""},
                     {"role": "user", "content": prompt},
                 ]
             )
+            record_completion_usage("xai", model, response, started)
             return response.choices[0].message.content
             
         except Exception as e:
@@ -0,0 +1,85 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional
+
+logger = logging.getLogger("helpers.async_loop")
+
+
+class BackgroundEventLoop:
+    """
+    An asyncio event loop running forever on its own daemon thread.
+
+    Synchronous code hands coroutines to it with submit() (returns a
+    concurrent Future) or run() (blocks for the result), so long-lived
+    async clients can be shared safely across threads.
+    """
+
+    def __init__(self, name: str = "async-loop"):
+        self.name = name
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> "BackgroundEventLoop":
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return self
+            self.loop = asyncio.new_event_loop()
+            self._started.clear()
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        self._started.wait()
+        return self
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self._started.set)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+            logger.debug(f"Event loop thread {self.name} stopped")
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def in_loop_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def submit(self, coro: Coroutine) -> Future:
+        """Schedule a coroutine on the loop and return a concurrent Future"""
+        if not self.is_running:
+            self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        """Run a coroutine on the loop and block until it finishes"""
+        if self.in_loop_thread():
+            raise RuntimeError(f"run() called from inside the {self.name} loop thread")
+        return self.submit(coro).result(timeout)
+
+    def stop(self, timeout: float = 5) -> None:
+        """Cancel pending tasks and stop the loop thread"""
+        with self._lock:
+            if not self.is_running:
+                return
+
+            async def _cancel_pending():
+                tasks = [
+                    t for t in asyncio.all_tasks() if t is not asyncio.current_task()
+                ]
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+            try:
+                asyncio.run_coroutine_threadsafe(_cancel_pending(), self.loop).result(timeout)
+            except Exception as e:
+                logger.debug(f"Error cancelling tasks on {self.name}: {e}")
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+            self._thread = None
@@ -0,0 +1,232 @@
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken ships with langchain-openai, fall back if missing
+    tiktoken = None
+
+logger = logging.getLogger("helpers.context_builder")
+
+# Context window (in tokens) for the models our agents talk to
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+    "claude-3-5-sonnet-20241022": 200000,
+    "claude-3-5-haiku-20241022": 200000,
+    "llama-3.3-70b-versatile": 128000,
+}
+DEFAULT_CONTEXT_WINDOW = 8192
+
+# Per-model prompt budgets; kept well below the window so long agent
+# scratchpads and completions still fit and prompts stay cheap
+MODEL_PROMPT_BUDGETS = {
+    "gpt-4o": 12000,
+    "gpt-4o-mini": 12000,
+    "gpt-4-turbo": 12000,
+    "gpt-4": 4096,
+    "gpt-3.5-turbo": 8000,
+}
+
+# Tokens kept free for the prompt template, tool scratchpad and completion
+DEFAULT_RESERVE_TOKENS = 2048
+
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = " …[truncated]"
+
+
+def compact_json(data: Any) -> str:
+    """Serialize data as JSON without indentation or padding whitespace"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class TokenCounter:
+    """Counts tokens with tiktoken when available, a char heuristic otherwise"""
+
+    _encodings: Dict[str, Any] = {}
+
+    def __init__(self, model: str):
+        self.model = model
+        self._encoding = self._get_encoding(model)
+
+    @classmethod
+    def _get_encoding(cls, model: str):
+        if tiktoken is None:
+            return None
+        if model not in cls._encodings:
+            try:
+                cls._encodings[model] = tiktoken.encoding_for_model(model)
+            except KeyError:
+                cls._encodings[model] = tiktoken.get_encoding("cl100k_base")
+        return cls._encodings[model]
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text down to at most max_tokens tokens, marker included"""
+        marker_tokens = self.count(TRUNCATION_MARKER)
+        keep = max(max_tokens - marker_tokens, 0)
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            return self._encoding.decode(tokens[:keep]) + TRUNCATION_MARKER
+        return text[: keep * CHARS_PER_TOKEN] + TRUNCATION_MARKER
+
+
+def get_prompt_budget(model: str, reserve_tokens: int = DEFAULT_RESERVE_TOKENS) -> int:
+    """Return the prompt token budget for a model"""
+    window = MODEL_CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+    budget = MODEL_PROMPT_BUDGETS.get(model, window)
+    return max(min(budget, window - reserve_tokens), 0)
+
+
+@dataclass
+class ContextSection:
+    name: str
+    text: str
+    priority: int
+    tokens: int
+    truncatable: bool
+    order: int
+
+
+class ContextBuilder:
+    """
+    Assembles an LLM prompt from prioritized sections under a token budget.
+
+    Sections are emitted in insertion order. When the total exceeds the
+    budget, the lowest-priority sections (oldest first on ties) are truncated
+    or dropped until the prompt fits. Sections added with a priority of
+    REQUIRED are never touched.
+    """
+
+    REQUIRED = 100
+    HIGH = 50
+    NORMAL = 20
+    LOW = 0
+
+    def __init__(
+        self,
+        model: str,
+        budget: Optional[int] = None,
+        reserve_tokens: int = DEFAULT_RESERVE_TOKENS,
+        separator: str = "\n\n",
+        min_section_tokens: int = 32,
+    ):
+        self.model = model
+        self.budget = budget if budget is not None else get_prompt_budget(model, reserve_tokens)
+        self.separator = separator
+        self.min_section_tokens = min_section_tokens
+        self.counter = TokenCounter(model)
+        self.sections: List[ContextSection] = []
+        self.tokens_saved = 0
+        self.report: Dict[str, Any] = {}
+
+    def add(
+        self,
+        name: str,
+        text: str,
+        priority: int = NORMAL,
+        truncatable: bool = True,
+    ) -> "ContextBuilder":
+        """Add a text section to the context"""
+        if not text:
+            return self
+        self.sections.append(
+            ContextSection(
+                name=name,
+                text=text,
+                priority=priority,
+                tokens=self.counter.count(text),
+                truncatable=truncatable,
+                order=len(self.sections),
+            )
+        )
+        return self
+
+    def add_json(
+        self,
+        name: str,
+        data: Any,
+        priority: int = NORMAL,
+        truncatable: bool = True,
+        prefix: str = "",
+    ) -> "ContextBuilder":
+        """Add structured data as compact JSON, recording the savings over indent=2"""
+        compact = compact_json(data)
+        indented = json.dumps(data, indent=2, ensure_ascii=False, default=str)
+        self.tokens_saved += max(
+            self.counter.count(indented) - self.counter.count(compact), 0
+        )
+        return self.add(name, f"{prefix}{compact}", priority, truncatable)
+
+    def count(self, text: str) -> int:
+        return self.counter.count(text)
+
+    def reserve(self, text: str) -> "ContextBuilder":
+        """Shrink the budget by text sent alongside the built prompt (e.g. a system prompt)"""
+        self.budget = max(self.budget - self.counter.count(text), 0)
+        return self
+
+    def build(self) -> str:
+        """Fit the sections into the budget and return the assembled prompt"""
+        separator_tokens = self.counter.count(self.separator)
+        total = sum(s.tokens for s in self.sections) + separator_tokens * max(
+            len(self.sections) - 1, 0
+        )
+        original_total = total
+        dropped, truncated = [], []
+        kept = {id(s): s for s in self.sections}
+
+        over = total - self.budget
+        for section in sorted(self.sections, key=lambda s: (s.priority, s.order)):
+            if over <= 0:
+                break
+            if section.priority >= self.REQUIRED:
+                continue
+
+            remaining = section.tokens - over
+            if section.truncatable and remaining >= self.min_section_tokens:
+                section.text = self.counter.truncate(section.text, remaining)
+                new_tokens = self.counter.count(section.text)
+                over -= section.tokens - new_tokens
+                total -= section.tokens - new_tokens
+                section.tokens = new_tokens
+                truncated.append(section.name)
+            else:
+                del kept[id(section)]
+                over -= section.tokens + separator_tokens
+                total -= section.tokens + separator_tokens
+                dropped.append(section.name)
+
+        prompt = self.separator.join(
+            s.text for s in self.sections if id(s) in kept
+        )
+
+        self.tokens_saved += original_total - total
+        self.report = {
+            "model": self.model,
+            "tokens": total,
+            "budget": self.budget,
+            "tokens_saved": self.tokens_saved,
+            "dropped": dropped,
+            "truncated": truncated,
+        }
+        if total > self.budget:
+            logger.warning(
+                f"Context for {self.model} still exceeds budget: {total}/{self.budget} tokens"
+            )
+        logger.info(
+            f"Built context: {total}/{self.budget} tokens, saved {self.tokens_saved} "
+            f"(dropped {len(dropped)}, truncated {len(truncated)})"
+        )
+        return prompt
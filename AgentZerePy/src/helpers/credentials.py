@@ -0,0 +1,92 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+logger = logging.getLogger("helpers.credentials")
+
+ENV_FILE = Path(".env")
+
+
+class CredentialCache:
+    """
+    Process-wide view of the secrets in .env.
+
+    The file is parsed on first use and again only when its mtime or size
+    changes, so configure() writes made with set_key are picked up without
+    re-reading the file on every call. Parsed signers (Solana keypairs, EVM
+    accounts) are cached per secret and rebuilt only if the secret changes.
+    """
+
+    def __init__(self, env_file: Path = ENV_FILE):
+        self.env_file = env_file
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._loaded = False
+        self._signers: Dict[Tuple[str, str], Tuple[str, Any]] = {}
+        # Bumped on every reload so callers can drop state derived from secrets
+        self.version = 0
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.env_file.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self) -> int:
+        """Reload .env if it changed since the last read; returns the current version"""
+        stamp = self._file_stamp()
+        if self._loaded and stamp == self._stamp:
+            return self.version
+        with self._lock:
+            if self._loaded and stamp == self._stamp:
+                return self.version
+            # Later reloads come from edits to .env, which should win over
+            # the values loaded at startup
+            load_dotenv(self.env_file, override=self._loaded)
+            if self._loaded:
+                logger.debug(f"{self.env_file} changed, reloaded credentials")
+            self._stamp = stamp
+            self._loaded = True
+            self.version += 1
+            return self.version
+
+    def invalidate(self) -> None:
+        """Force a reload on the next access, e.g. right after writing .env"""
+        with self._lock:
+            self._stamp = None
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        self.refresh()
+        return os.getenv(name, default)
+
+    def signer(self, name: str, parse: Callable[[str], Any], kind: str) -> Optional[Any]:
+        """Return parse(secret) for the secret in name, parsed once per distinct value"""
+        secret = self.get(name)
+        if not secret:
+            return None
+        key = (kind, name)
+        cached = self._signers.get(key)
+        if cached is not None and cached[0] == secret:
+            return cached[1]
+        signer = parse(secret)
+        with self._lock:
+            self._signers[key] = (secret, signer)
+        return signer
+
+    def solana_keypair(self, name: str = "SOLANA_PRIVATE_KEY"):
+        from solders.keypair import Keypair  # type: ignore
+
+        return self.signer(name, Keypair.from_base58_string, "solana")
+
+    def evm_account(self, name: str):
+        from eth_account import Account
+
+        return self.signer(name, Account.from_key, "evm")
+
+
+credential_cache = CredentialCache()
@@ -0,0 +1,215 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("helpers.llm_metrics")
+
+# USD per 1M tokens: (prompt, cached prompt, completion)
+MODEL_PRICING = {
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4-turbo": (10.00, 10.00, 30.00),
+    "gpt-4": (30.00, 30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 0.50, 1.50),
+    "claude-3-5-sonnet-20241022": (3.00, 0.30, 15.00),
+    "claude-3-5-haiku-20241022": (0.80, 0.08, 4.00),
+    "grok-2-latest": (2.00, 2.00, 10.00),
+    "llama-3.3-70b-versatile": (0.59, 0.59, 0.79),
+}
+
+METRICS_DIR = Path("data") / "metrics"
+
+_current_agent: ContextVar[Optional[str]] = ContextVar("llm_agent", default=None)
+_current_task: ContextVar[Optional[str]] = ContextVar("llm_task", default=None)
+
+
+@contextmanager
+def llm_usage_context(agent: Optional[str] = None, task: Optional[str] = None):
+    """Attribute LLM calls made inside the block to an agent and task"""
+    agent_token = _current_agent.set(agent or _current_agent.get())
+    task_token = _current_task.set(task or _current_task.get())
+    try:
+        yield
+    finally:
+        _current_task.reset(task_token)
+        _current_agent.reset(agent_token)
+
+
+def estimate_cost(
+    model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0
+) -> float:
+    """Estimate the USD cost of a call, 0.0 for models without known pricing"""
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None:
+        # Dated snapshots (e.g. gpt-4o-2024-08-06) share their base model's price
+        base = next((m for m in sorted(MODEL_PRICING, key=len, reverse=True) if model and model.startswith(m)), None)
+        pricing = MODEL_PRICING.get(base)
+    if pricing is None:
+        return 0.0
+    prompt_price, cached_price, completion_price = pricing
+    uncached = max(prompt_tokens - cached_tokens, 0)
+    return (
+        uncached * prompt_price
+        + cached_tokens * cached_price
+        + completion_tokens * completion_price
+    ) / 1_000_000
+
+
+class LLMUsageTracker:
+    """
+    Accumulates per-call LLM usage keyed by (agent, task, provider, model)
+    and keeps a daily rollup file under data/metrics/.
+    """
+
+    def __init__(self, metrics_dir: Path = METRICS_DIR):
+        self.metrics_dir = metrics_dir
+        self._lock = threading.Lock()
+        self._day = None
+        self._rollup: Dict[str, Dict[str, Any]] = {}
+        self._totals = self._empty_entry()
+
+    @staticmethod
+    def _empty_entry() -> Dict[str, Any]:
+        return {
+            "calls": 0,
+            "llm_requests": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "cached_tokens": 0,
+            "latency_seconds": 0.0,
+            "cost_usd": 0.0,
+        }
+
+    def _rollup_path(self, day: str) -> Path:
+        return self.metrics_dir / f"llm_usage_{day}.json"
+
+    def _load_day(self, day: str) -> None:
+        """Switch to a new day, resuming its rollup if one was already written"""
+        self._day = day
+        self._rollup = {}
+        path = self._rollup_path(day)
+        if path.exists():
+            try:
+                with open(path, "r") as f:
+                    self._rollup = json.load(f).get("entries", {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load LLM usage rollup {path}: {e}")
+
+    def record(
+        self,
+        provider: str,
+        model: str,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0,
+        latency: float = 0.0,
+        cost: Optional[float] = None,
+        requests: int = 1,
+        agent: Optional[str] = None,
+        task: Optional[str] = None,
+        timings: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Record one LLM call and return the call record.
+
+        A call may span several provider requests (e.g. an agent executor
+        run); pass their count as requests. Provider-reported timings in
+        seconds (e.g. Ollama's load/eval durations) are summed per key.
+        """
+        agent = agent or _current_agent.get() or "unknown"
+        task = task or _current_task.get() or "unknown"
+        if cost is None:
+            cost = estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens)
+
+        call = {
+            "agent": agent,
+            "task": task,
+            "provider": provider,
+            "model": model,
+            "llm_requests": requests,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cached_tokens": cached_tokens,
+            "latency_seconds": round(latency, 3),
+            "cost_usd": round(cost, 6),
+        }
+        for name, seconds in (timings or {}).items():
+            call[name] = round(seconds, 3)
+
+        with self._lock:
+            day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+            if day != self._day:
+                self._load_day(day)
+
+            key = "|".join([agent, task, provider, model])
+            for entry in (self._rollup.setdefault(key, self._empty_entry()), self._totals):
+                entry["calls"] += 1
+                entry["llm_requests"] += requests
+                entry["prompt_tokens"] += prompt_tokens
+                entry["completion_tokens"] += completion_tokens
+                entry["cached_tokens"] += cached_tokens
+                entry["latency_seconds"] += latency
+                entry["cost_usd"] += cost
+                for name, seconds in (timings or {}).items():
+                    entry[name] = entry.get(name, 0.0) + seconds
+            self._write_rollup()
+
+        logger.info(
+            f"LLM usage [{provider}/{model}] agent={agent} task={task}: {requests} request(s), "
+            f"{prompt_tokens} prompt ({cached_tokens} cached) + {completion_tokens} completion tokens, "
+            f"{latency:.2f}s, ~${cost:.5f}"
+        )
+        return call
+
+    def _write_rollup(self) -> None:
+        try:
+            self.metrics_dir.mkdir(parents=True, exist_ok=True)
+            path = self._rollup_path(self._day)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"day": self._day, "entries": self._rollup}, f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write LLM usage rollup: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return today's rollup broken down by agent, task, provider and model"""
+        with self._lock:
+            entries = []
+            for key, entry in self._rollup.items():
+                agent, task, provider, model = key.split("|", 3)
+                entries.append(
+                    {"agent": agent, "task": task, "provider": provider, "model": model, **entry}
+                )
+            entries.sort(key=lambda e: e["cost_usd"], reverse=True)
+            return {"day": self._day, "process_totals": dict(self._totals), "entries": entries}
+
+
+usage_tracker = LLMUsageTracker()
+
+
+def record_completion_usage(provider: str, model: str, completion: Any, started: float) -> None:
+    """Record usage from an OpenAI-compatible chat completion response"""
+    try:
+        usage = getattr(completion, "usage", None)
+        prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+        completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = getattr(details, "cached_tokens", 0) or 0
+        usage_tracker.record(
+            provider,
+            getattr(completion, "model", None) or model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens,
+            latency=time.monotonic() - started,
+        )
+    except Exception as e:
+        logger.debug(f"Could not record LLM usage: {e}")
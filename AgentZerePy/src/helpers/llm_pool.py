@@ -0,0 +1,329 @@
+import asyncio
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import httpx
+from openai import (
+    APIConnectionError,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    InternalServerError,
+    RateLimitError,
+)
+
+from src.helpers.async_loop import BackgroundEventLoop
+from src.helpers.context_builder import TokenCounter
+
+logger = logging.getLogger("helpers.llm_pool")
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_COMPLETION_ESTIMATE = 512
+MAX_RETRIES = 3
+MAX_BACKOFF = 30
+WINDOW_SECONDS = 60.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_SECONDS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+# One loop thread drives every provider pool
+_pool_loop = BackgroundEventLoop("llm-pool")
+_pools: Dict[tuple, "AsyncLLMClientPool"] = {}
+_pools_lock = threading.Lock()
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse rate-limit reset values like '1s', '6m0s', '20ms' or '0.5' into seconds"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_SECONDS[unit] for amount, unit in parts)
+
+
+def _int_header(headers, name: str) -> Optional[int]:
+    value = headers.get(name)
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+class AdmissionController:
+    """
+    Decides when a request may be sent to a provider.
+
+    Tracks the provider's remaining request/token quota from response
+    headers, plus an optional local sliding window for configured RPM/TPM
+    limits. Callers reserve their estimated tokens before sending and wait
+    while the reservation would exceed what is left.
+    """
+
+    def __init__(
+        self,
+        rpm_limit: Optional[int] = None,
+        tpm_limit: Optional[int] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    ):
+        self.rpm_limit = rpm_limit
+        self.tpm_limit = tpm_limit
+        self.max_concurrency = max_concurrency
+        self.in_flight = 0
+        self.reserved_tokens = 0
+        self.remaining_requests: Optional[int] = None
+        self.remaining_tokens: Optional[int] = None
+        self.requests_reset_at = 0.0
+        self.tokens_reset_at = 0.0
+        self.blocked_until = 0.0
+        self._window: deque = deque()
+        self._cond: Optional[asyncio.Condition] = None
+
+    def _condition(self) -> asyncio.Condition:
+        # Created lazily so it binds to the pool loop
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        return self._cond
+
+    def _wait_time(self, estimated_tokens: int, now: float) -> float:
+        """Seconds until a request of this size fits, 0 if it fits now"""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+
+        if now >= self.requests_reset_at:
+            self.remaining_requests = None
+        if now >= self.tokens_reset_at:
+            self.remaining_tokens = None
+
+        if self.remaining_requests is not None and self.remaining_requests < 1:
+            return self.requests_reset_at - now
+        if self.remaining_tokens is not None and self.remaining_tokens < estimated_tokens:
+            return self.tokens_reset_at - now
+
+        while self._window and now - self._window[0][0] >= WINDOW_SECONDS:
+            self._window.popleft()
+        if self.rpm_limit and len(self._window) >= self.rpm_limit:
+            return self._window[0][0] + WINDOW_SECONDS - now
+        if self.tpm_limit and self._window:
+            used = sum(tokens for _, tokens in self._window)
+            if used + estimated_tokens > self.tpm_limit:
+                # Wait until enough of the window has expired
+                for timestamp, tokens in self._window:
+                    used -= tokens
+                    if used + estimated_tokens <= self.tpm_limit:
+                        return timestamp + WINDOW_SECONDS - now
+        return 0.0
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        cond = self._condition()
+        async with cond:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(estimated_tokens, now)
+                if wait <= 0 and self.in_flight < self.max_concurrency:
+                    break
+                timeout = max(wait, 0.05) if wait > 0 else None
+                try:
+                    await asyncio.wait_for(cond.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+
+            self.in_flight += 1
+            self.reserved_tokens += estimated_tokens
+            if self.remaining_requests is not None:
+                self.remaining_requests -= 1
+            if self.remaining_tokens is not None:
+                self.remaining_tokens -= estimated_tokens
+            self._window.append((now, estimated_tokens))
+
+    async def release(self, estimated_tokens: int, headers=None) -> None:
+        cond = self._condition()
+        async with cond:
+            self.in_flight -= 1
+            self.reserved_tokens -= estimated_tokens
+            if headers is not None:
+                self.update_from_headers(headers)
+            cond.notify_all()
+
+    def update_from_headers(self, headers) -> None:
+        """Sync quota state with x-ratelimit-* response headers"""
+        now = time.monotonic()
+        limit_requests = _int_header(headers, "x-ratelimit-limit-requests")
+        limit_tokens = _int_header(headers, "x-ratelimit-limit-tokens")
+        remaining_requests = _int_header(headers, "x-ratelimit-remaining-requests")
+        remaining_tokens = _int_header(headers, "x-ratelimit-remaining-tokens")
+        reset_requests = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+        reset_tokens = parse_reset_duration(headers.get("x-ratelimit-reset-tokens"))
+
+        if limit_requests and not self.rpm_limit:
+            self.rpm_limit = limit_requests
+        if limit_tokens and not self.tpm_limit:
+            self.tpm_limit = limit_tokens
+        # The header reflects the provider's view before our other in-flight
+        # requests landed, so keep their reservations out of it
+        if remaining_requests is not None:
+            self.remaining_requests = max(remaining_requests - self.in_flight, 0)
+            self.requests_reset_at = now + (reset_requests or WINDOW_SECONDS)
+        if remaining_tokens is not None:
+            self.remaining_tokens = max(remaining_tokens - self.reserved_tokens, 0)
+            self.tokens_reset_at = now + (reset_tokens or WINDOW_SECONDS)
+
+    def block_for(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+            "rpm_limit": self.rpm_limit,
+            "tpm_limit": self.tpm_limit,
+            "remaining_requests": self.remaining_requests,
+            "remaining_tokens": self.remaining_tokens,
+        }
+
+
+class AsyncLLMClientPool:
+    """
+    Shared AsyncOpenAI client for one OpenAI-compatible provider, with
+    admission control so concurrent callers stay inside the provider's
+    RPM/TPM quota. The client's HTTP connection pool is sized to the
+    concurrency cap. 429s are retried after the advertised delay, and
+    5xx, timeout and connection errors with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        api_key: str,
+        base_url: Optional[str] = None,
+        default_headers: Optional[Dict[str, str]] = None,
+        rpm_limit: Optional[int] = None,
+        tpm_limit: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.provider = provider
+        self._client_kwargs = {
+            "api_key": api_key,
+            "base_url": base_url,
+            "default_headers": default_headers,
+            # Retries go through chat_completion_async so every attempt is
+            # admitted and accounted for
+            "max_retries": 0,
+        }
+        self._client: Optional[AsyncOpenAI] = None
+        self.admission = AdmissionController(
+            rpm_limit, tpm_limit, max_concurrency or DEFAULT_MAX_CONCURRENCY
+        )
+        self._counters: Dict[str, TokenCounter] = {}
+
+    def _get_client(self) -> AsyncOpenAI:
+        if self._client is None:
+            connections = self.admission.max_concurrency
+            self._client = AsyncOpenAI(
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=connections,
+                        max_keepalive_connections=connections,
+                    )
+                ),
+                **self._client_kwargs,
+            )
+        return self._client
+
+    def estimate_tokens(self, model: str, messages: List[Dict[str, Any]], max_tokens: Optional[int] = None) -> int:
+        if model not in self._counters:
+            self._counters[model] = TokenCounter(model)
+        counter = self._counters[model]
+        prompt_tokens = sum(counter.count(str(m.get("content") or "")) + 4 for m in messages)
+        return prompt_tokens + (max_tokens or DEFAULT_COMPLETION_ESTIMATE)
+
+    async def chat_completion_async(self, model: str, messages: List[Dict[str, Any]], **kwargs) -> Any:
+        """Create a chat completion once the quota admits it"""
+        estimated = self.estimate_tokens(model, messages, kwargs.get("max_tokens"))
+        for attempt in range(MAX_RETRIES + 1):
+            # Only set for transient errors; 429 delays go through the admission block
+            backoff = None
+            await self.admission.acquire(estimated)
+            headers = None
+            try:
+                raw = await self._get_client().chat.completions.with_raw_response.create(
+                    model=model, messages=messages, **kwargs
+                )
+                headers = raw.headers
+                return raw.parse()
+            except RateLimitError as e:
+                headers = e.response.headers
+                retry_after = parse_reset_duration(headers.get("retry-after"))
+                retry_after_ms = headers.get("retry-after-ms")
+                if retry_after_ms:
+                    retry_after = float(retry_after_ms) / 1000
+                delay = retry_after or min(2 ** attempt, MAX_BACKOFF)
+                self.admission.block_for(delay)
+                if attempt == MAX_RETRIES:
+                    raise
+                logger.warning(
+                    f"{self.provider} rate limited, retrying in {delay:.2f}s "
+                    f"(attempt {attempt + 1}/{MAX_RETRIES})"
+                )
+            except (APIConnectionError, InternalServerError) as e:
+                # 5xx responses, timeouts and dropped connections; the SDK
+                # would have retried these, so do it here with the same backoff
+                if isinstance(e, InternalServerError):
+                    headers = e.response.headers
+                if attempt == MAX_RETRIES:
+                    raise
+                backoff = min(2 ** attempt, MAX_BACKOFF) * random.uniform(0.75, 1.0)
+                logger.warning(
+                    f"{self.provider} request failed ({type(e).__name__}), retrying in "
+                    f"{backoff:.2f}s (attempt {attempt + 1}/{MAX_RETRIES})"
+                )
+            finally:
+                await self.admission.release(estimated, headers)
+
+            if backoff is not None:
+                # Sleep outside the admission slot so other callers can proceed
+                await asyncio.sleep(backoff)
+
+    def chat_completion(self, model: str, messages: List[Dict[str, Any]], timeout: Optional[float] = None, **kwargs) -> Any:
+        """Blocking wrapper for synchronous callers, safe from any thread"""
+        return _pool_loop.run(self.chat_completion_async(model, messages, **kwargs), timeout)
+
+
+def get_client_pool(
+    provider: str,
+    api_key: str,
+    base_url: Optional[str] = None,
+    default_headers: Optional[Dict[str, str]] = None,
+    rpm_limit: Optional[int] = None,
+    tpm_limit: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+) -> AsyncLLMClientPool:
+    """Return the process-wide pool for a provider, creating it on first use"""
+    key = (provider, base_url, api_key)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = AsyncLLMClientPool(
+                provider,
+                api_key,
+                base_url=base_url,
+                default_headers=default_headers,
+                rpm_limit=rpm_limit,
+                tpm_limit=tpm_limit,
+                max_concurrency=max_concurrency,
+            )
+        return _pools[key]
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Admission state of every provider pool, keyed by provider"""
+    with _pools_lock:
+        return {pool.provider: pool.admission.snapshot() for pool in _pools.values()}
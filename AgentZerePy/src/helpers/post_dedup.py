@@ -0,0 +1,174 @@
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger("helpers.post_dedup")
+
+INDEX_DIR = Path("data") / "post_index"
+
+DEFAULT_CAPACITY = 256
+DEFAULT_THRESHOLD = 0.6
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 5
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Hashes and permutation coefficients stay below 2**31 so a*x+b fits in uint64
+_PRIME = (1 << 31) - 1
+
+_URL = re.compile(r"https?://\S+")
+_NON_WORD = re.compile(r"[^\w]+")
+
+_indexes: Dict[str, "PostDedupIndex"] = {}
+_indexes_lock = threading.Lock()
+
+
+def normalize_post(text: str) -> str:
+    """Lowercase, drop links and punctuation, collapse whitespace"""
+    text = _URL.sub(" ", text.lower())
+    return _NON_WORD.sub(" ", text).strip()
+
+
+class PostDedupIndex:
+    """
+    MinHash index of an agent's recent outgoing posts.
+
+    Each post is reduced to a MinHash signature over character shingles and
+    kept in a fixed-size ring buffer (a NumPy matrix, one row per post).
+    Checking a candidate compares it against every stored row at once; the
+    fraction of equal entries estimates the Jaccard similarity.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: int = DEFAULT_CAPACITY,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        index_dir: Path = INDEX_DIR,
+    ):
+        self.name = name
+        self.capacity = capacity
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.path = index_dir / f"{name}.json"
+
+        rng = np.random.default_rng(0)
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+
+        self._signatures = np.zeros((capacity, num_perm), dtype=np.uint32)
+        self._texts: List[Optional[str]] = [None] * capacity
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def signature(self, text: str) -> np.ndarray:
+        normalized = normalize_post(text)
+        k = self.shingle_size
+        shingles = {normalized[i : i + k] for i in range(max(len(normalized) - k + 1, 1))}
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) % _PRIME for s in shingles),
+            dtype=np.uint64,
+            count=len(shingles),
+        )
+        permuted = (np.outer(self._a, hashes) + self._b[:, None]) % np.uint64(_PRIME)
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def most_similar(self, text: str) -> Tuple[float, Optional[str]]:
+        """Return the estimated similarity to the closest stored post and its text"""
+        signature = self.signature(text)
+        with self._lock:
+            if self._size == 0:
+                return 0.0, None
+            similarities = (self._signatures[: self._size] == signature).mean(axis=1)
+            best = int(similarities.argmax())
+            return float(similarities[best]), self._texts[best]
+
+    def is_duplicate(self, text: str) -> bool:
+        return self.most_similar(text)[0] >= self.threshold
+
+    def _insert(self, text: str) -> None:
+        self._signatures[self._next] = self.signature(text)
+        self._texts[self._next] = text
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def add(self, text: str) -> None:
+        """Record a post that was sent"""
+        with self._lock:
+            self._insert(text)
+            self._save()
+
+    def _ordered_texts(self) -> List[str]:
+        """Stored posts, oldest first"""
+        start = self._next if self._size == self.capacity else 0
+        order = [(start + i) % self.capacity for i in range(self._size)]
+        return [self._texts[i] for i in order]
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, "r") as f:
+                texts = json.load(f).get("posts", [])
+            # Signatures are cheap to rebuild, only the texts are stored
+            for text in texts[-self.capacity :]:
+                self._insert(text)
+            logger.info(f"Loaded {self._size} recent posts into {self.name} dedup index")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load post index {self.path}: {e}")
+
+    def _save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump({"posts": self._ordered_texts()}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save post index {self.path}: {e}")
+
+
+def get_post_index(name: str, **kwargs) -> PostDedupIndex:
+    """Return the dedup index for a name (e.g. '<agent>_twitter'), creating it on first use"""
+    with _indexes_lock:
+        if name not in _indexes:
+            _indexes[name] = PostDedupIndex(name, **kwargs)
+        return _indexes[name]
+
+
+def generate_unique_post(
+    index: PostDedupIndex,
+    generate: Callable[[Optional[str]], Optional[str]],
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> Optional[str]:
+    """
+    Generate a post that is not a near-duplicate of a recent one.
+
+    generate is called with None first, then with the closest earlier post
+    after each rejected candidate so the prompt can steer away from it.
+    Returns None if every attempt was a near-duplicate or empty.
+    """
+    avoid = None
+    for attempt in range(1, max_attempts + 1):
+        candidate = generate(avoid)
+        if not candidate:
+            return None
+        score, closest = index.most_similar(candidate)
+        if score < index.threshold:
+            return candidate
+        logger.info(
+            f"Rejected near-duplicate post for {index.name} "
+            f"(similarity {score:.2f}, attempt {attempt}/{max_attempts})"
+        )
+        avoid = closest
+    return None
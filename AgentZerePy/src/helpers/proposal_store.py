@@ -0,0 +1,158 @@
+import json
+import logging
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("helpers.proposal_store")
+
+_CIP_NUMBER = re.compile(r"\bCIP[-\s]?(\d+)", re.IGNORECASE)
+_QUERY_TERM = re.compile(r"\w+")
+
+_COLUMNS = ("id", "cip", "title", "analysis", "processed_at", "space", "state")
+
+
+def extract_cip_number(text: str) -> Optional[int]:
+    """Return the first CIP number mentioned in text, e.g. 61 for 'CIP-61: ...'"""
+    match = _CIP_NUMBER.search(text or "")
+    return int(match.group(1)) if match else None
+
+
+def _extract_title(analysis: str) -> str:
+    for line in (analysis or "").splitlines():
+        if line.strip().lower().startswith("title:"):
+            return line.split(":", 1)[1].strip()
+    return ""
+
+
+class ProposalStore:
+    """
+    SQLite store for proposal analyses.
+
+    Rows are append-only: an analysis is written once and never rewritten.
+    CIP lookups use an index on the extracted CIP number, and keyword
+    search goes through an FTS5 table ranked by bm25. A legacy JSON file
+    of analyses is imported on first open.
+    """
+
+    def __init__(self, db_path: Path, legacy_json: Optional[Path] = None):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._create_schema()
+        if legacy_json is not None and legacy_json.exists() and self.count() == 0:
+            self._import_json(legacy_json)
+
+    def _create_schema(self) -> None:
+        with self._conn:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS proposals (
+                    id TEXT PRIMARY KEY,
+                    cip INTEGER,
+                    title TEXT,
+                    analysis TEXT NOT NULL,
+                    processed_at INTEGER,
+                    space TEXT,
+                    state TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_proposals_cip ON proposals(cip);
+                CREATE VIRTUAL TABLE IF NOT EXISTS proposals_fts USING fts5(
+                    title, analysis, content='proposals', content_rowid='rowid'
+                );
+                """
+            )
+
+    def _import_json(self, path: Path) -> None:
+        try:
+            with open(path, "r") as f:
+                records = json.load(f)
+            added = self.add_many(r for r in records if isinstance(r, dict))
+            logger.info(f"Imported {added} proposal analyses from {path}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not import proposal analyses from {path}: {e}")
+
+    def _insert(self, record: Dict[str, Any]) -> bool:
+        analysis = record.get("analysis", "")
+        title = _extract_title(analysis)
+        cursor = self._conn.execute(
+            "INSERT OR IGNORE INTO proposals (id, cip, title, analysis, processed_at, space, state) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                record.get("id", "unknown"),
+                extract_cip_number(title or analysis),
+                title,
+                analysis,
+                record.get("processed_at"),
+                record.get("space"),
+                record.get("state"),
+            ),
+        )
+        if cursor.rowcount == 0:
+            return False
+        self._conn.execute(
+            "INSERT INTO proposals_fts (rowid, title, analysis) VALUES (?, ?, ?)",
+            (cursor.lastrowid, title, analysis),
+        )
+        return True
+
+    def add(self, record: Dict[str, Any]) -> bool:
+        """Append an analysis record; returns False if its id is already stored"""
+        return self.add_many([record]) == 1
+
+    def add_many(self, records) -> int:
+        with self._lock, self._conn:
+            return sum(self._insert(record) for record in records)
+
+    def has(self, proposal_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM proposals WHERE id = ?", (proposal_id,)
+            ).fetchone()
+        return row is not None
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM proposals").fetchone()[0]
+
+    def get_by_cip(self, cip_number: int) -> Optional[Dict[str, Any]]:
+        """Return the latest analysis for a CIP number"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM proposals WHERE cip = ? "
+                "ORDER BY processed_at DESC LIMIT 1",
+                (cip_number,),
+            ).fetchone()
+        return dict(row) if row else None
+
+    def search(self, query: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """Keyword search over titles and analyses, best match first"""
+        terms = _QUERY_TERM.findall(query or "")
+        if not terms:
+            return []
+        match = " OR ".join(f'"{term}"' for term in terms)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join('p.' + c for c in _COLUMNS)} "
+                "FROM proposals_fts JOIN proposals p ON p.rowid = proposals_fts.rowid "
+                "WHERE proposals_fts MATCH ? ORDER BY bm25(proposals_fts) LIMIT ?",
+                (match, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def all(self) -> List[Dict[str, Any]]:
+        """All analyses, newest first"""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM proposals ORDER BY processed_at DESC"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Optional
+
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Confirmed
+
+from solders.hash import Hash  # type: ignore
+
+logger = logging.getLogger("helpers.solana.blockhash")
+
+REFRESH_INTERVAL = 0.4
+# A blockhash stays usable for ~150 blocks (about a minute); cached ones are
+# only handed out while well inside that window
+MAX_AGE = 20
+# Stop polling the RPC once nobody has asked for a blockhash for this long
+IDLE_TIMEOUT = 60
+
+
+@dataclass(frozen=True)
+class RecentBlockhash:
+    blockhash: Hash
+    last_valid_block_height: int
+    fetched_at: float
+
+
+class BlockhashProvider:
+    """
+    Keeps a recent blockhash ready for transaction building.
+
+    The first get() starts a task on the client's event loop that refreshes
+    the blockhash every REFRESH_INTERVAL seconds, so sends no longer wait on
+    getLatestBlockhash. The task stops after IDLE_TIMEOUT seconds without
+    callers and is restarted by the next get().
+    """
+
+    def __init__(
+        self,
+        async_client: AsyncClient,
+        refresh_interval: float = REFRESH_INTERVAL,
+        max_age: float = MAX_AGE,
+        idle_timeout: float = IDLE_TIMEOUT,
+    ):
+        self.async_client = async_client
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.idle_timeout = idle_timeout
+        self._current: Optional[RecentBlockhash] = None
+        self._last_used = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _fetch(self) -> RecentBlockhash:
+        response = await self.async_client.get_latest_blockhash(Confirmed)
+        self._current = RecentBlockhash(
+            blockhash=response.value.blockhash,
+            last_valid_block_height=response.value.last_valid_block_height,
+            fetched_at=time.monotonic(),
+        )
+        return self._current
+
+    async def _refresh_loop(self) -> None:
+        try:
+            while time.monotonic() - self._last_used < self.idle_timeout:
+                try:
+                    await self._fetch()
+                except Exception as e:
+                    # get() falls back to an inline fetch once the cached value ages out
+                    logger.debug(f"Blockhash refresh failed: {e}")
+                await asyncio.sleep(self.refresh_interval)
+        finally:
+            self._task = None
+
+    async def get(self) -> RecentBlockhash:
+        """A recent blockhash and its last valid block height"""
+        self._last_used = time.monotonic()
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._refresh_loop())
+
+        current = self._current
+        if current is not None and time.monotonic() - current.fetched_at < self.max_age:
+            return current
+        return await self._fetch()
+
+    async def latest(self) -> RecentBlockhash:
+        """A blockhash fetched now, no older than any blockhash seen before the call"""
+        self._last_used = time.monotonic()
+        return await self._fetch()
+
+    def invalidate(self) -> None:
+        """Drop the cached blockhash, e.g. after the cluster rejected it"""
+        self._current = None
+
+
+_providers: "weakref.WeakKeyDictionary[AsyncClient, BlockhashProvider]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_blockhash_provider(async_client: AsyncClient) -> BlockhashProvider:
+    """Return the provider for this client, creating it on first use"""
+    provider = _providers.get(async_client)
+    if provider is None:
+        provider = BlockhashProvider(async_client)
+        _providers[async_client] = provider
+    return provider
@@ -0,0 +1,352 @@
+import asyncio
+import itertools
+import json
+import logging
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse, urlunparse
+
+import websockets
+
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Commitment, Confirmed
+from solana.rpc.core import TransactionExpiredBlockheightExceededError
+
+from solders.signature import Signature  # type: ignore
+
+logger = logging.getLogger("helpers.solana.confirmations")
+
+COMMITMENT_LEVELS = {"processed": 0, "confirmed": 1, "finalized": 2}
+# getSignatureStatuses accepts at most 256 signatures per call
+MAX_STATUSES_PER_REQUEST = 256
+# The status poll is only a safety net while the socket is up, and the
+# main path while it is down
+POLL_INTERVAL = 5
+DISCONNECTED_POLL_INTERVAL = 1
+# Signatures without a last valid block height give up after this long
+MAX_TRACK_AGE = 90
+# Keep the socket open between sends for this long
+IDLE_TIMEOUT = 60
+MAX_RECONNECT_DELAY = 30
+
+
+class TransactionFailedError(Exception):
+    """Raised when a tracked transaction landed with an error"""
+
+    pass
+
+
+def websocket_url(rpc_url: str) -> str:
+    """The PubSub endpoint that goes with an HTTP RPC url"""
+    parsed = urlparse(rpc_url)
+    scheme = "wss" if parsed.scheme == "https" else "ws"
+    netloc = parsed.netloc
+    # A local test validator serves PubSub on the RPC port + 1
+    if parsed.port == 8899:
+        netloc = f"{parsed.hostname}:8900"
+    return urlunparse(parsed._replace(scheme=scheme, netloc=netloc))
+
+
+@dataclass
+class _Tracked:
+    future: asyncio.Future
+    last_valid_block_height: Optional[int]
+    started: float = field(default_factory=time.monotonic)
+    subscription: Optional[int] = None
+
+
+class SignatureTracker:
+    """
+    Confirms many in-flight signatures over one signatureSubscribe socket.
+
+    track() registers a signature and returns a future that resolves as soon
+    as the requested commitment is reached, so callers can either await it
+    or fire and check back later. A batched getSignatureStatuses poll covers
+    notifications missed while the socket reconnects, and fails signatures
+    whose blockhash expired. Everything runs on the client's event loop.
+    """
+
+    def __init__(
+        self,
+        async_client: AsyncClient,
+        ws_url: str,
+        commitment: Commitment = Confirmed,
+    ):
+        self.async_client = async_client
+        self.ws_url = ws_url
+        self.commitment = commitment
+        self._pending: Dict[Tuple[str, str], _Tracked] = {}
+        self._requests: Dict[int, Tuple[str, str]] = {}
+        self._subscriptions: Dict[int, Tuple[str, str]] = {}
+        self._ids = itertools.count(1)
+        self._ws = None
+        self._socket_task: Optional[asyncio.Task] = None
+        self._poll_task: Optional[asyncio.Task] = None
+        self._last_active = 0.0
+
+    def track(
+        self,
+        signature,
+        commitment: Optional[Commitment] = None,
+        last_valid_block_height: Optional[int] = None,
+    ) -> asyncio.Future:
+        """Start tracking a signature; the future resolves to the signature string"""
+        key = (str(signature), str(commitment or self.commitment))
+        self._last_active = time.monotonic()
+        tracked = self._pending.get(key)
+        if tracked is None:
+            loop = asyncio.get_running_loop()
+            tracked = _Tracked(loop.create_future(), last_valid_block_height)
+            self._pending[key] = tracked
+            if self._ws is not None:
+                loop.create_task(self._subscribe(key))
+            self._ensure_running()
+        return tracked.future
+
+    async def confirm(
+        self,
+        signature,
+        commitment: Optional[Commitment] = None,
+        last_valid_block_height: Optional[int] = None,
+    ) -> str:
+        """Wait until the signature reaches the commitment"""
+        future = self.track(signature, commitment, last_valid_block_height)
+        # Shielded so one cancelled waiter does not cancel it for the others
+        return await asyncio.shield(future)
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def _ensure_running(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._socket_task is None:
+            self._socket_task = loop.create_task(self._run_socket())
+        if self._poll_task is None:
+            self._poll_task = loop.create_task(self._run_poller())
+
+    def _resolve(self, key: Tuple[str, str], error: Optional[Exception] = None) -> None:
+        tracked = self._pending.pop(key, None)
+        if tracked is None:
+            return
+        self._last_active = time.monotonic()
+        if tracked.subscription is not None:
+            self._subscriptions.pop(tracked.subscription, None)
+            if self._ws is not None:
+                asyncio.get_running_loop().create_task(
+                    self._unsubscribe(tracked.subscription)
+                )
+        if tracked.future.done():
+            return
+        if error is not None:
+            tracked.future.set_exception(error)
+        else:
+            tracked.future.set_result(key[0])
+
+    async def _send(self, payload: dict) -> None:
+        ws = self._ws
+        if ws is None:
+            return
+        try:
+            await ws.send(json.dumps(payload))
+        except websockets.exceptions.ConnectionClosed:
+            # Pending signatures are resubscribed after the reconnect
+            pass
+
+    async def _subscribe(self, key: Tuple[str, str]) -> None:
+        if key not in self._pending:
+            return
+        request_id = next(self._ids)
+        self._requests[request_id] = key
+        await self._send(
+            {
+                "jsonrpc": "2.0",
+                "id": request_id,
+                "method": "signatureSubscribe",
+                "params": [key[0], {"commitment": key[1]}],
+            }
+        )
+
+    async def _unsubscribe(self, subscription: int) -> None:
+        await self._send(
+            {
+                "jsonrpc": "2.0",
+                "id": next(self._ids),
+                "method": "signatureUnsubscribe",
+                "params": [subscription],
+            }
+        )
+
+    def _handle_message(self, message: dict) -> None:
+        if "id" in message:
+            key = self._requests.pop(message["id"], None)
+            if key is None:
+                return
+            if "error" in message:
+                # The status poll still covers this signature
+                logger.debug(f"signatureSubscribe failed for {key[0]}: {message['error']}")
+                return
+            subscription = message.get("result")
+            tracked = self._pending.get(key)
+            if tracked is None:
+                # Resolved by the poll while the subscribe was in flight
+                asyncio.get_running_loop().create_task(self._unsubscribe(subscription))
+                return
+            tracked.subscription = subscription
+            self._subscriptions[subscription] = key
+        elif message.get("method") == "signatureNotification":
+            params = message.get("params", {})
+            key = self._subscriptions.pop(params.get("subscription"), None)
+            if key is None or key not in self._pending:
+                return
+            # The node drops the subscription after notifying
+            self._pending[key].subscription = None
+            value = params.get("result", {}).get("value")
+            if isinstance(value, dict) and value.get("err") is not None:
+                self._resolve(
+                    key, TransactionFailedError(f"Transaction {key[0]} failed: {value['err']}")
+                )
+            else:
+                self._resolve(key)
+
+    def _keep_socket(self) -> bool:
+        return bool(self._pending) or (
+            time.monotonic() - self._last_active < IDLE_TIMEOUT
+        )
+
+    async def _run_socket(self) -> None:
+        delay = 1
+        try:
+            while self._keep_socket():
+                try:
+                    async with websockets.connect(
+                        self.ws_url, ping_interval=20, max_size=None
+                    ) as ws:
+                        self._ws = ws
+                        delay = 1
+                        self._requests.clear()
+                        self._subscriptions.clear()
+                        for key, tracked in list(self._pending.items()):
+                            tracked.subscription = None
+                            await self._subscribe(key)
+                        while self._keep_socket():
+                            try:
+                                raw = await asyncio.wait_for(ws.recv(), timeout=1)
+                            except asyncio.TimeoutError:
+                                continue
+                            try:
+                                self._handle_message(json.loads(raw))
+                            except ValueError:
+                                logger.debug(f"Ignoring malformed PubSub message: {raw!r}")
+                except (OSError, websockets.exceptions.WebSocketException) as e:
+                    logger.warning(f"Signature socket error, reconnecting in {delay}s: {e}")
+                    self._ws = None
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, MAX_RECONNECT_DELAY)
+                finally:
+                    self._ws = None
+        finally:
+            self._socket_task = None
+
+    async def _run_poller(self) -> None:
+        try:
+            while self._pending:
+                await asyncio.sleep(
+                    POLL_INTERVAL if self._ws is not None else DISCONNECTED_POLL_INTERVAL
+                )
+                try:
+                    await self._poll_statuses()
+                except Exception as e:
+                    logger.debug(f"Signature status poll failed: {e}")
+        finally:
+            self._poll_task = None
+
+    async def _poll_statuses(self) -> None:
+        keys = list(self._pending)
+        if not keys:
+            return
+
+        # Read the block height first: a signature still unknown after this
+        # height has passed its last valid block can never land
+        block_height = None
+        if any(t.last_valid_block_height for t in self._pending.values()):
+            block_height = (await self.async_client.get_block_height(Confirmed)).value
+
+        signatures = list(dict.fromkeys(signature for signature, _ in keys))
+        statuses = {}
+        for start in range(0, len(signatures), MAX_STATUSES_PER_REQUEST):
+            chunk = signatures[start : start + MAX_STATUSES_PER_REQUEST]
+            response = await self.async_client.get_signature_statuses(
+                [Signature.from_string(s) for s in chunk]
+            )
+            statuses.update(zip(chunk, response.value))
+
+        now = time.monotonic()
+        for key in keys:
+            tracked = self._pending.get(key)
+            if tracked is None:
+                continue
+            signature, commitment = key
+            status = statuses.get(signature)
+            if status is not None:
+                if status.err is not None:
+                    self._resolve(
+                        key, TransactionFailedError(f"Transaction {signature} failed: {status.err}")
+                    )
+                elif _status_level(status) >= COMMITMENT_LEVELS.get(commitment, 1):
+                    self._resolve(key)
+                continue
+            if (
+                tracked.last_valid_block_height is not None
+                and block_height is not None
+                and block_height > tracked.last_valid_block_height
+            ):
+                self._resolve(
+                    key,
+                    TransactionExpiredBlockheightExceededError(
+                        f"{signature} has expired: block height exceeded"
+                    ),
+                )
+            elif tracked.last_valid_block_height is None and now - tracked.started > MAX_TRACK_AGE:
+                self._resolve(
+                    key,
+                    TimeoutError(f"Transaction {signature} not confirmed after {MAX_TRACK_AGE}s"),
+                )
+
+    async def close(self) -> None:
+        """Stop tracking, failing anything still in flight"""
+        for key in list(self._pending):
+            self._resolve(key, ConnectionError("Signature tracker closed"))
+        for task in (self._socket_task, self._poll_task):
+            if task is not None:
+                task.cancel()
+        if self._ws is not None:
+            await self._ws.close()
+
+
+def _status_level(status) -> int:
+    # A missing confirmation status means the slot is already rooted
+    if status.confirmation_status is None:
+        return COMMITMENT_LEVELS["finalized"]
+    name = str(status.confirmation_status).rsplit(".", 1)[-1].lower()
+    return COMMITMENT_LEVELS.get(name, 0)
+
+
+_trackers: "weakref.WeakKeyDictionary[AsyncClient, SignatureTracker]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_signature_tracker(
+    async_client: AsyncClient, ws_url: Optional[str] = None
+) -> SignatureTracker:
+    """Return the tracker for this client, creating it on first use"""
+    tracker = _trackers.get(async_client)
+    if tracker is None:
+        if ws_url is None:
+            ws_url = websocket_url(async_client._provider.endpoint_uri)
+        tracker = SignatureTracker(async_client, ws_url)
+        _trackers[async_client] = tracker
+    return tracker
@@ -0,0 +1,86 @@
+import logging
+import threading
+import time
+from typing import Dict, Tuple, Union
+
+from solana.rpc.async_api import AsyncClient
+
+from solders.keypair import Keypair  # type: ignore
+from solders.pubkey import Pubkey  # type: ignore
+
+from spl.token.async_client import AsyncToken
+from spl.token.constants import TOKEN_PROGRAM_ID
+from spl.token.core import MintInfo
+
+logger = logging.getLogger("helpers.solana.mint_cache")
+
+# A missing or uninitialized mint may be created later, so bad lookups are
+# only remembered for a while
+NEGATIVE_TTL = 300
+
+
+class MintInfoCache:
+    """
+    Process-wide cache of SPL mint accounts.
+
+    Decimals never change once a mint is initialized, so a mint's info is
+    fetched over RPC once and reused by every trade, transfer and balance
+    call. Addresses that are not valid mints are cached as failures for
+    NEGATIVE_TTL seconds so repeated bad input does not hit the RPC either.
+    """
+
+    def __init__(self, negative_ttl: float = NEGATIVE_TTL):
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        self._mints: Dict[str, MintInfo] = {}
+        self._invalid: Dict[str, Tuple[float, str]] = {}
+
+    async def get(
+        self,
+        async_client: AsyncClient,
+        mint: Union[str, Pubkey],
+        payer: Union[Keypair, Pubkey],
+    ) -> MintInfo:
+        """Return the mint info for an initialized mint, raising ValueError otherwise"""
+        key = str(mint)
+        with self._lock:
+            info = self._mints.get(key)
+            if info is not None:
+                return info
+            invalid = self._invalid.get(key)
+            if invalid is not None:
+                if time.monotonic() < invalid[0]:
+                    raise ValueError(invalid[1])
+                del self._invalid[key]
+
+        mint_pubkey = mint if isinstance(mint, Pubkey) else Pubkey.from_string(key)
+        spl_client = AsyncToken(async_client, mint_pubkey, TOKEN_PROGRAM_ID, payer)
+        try:
+            info = await spl_client.get_mint_info()
+            if not info.is_initialized:
+                raise ValueError("Token mint is not initialized.")
+        except (ValueError, AttributeError) as e:
+            # Raised for a missing account, a non-token owner or a wrong
+            # account size; RPC and network errors are not cached
+            reason = f"Invalid token mint {key}: {str(e)}"
+            with self._lock:
+                self._invalid[key] = (time.monotonic() + self.negative_ttl, reason)
+            raise ValueError(reason) from e
+
+        with self._lock:
+            self._mints[key] = info
+        logger.debug(f"Cached mint info for {key} (decimals={info.decimals})")
+        return info
+
+    def invalidate(self, mint: Union[str, Pubkey] = None) -> None:
+        """Forget one mint, or everything when no mint is given"""
+        with self._lock:
+            if mint is None:
+                self._mints.clear()
+                self._invalid.clear()
+            else:
+                self._mints.pop(str(mint), None)
+                self._invalid.pop(str(mint), None)
+
+
+mint_info_cache = MintInfoCache()
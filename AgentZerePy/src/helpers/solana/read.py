@@ -1,20 +1,28 @@
 # imports
+import asyncio
+from typing import Any, Dict, List, Optional
 from venv import logger
 
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Confirmed
+from solana.rpc.types import TokenAccountOpts
 
-from src.constants import LAMPORTS_PER_SOL
+from src.constants import LAMPORTS_PER_SOL, SPL_TOKENS
 from src.types import JupiterTokenData
+from src.helpers.solana.mint_cache import mint_info_cache
+from src.helpers.solana.token_registry import get_token_registry
 
 from solders.keypair import Keypair  # type: ignore
 from solders.pubkey import Pubkey  # type: ignore
 import requests
 
-from spl.token.async_client import AsyncToken
 from spl.token.instructions import get_associated_token_address
 from spl.token.constants import TOKEN_PROGRAM_ID
 
+# getMultipleAccounts and the Jupiter price API both take at most 100 keys
+MAX_ACCOUNTS_PER_REQUEST = 100
+MAX_PRICE_IDS_PER_REQUEST = 100
+
 
 class SolanaReadHelper:
     @staticmethod
@@ -33,13 +41,8 @@ class SolanaReadHelper:
                 )
                 return response.value / LAMPORTS_PER_SOL
             token_address = Pubkey.from_string(token_address)
-            spl_client = AsyncToken(
-                async_client, token_address, TOKEN_PROGRAM_ID, wallet.pubkey()
-            )
-
-            mint = await spl_client.get_mint_info()
-            if not mint.is_initialized:
-                raise ValueError("Token mint is not initialized.")
+            # Raises for missing or uninitialized mints
+            await mint_info_cache.get(async_client, token_address, wallet.pubkey())
 
             wallet_ata = get_associated_token_address(wallet.pubkey(), token_address)
             response = await async_client.get_token_account_balance(wallet_ata)
@@ -70,10 +73,172 @@ class SolanaReadHelper:
         except Exception as e:
             raise Exception(f"Price fetch failed: {str(e)}")
 
+    @staticmethod
+    def fetch_prices(token_addresses: List[str]) -> Dict[str, Optional[float]]:
+        """USD prices for many tokens, one request per 100 ids; missing prices are None"""
+        prices = {}
+        for start in range(0, len(token_addresses), MAX_PRICE_IDS_PER_REQUEST):
+            chunk = token_addresses[start : start + MAX_PRICE_IDS_PER_REQUEST]
+            url = f"https://api.jup.ag/price/v2?ids={','.join(chunk)}"
+            try:
+                with requests.get(url, timeout=30) as response:
+                    response.raise_for_status()
+                    data = response.json().get("data", {})
+            except Exception as error:
+                logger.warning(f"Batch price fetch failed: {str(error)}")
+                data = {}
+            for address in chunk:
+                price = (data.get(address) or {}).get("price")
+                prices[address] = float(price) if price else None
+        return prices
+
+    @staticmethod
+    def _parse_token_account(data: Any) -> Optional[Dict[str, Any]]:
+        """Mint and amounts from a jsonParsed SPL token account"""
+        parsed = getattr(data, "parsed", data)
+        if isinstance(parsed, dict) and "parsed" in parsed:
+            parsed = parsed["parsed"]
+        if not isinstance(parsed, dict) or parsed.get("type") != "account":
+            return None
+        info = parsed.get("info", {})
+        amount = info.get("tokenAmount", {})
+        return {
+            "mint": info.get("mint"),
+            "amount": int(amount.get("amount", 0)),
+            "decimals": amount.get("decimals"),
+            "balance": float(amount.get("uiAmountString") or 0),
+        }
+
+    @staticmethod
+    def _lookup_tokens(mints: List[str]) -> Dict[str, Optional[dict]]:
+        try:
+            registry = get_token_registry()
+            return {mint: registry.get_by_address(mint) for mint in mints}
+        except Exception as error:
+            logger.warning(f"Token registry lookup failed: {str(error)}")
+            return {}
+
+    @staticmethod
+    async def _read_token_accounts(
+        async_client: AsyncClient,
+        owner: Pubkey,
+        token_addresses: Optional[List[str]],
+    ) -> List[Dict[str, Any]]:
+        if not token_addresses:
+            # Every token account the wallet owns, in a single call
+            response = await async_client.get_token_accounts_by_owner_json_parsed(
+                owner, TokenAccountOpts(program_id=TOKEN_PROGRAM_ID), Confirmed
+            )
+            accounts = [
+                SolanaReadHelper._parse_token_account(keyed.account.data)
+                for keyed in response.value
+            ]
+            return [a for a in accounts if a and a["amount"] > 0]
+
+        # Derive the ATAs locally and read them in chunks
+        mints = [str(address) for address in token_addresses]
+        atas = [
+            get_associated_token_address(owner, Pubkey.from_string(mint))
+            for mint in mints
+        ]
+        chunks = [
+            atas[start : start + MAX_ACCOUNTS_PER_REQUEST]
+            for start in range(0, len(atas), MAX_ACCOUNTS_PER_REQUEST)
+        ]
+        responses = await asyncio.gather(
+            *(
+                async_client.get_multiple_accounts_json_parsed(chunk, Confirmed)
+                for chunk in chunks
+            )
+        )
+        raw_accounts = [account for response in responses for account in response.value]
+
+        accounts = []
+        for mint, account in zip(mints, raw_accounts):
+            parsed = (
+                SolanaReadHelper._parse_token_account(account.data) if account else None
+            )
+            # A missing ATA is a zero balance, not an error
+            accounts.append(
+                parsed
+                or {"mint": mint, "amount": 0, "decimals": None, "balance": 0.0}
+            )
+        return accounts
+
+    @staticmethod
+    async def get_portfolio(
+        async_client: AsyncClient,
+        wallet: Keypair,
+        token_addresses: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        SOL and SPL balances of the wallet with token names and USD values.
+
+        With token_addresses, only those mints are read (through their
+        associated token accounts); otherwise every non-empty token account
+        owned by the wallet is included.
+        """
+        owner = wallet.pubkey()
+        logger.debug(f"Getting portfolio for {owner}")
+        try:
+            sol_response, accounts = await asyncio.gather(
+                async_client.get_balance(owner, commitment=Confirmed),
+                SolanaReadHelper._read_token_accounts(
+                    async_client, owner, token_addresses
+                ),
+            )
+        except Exception as error:
+            raise Exception(f"Failed to get portfolio: {str(error)}") from error
+
+        sol_mint = str(SPL_TOKENS["SOL"])
+        mints = list(dict.fromkeys(a["mint"] for a in accounts))
+        # Prices and the token list are plain blocking HTTP; keep them off
+        # the RPC loop and let them run side by side
+        prices, metadata = await asyncio.gather(
+            asyncio.to_thread(SolanaReadHelper.fetch_prices, [sol_mint] + mints),
+            asyncio.to_thread(SolanaReadHelper._lookup_tokens, mints),
+        )
+
+        tokens = []
+        for account in accounts:
+            token = metadata.get(account["mint"]) or {}
+            price = prices.get(account["mint"])
+            tokens.append(
+                {
+                    "mint": account["mint"],
+                    "symbol": token.get("symbol"),
+                    "name": token.get("name"),
+                    "balance": account["balance"],
+                    "decimals": account["decimals"],
+                    "price": price,
+                    "value_usd": account["balance"] * price if price is not None else None,
+                }
+            )
+        tokens.sort(key=lambda t: t["value_usd"] or 0, reverse=True)
+
+        sol_balance = sol_response.value / LAMPORTS_PER_SOL
+        sol_price = prices.get(sol_mint)
+        sol_value = sol_balance * sol_price if sol_price is not None else None
+        return {
+            "wallet": str(owner),
+            "sol": {"balance": sol_balance, "price": sol_price, "value_usd": sol_value},
+            "tokens": tokens,
+            "total_value_usd": (sol_value or 0)
+            + sum(t["value_usd"] or 0 for t in tokens),
+        }
+
     @staticmethod
     def get_token_by_ticker(
         ticker: str,
     ) -> str:
+        # Verified tokens resolve from the local index without a request
+        try:
+            token = get_token_registry().get_by_symbol(ticker)
+            if token:
+                return token["address"]
+        except Exception as error:
+            logger.warning(f"Token registry lookup failed: {str(error)}")
+
         try:
             response = requests.get(
                 f"https://api.dexscreener.com/latest/dex/search?q={ticker}"
@@ -110,20 +275,14 @@ class SolanaReadHelper:
         address: str,
     ) -> str:
         try:
-            response = requests.get(
-                "https://tokens.jup.ag/tokens?tags=verified",
-                headers={"Content-Type": "application/json"},
-            )
-            response.raise_for_status()
-
-            data = response.json()
-            for token in data:
-                if token.get("address") == str(address):
-                    return JupiterTokenData(
-                        address=token.get("address"),
-                        symbol=token.get("symbol"),
-                        name=token.get("name"),
-                    )
+            token = get_token_registry().get_by_address(str(address))
+            if token:
+                return JupiterTokenData(
+                    address=token["address"],
+                    symbol=token["symbol"],
+                    name=token["name"],
+                )
             return None
         except Exception as error:
-            raise Exception(f"Error fetching token data: {str(error)}")
+            logger.warning(f"Token registry lookup failed: {str(error)}")
+            return None
@@ -0,0 +1,165 @@
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger("helpers.solana.token_registry")
+
+VERIFIED_TOKENS_URL = "https://tokens.jup.ag/tokens?tags=verified"
+SNAPSHOT_FILE = Path("data") / "jupiter_tokens.json"
+DEFAULT_TTL = 6 * 3600
+# After a failed download, lookups answer from what is indexed (possibly
+# nothing) instead of retrying the download for this long
+FAILED_REFRESH_BACKOFF = 300
+
+# Snapshot rows are [address, symbol, name, decimals]
+_FIELDS = ("address", "symbol", "name", "decimals")
+
+
+class JupiterTokenRegistry:
+    """
+    In-memory index of Jupiter's verified token list.
+
+    The list is downloaded once and indexed by mint address and by
+    upper-cased symbol. A compact snapshot on disk makes warm starts
+    instant; once the data is older than the TTL, lookups keep answering
+    from it while a background thread refreshes the indexes. A failed
+    download is not retried for FAILED_REFRESH_BACKOFF seconds.
+    """
+
+    def __init__(
+        self,
+        url: str = VERIFIED_TOKENS_URL,
+        ttl: float = DEFAULT_TTL,
+        snapshot_file: Path = SNAPSHOT_FILE,
+        failed_refresh_backoff: float = FAILED_REFRESH_BACKOFF,
+    ):
+        self.url = url
+        self.ttl = ttl
+        self.failed_refresh_backoff = failed_refresh_backoff
+        self.snapshot_file = snapshot_file
+        self._by_address: Dict[str, dict] = {}
+        self._by_symbol: Dict[str, List[dict]] = {}
+        self._fetched_at = 0.0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self._load_snapshot()
+
+    def _index(self, tokens: List[dict], fetched_at: float) -> None:
+        by_address, by_symbol = {}, {}
+        for token in tokens:
+            address = token.get("address")
+            if not address:
+                continue
+            entry = {field: token.get(field) for field in _FIELDS}
+            by_address[address] = entry
+            if entry["symbol"]:
+                by_symbol.setdefault(entry["symbol"].upper(), []).append(entry)
+        with self._lock:
+            self._by_address = by_address
+            self._by_symbol = by_symbol
+            self._fetched_at = fetched_at
+
+    def _load_snapshot(self) -> None:
+        try:
+            if not self.snapshot_file.exists():
+                return
+            with open(self.snapshot_file, "r") as f:
+                snapshot = json.load(f)
+            tokens = [dict(zip(_FIELDS, row)) for row in snapshot.get("tokens", [])]
+            self._index(tokens, snapshot.get("fetched_at", 0.0))
+            logger.debug(f"Loaded {len(tokens)} tokens from {self.snapshot_file}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load token snapshot {self.snapshot_file}: {e}")
+
+    def _save_snapshot(self) -> None:
+        with self._lock:
+            snapshot = {
+                "fetched_at": self._fetched_at,
+                "tokens": [[t[f] for f in _FIELDS] for t in self._by_address.values()],
+            }
+        try:
+            self.snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.snapshot_file.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f, separators=(",", ":"))
+            os.replace(tmp_path, self.snapshot_file)
+        except OSError as e:
+            logger.warning(f"Could not save token snapshot {self.snapshot_file}: {e}")
+
+    def refresh(self) -> bool:
+        """Download the list and rebuild the indexes; returns False if another refresh is running"""
+        if not self._refreshing.acquire(blocking=False):
+            return False
+        try:
+            response = requests.get(
+                self.url, headers={"Content-Type": "application/json"}, timeout=30
+            )
+            response.raise_for_status()
+            tokens = response.json()
+            self._index(tokens, time.time())
+            self._save_snapshot()
+            logger.info(f"Indexed {len(self._by_address)} verified Jupiter tokens")
+            return True
+        except Exception:
+            self._retry_at = time.monotonic() + self.failed_refresh_backoff
+            raise
+        finally:
+            self._refreshing.release()
+
+    def _refresh_in_background(self) -> None:
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Background token list refresh failed: {e}")
+
+        threading.Thread(target=run, name="jupiter-token-refresh", daemon=True).start()
+
+    def _ensure_fresh(self) -> None:
+        if time.monotonic() < self._retry_at:
+            return
+        if not self._by_address:
+            # Nothing to answer from yet, so the first lookup waits for the list
+            try:
+                if not self.refresh():
+                    with self._refreshing:
+                        pass
+            except Exception as e:
+                logger.warning(
+                    f"Could not download the token list, retrying in "
+                    f"{self.failed_refresh_backoff:.0f}s: {e}"
+                )
+        elif time.time() - self._fetched_at > self.ttl and not self._refreshing.locked():
+            self._refresh_in_background()
+
+    def get_by_address(self, address: str) -> Optional[dict]:
+        self._ensure_fresh()
+        with self._lock:
+            return self._by_address.get(str(address))
+
+    def get_by_symbol(self, symbol: str) -> Optional[dict]:
+        """First verified token with this symbol (case-insensitive)"""
+        self._ensure_fresh()
+        with self._lock:
+            matches = self._by_symbol.get(symbol.upper())
+        return matches[0] if matches else None
+
+
+_registry: Optional[JupiterTokenRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_token_registry() -> JupiterTokenRegistry:
+    """Return the process-wide token registry, creating it on first use"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = JupiterTokenRegistry()
+        return _registry
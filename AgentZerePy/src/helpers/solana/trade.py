@@ -13,10 +13,9 @@ from solders.keypair import Keypair  # type: ignore
 from solders.pubkey import Pubkey  # type: ignore
 from solders.transaction import VersionedTransaction  # type: ignore
 
-from spl.token.async_client import AsyncToken
-from spl.token.constants import TOKEN_PROGRAM_ID
-
 from src.constants import DEFAULT_OPTIONS
+from src.helpers.solana.blockhash import get_blockhash_provider
+from src.helpers.solana.mint_cache import mint_info_cache
 from src.helpers.solana.transfer import SolanaTransferHelper
 
 
@@ -50,10 +49,7 @@ class TradeManager:
         # convert wallet.secret() from bytes to string
         input_mint = str(input_mint)
         output_mint = str(output_mint)
-        spl_client = AsyncToken(
-            async_client, Pubkey.from_string(input_mint), TOKEN_PROGRAM_ID, wallet
-        )
-        mint = await spl_client.get_mint_info()
+        mint = await mint_info_cache.get(async_client, input_mint, wallet)
         decimals = mint.decimals
         input_amount = int(input_amount * 10**decimals)
 
@@ -83,7 +79,12 @@ class TradeManager:
             logger.debug(
                 f"Transaction sent: https://explorer.solana.com/tx/{transaction_id}"
             )
-            await SolanaTransferHelper._confirm_transaction(async_client, signature)
+            # Jupiter chose the blockhash before this fetch, so it expires no
+            # later than this one; confirmation never gives up too early
+            recent = await get_blockhash_provider(async_client).latest()
+            await SolanaTransferHelper._confirm_transaction(
+                async_client, signature, recent.last_valid_block_height
+            )
             return str(signature)
 
         except Exception as e:
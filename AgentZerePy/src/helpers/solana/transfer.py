@@ -4,6 +4,7 @@ from src.constants import LAMPORTS_PER_SOL, SOL_FEES
 
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Confirmed
+from solana.rpc.core import RPCException, TransactionExpiredBlockheightExceededError
 
 from solders.keypair import Keypair  # type: ignore
 from solders.pubkey import Pubkey  # type: ignore
@@ -11,13 +12,18 @@ from solders.system_program import TransferParams, transfer
 from solders.transaction import VersionedTransaction  # type: ignore
 from solders.message import MessageV0  # type: ignore
 
-from spl.token.async_client import AsyncToken
 from spl.token.constants import TOKEN_PROGRAM_ID
 from spl.token.instructions import get_associated_token_address, transfer_checked
 from spl.token.instructions import TransferCheckedParams
 from solana.transaction import Transaction
+from src.helpers.solana.blockhash import get_blockhash_provider
+from src.helpers.solana.confirmations import get_signature_tracker
+from src.helpers.solana.mint_cache import mint_info_cache
 import asyncio
 
+# Attempts per transfer when the blockhash expires before the transaction lands
+MAX_SEND_ATTEMPTS = 3
+
 
 class SolanaTransferHelper:
     """Helper class for Solana token and SOL transfers."""
@@ -61,8 +67,6 @@ class SolanaTransferHelper:
                     async_client, wallet, to_pubkey, amount
                 )
                 token_identifier = "SOL"
-                
-            await SolanaTransferHelper._confirm_transaction(async_client, signature)
 
             logger.debug(
                 f"\nSuccess!\n\nSignature: {signature}\nFrom Address: {str(wallet.pubkey())}\nTo Address: {to}\nAmount: {amount}\nToken: {token_identifier}"
@@ -101,18 +105,10 @@ class SolanaTransferHelper:
                     lamports=lamports,
                 )
             )
-            
-            blockhash = (await async_client.get_latest_blockhash()).value.blockhash
-            msg = MessageV0.try_compile(
-                payer=wallet.pubkey(),
-                instructions=[ix],
-                address_lookup_table_accounts=[],
-                recent_blockhash=blockhash,
-            )
-            tx = VersionedTransaction(msg, [wallet])
 
-            result = await async_client.send_transaction(tx)
-            return result.value
+            return await SolanaTransferHelper._send_and_confirm(
+                async_client, wallet, [ix]
+            )
 
         except Exception as e:
             logger.error(f"Native SOL transfer failed: {str(e)}")
@@ -143,12 +139,8 @@ class SolanaTransferHelper:
             # Convert string token address to Pubkey
             token_mint = Pubkey.from_string(spl_token)
             
-            spl_client = AsyncToken(
-                async_client, token_mint, TOKEN_PROGRAM_ID, wallet.pubkey()
-            )
-            
             # Get token decimals
-            mint = await spl_client.get_mint_info()
+            mint = await mint_info_cache.get(async_client, token_mint, wallet.pubkey())
             decimals = mint.decimals
             
             # Convert amount to token units
@@ -172,27 +164,72 @@ class SolanaTransferHelper:
             )
 
             # Build and send transaction
-            blockhash = (await async_client.get_latest_blockhash()).value.blockhash
+            return await SolanaTransferHelper._send_and_confirm(
+                async_client, wallet, [transfer_ix]
+            )
+
+        except Exception as e:
+            logger.error(f"SPL token transfer failed: {str(e)}")
+            raise
+
+    @staticmethod
+    async def _send_and_confirm(
+        async_client: AsyncClient, wallet: Keypair, instructions: list
+    ) -> str:
+        """
+        Sign with a prefetched blockhash, send and wait for confirmation.
+
+        If the blockhash is rejected or expires before the transaction lands,
+        the transaction can no longer be processed, so it is rebuilt with a
+        fresh blockhash and sent again.
+
+        Returns:
+            Transaction signature.
+        """
+        provider = get_blockhash_provider(async_client)
+        for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+            recent = await provider.get()
             msg = MessageV0.try_compile(
                 payer=wallet.pubkey(),
-                instructions=[transfer_ix],
+                instructions=instructions,
                 address_lookup_table_accounts=[],
-                recent_blockhash=blockhash,
+                recent_blockhash=recent.blockhash,
             )
             tx = VersionedTransaction(msg, [wallet])
 
-            result = await async_client.send_transaction(tx)
-            return result.value
-
-        except Exception as e:
-            logger.error(f"SPL token transfer failed: {str(e)}")
-            raise
+            try:
+                signature = (await async_client.send_transaction(tx)).value
+            except RPCException as e:
+                if "Blockhash not found" not in str(e) or attempt == MAX_SEND_ATTEMPTS:
+                    raise
+                logger.debug(f"Blockhash rejected, resending (attempt {attempt})")
+                provider.invalidate()
+                continue
+
+            try:
+                await SolanaTransferHelper._confirm_transaction(
+                    async_client, signature, recent.last_valid_block_height
+                )
+                return signature
+            except TransactionExpiredBlockheightExceededError:
+                if attempt == MAX_SEND_ATTEMPTS:
+                    raise
+                logger.debug(f"Transaction {signature} expired, resending")
+                provider.invalidate()
 
     @staticmethod
-    async def _confirm_transaction(async_client: AsyncClient, signature: str) -> None:
-        """Wait for transaction confirmation."""
+    async def _confirm_transaction(
+        async_client: AsyncClient,
+        signature: str,
+        last_valid_block_height: int = None,
+    ) -> None:
+        """Wait for transaction confirmation over the shared signature socket."""
         try:
-            await async_client.confirm_transaction(signature, commitment=Confirmed)
+            await get_signature_tracker(async_client).confirm(
+                signature,
+                commitment=Confirmed,
+                last_valid_block_height=last_valid_block_height,
+            )
         except Exception as e:
             logger.error(f"Transaction confirmation failed: {str(e)}")
             raise
\ No newline at end of file
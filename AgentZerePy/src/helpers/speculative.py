@@ -0,0 +1,53 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Hashable, Optional
+
+logger = logging.getLogger("helpers.speculative")
+
+
+class SpeculativeQueue:
+    """
+    Holds results produced ahead of time (e.g. a post generated while the
+    agent idles) until the step that needs them runs.
+
+    Each entry remembers the context it was produced for. take() only hands
+    out an entry that is younger than the TTL and whose context still
+    matches, and discards the rest.
+    """
+
+    def __init__(self, ttl: float, maxsize: int = 1):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def put(self, key: str, value: Any, context: Hashable = None) -> None:
+        with self._lock:
+            queue = self._entries.setdefault(key, deque(maxlen=self.maxsize))
+            queue.append((time.monotonic(), context, value))
+
+    def take(self, key: str, context: Hashable = None) -> Optional[Any]:
+        """Pop the oldest fresh entry for key produced for this context"""
+        now = time.monotonic()
+        with self._lock:
+            queue = self._entries.get(key)
+            while queue:
+                created_at, entry_context, value = queue.popleft()
+                if now - created_at > self.ttl:
+                    logger.info(f"Discarding stale pre-generated {key} ({now - created_at:.0f}s old)")
+                elif entry_context != context:
+                    logger.info(f"Discarding pre-generated {key}, its context changed")
+                else:
+                    return value
+        return None
+
+    def has(self, key: str) -> bool:
+        """Whether key has an entry younger than the TTL; stale ones are dropped"""
+        now = time.monotonic()
+        with self._lock:
+            queue = self._entries.get(key)
+            while queue and now - queue[0][0] > self.ttl:
+                queue.popleft()
+            return bool(queue)
@@ -0,0 +1,162 @@
+import contextvars
+import inspect
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from src.helpers.llm_metrics import record_completion_usage
+from src.helpers.llm_pool import get_client_pool
+
+logger = logging.getLogger("helpers.tool_executor")
+
+DEFAULT_MAX_ITERATIONS = 3
+DEFAULT_MAX_PARALLEL_TOOLS = 4
+
+
+class ToolCallingExecutor:
+    """
+    Agent loop on native OpenAI tool calling, a drop-in for the LangChain
+    ReAct AgentExecutor used by the agent variants.
+
+    Takes the existing single-input LangChain Tool definitions. Each round
+    trip the model either answers directly (one LLM call in total) or
+    returns structured tool calls, which run in parallel before the next
+    round. If every tool called in a round is return_direct, their output
+    is the answer and no further LLM call is made.
+    """
+
+    def __init__(
+        self,
+        tools: List[Any],
+        model: str = "gpt-4o",
+        system_prompt: str = "",
+        temperature: float = 0.3,
+        max_iterations: int = DEFAULT_MAX_ITERATIONS,
+        max_parallel_tools: int = DEFAULT_MAX_PARALLEL_TOOLS,
+        verbose: bool = False,
+    ):
+        self.tools = {tool.name: tool for tool in tools}
+        self.model = model
+        self.system_prompt = system_prompt
+        self.temperature = temperature
+        self.max_iterations = max_iterations
+        self.verbose = verbose
+        self._tool_pool = ThreadPoolExecutor(
+            max_workers=max_parallel_tools, thread_name_prefix="agent-tool"
+        )
+        self._tool_schemas = [self._tool_schema(tool) for tool in tools]
+        self._pool = None
+
+    @staticmethod
+    def _tool_schema(tool: Any) -> Dict[str, Any]:
+        properties, required = {}, []
+        if ToolCallingExecutor._takes_input(tool):
+            properties["input"] = {
+                "type": "string",
+                "description": "The input to the tool, as described above",
+            }
+            required.append("input")
+        return {
+            "type": "function",
+            "function": {
+                "name": tool.name,
+                "description": tool.description,
+                "parameters": {
+                    "type": "object",
+                    "properties": properties,
+                    "required": required,
+                },
+            },
+        }
+
+    @staticmethod
+    def _takes_input(tool: Any) -> bool:
+        try:
+            return len(inspect.signature(tool.func).parameters) > 0
+        except (TypeError, ValueError):
+            return True
+
+    def _get_pool(self):
+        if self._pool is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("OPENAI_API_KEY environment variable is not set")
+            self._pool = get_client_pool("openai", api_key)
+        return self._pool
+
+    def _run_tool(self, name: str, arguments: str) -> str:
+        tool = self.tools.get(name)
+        if tool is None:
+            return f"Unknown tool: {name}"
+        try:
+            args = json.loads(arguments or "{}")
+            if self._takes_input(tool):
+                result = tool.func(args.get("input", ""))
+            else:
+                result = tool.func()
+            if self.verbose:
+                logger.info(f"Tool {name}({args.get('input', '')!r}) -> {str(result)[:200]}")
+            return result if isinstance(result, str) else json.dumps(result, default=str)
+        except Exception as e:
+            logger.error(f"Tool {name} failed: {e}")
+            return f"Error running {name}: {e}"
+
+    def _complete(self, messages: List[Dict[str, Any]], use_tools: bool = True):
+        kwargs = {"temperature": self.temperature}
+        if use_tools and self._tool_schemas:
+            kwargs["tools"] = self._tool_schemas
+        started = time.monotonic()
+        completion = self._get_pool().chat_completion(self.model, messages, **kwargs)
+        record_completion_usage("openai", self.model, completion, started)
+        return completion.choices[0].message
+
+    def invoke(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the loop for inputs["input"]; other keys fill the system prompt
+        template. Returns the final output, the tool steps taken and the
+        number of LLM calls made.
+        """
+        system_prompt = self.system_prompt.format_map(defaultdict(str, inputs)).strip()
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": inputs["input"]})
+
+        steps, llm_calls = [], 0
+        for _ in range(self.max_iterations):
+            message = self._complete(messages)
+            llm_calls += 1
+
+            if not message.tool_calls:
+                return {"output": message.content or "", "intermediate_steps": steps, "llm_calls": llm_calls}
+
+            messages.append(message.model_dump(exclude_none=True))
+            calls = message.tool_calls
+            # Each tool runs in a copy of this context so LLM usage recorded
+            # by tools keeps the caller's agent/task attribution
+            futures = [
+                self._tool_pool.submit(
+                    contextvars.copy_context().run,
+                    self._run_tool,
+                    call.function.name,
+                    call.function.arguments,
+                )
+                for call in calls
+            ]
+            results = [future.result() for future in futures]
+            for call, result in zip(calls, results):
+                steps.append((call.function.name, call.function.arguments, result))
+                messages.append({"role": "tool", "tool_call_id": call.id, "content": result})
+
+            if all(getattr(self.tools.get(call.function.name), "return_direct", False) for call in calls):
+                # Several direct tools in one turn all get their answer returned
+                return {"output": "\n\n".join(results), "intermediate_steps": steps, "llm_calls": llm_calls}
+
+        # Out of iterations: ask for an answer from what was gathered
+        message = self._complete(messages, use_tools=False)
+        llm_calls += 1
+        return {"output": message.content or "", "intermediate_steps": steps, "llm_calls": llm_calls}
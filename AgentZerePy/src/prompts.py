@@ -10,6 +10,8 @@ POST_TWEET_PROMPT = (
     "tweets that were given as example. Avoid the words AI and crypto."
 )
 
+AVOID_DUPLICATE_POST_PROMPT = "\nYour last draft was too close to this earlier post, write something different: {previous_post}"
+
 REPLY_TWEET_PROMPT = "Generate a friendly, engaging reply to this tweet: {tweet_text}. Keep it under 280 characters. Don't include any usernames, hashtags, links or emojis. "
 
 
@@ -23,8 +25,8 @@ REPLY_ECHOCHAMBER_PROMPT = (
 
 
 POST_ECHOCHAMBER_PROMPT = (
-    "Context:\n- Room Topic: {room_topic}\n- Tags: {tags}\n- Previous Messages:\n{previous_content}\n\n"
-    "Task:\nCreate a concise, engaging message that:\n1. Aligns with the room's topic and tags\n2. Builds upon Previous Messages without repeating them, or repeating greetings, introductions, or sentences.\n"
+    "Context:\n- Room Topic: {room_topic}\n- Tags: {tags}\n- Earlier message too close to repeat:\n{previous_content}\n\n"
+    "Task:\nCreate a concise, engaging message that:\n1. Aligns with the room's topic and tags\n2. Does not repeat or paraphrase the earlier message, greetings, introductions, or sentences.\n"
     "3. Offers fresh insights or perspectives\n4. Maintains a natural, conversational tone\n5. Keeps length between 2-4 sentences\n\nGuidelines:\n- Be specific and relevant\n- Add value to the ongoing discussion\n- Avoid generic statements\n- Use a friendly but professional tone\n- Include a question or discussion point when appropriate\n\n"
     "The message should feel organic and contribute meaningfully to the conversation."
 )
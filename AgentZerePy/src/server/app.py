@@ -8,6 +8,8 @@ import signal
 import threading
 from pathlib import Path
 from src.cli import ZerePyCLI
+from src.helpers.llm_metrics import usage_tracker
+from src.helpers.llm_pool import pool_stats
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("server/app")
@@ -89,6 +91,11 @@ class ZerePyServer:
                 "agent_running": self.state.agent_running
             }
 
+        @self.app.get("/metrics")
+        async def metrics():
+            """LLM usage for the current day and provider pool admission state"""
+            return {"llm_usage": usage_tracker.snapshot(), "llm_pools": pool_stats()}
+
         @self.app.get("/agents")
         async def list_agents():
             """List available agents"""
@@ -0,0 +1,28 @@
+from src.connections.base_connection import Action, ActionParameter
+
+ACTION = Action(
+    name="get-portfolio",
+    parameters=[
+        ActionParameter("token_addresses", False, list, "Token mint addresses"),
+        ActionParameter("count", False, int, "Count"),
+    ],
+    description="",
+)
+
+
+def test_list_parameter_accepts_a_single_string():
+    params = {"token_addresses": "So11111111111111111111111111111111111111112"}
+    assert ACTION.validate_params(params) == []
+    assert params["token_addresses"] == ["So11111111111111111111111111111111111111112"]
+
+
+def test_list_parameter_splits_comma_separated_strings():
+    params = {"token_addresses": " mintA, mintB ,,"}
+    assert ACTION.validate_params(params) == []
+    assert params["token_addresses"] == ["mintA", "mintB"]
+
+
+def test_list_parameter_keeps_lists_and_other_types_still_cast():
+    params = {"token_addresses": ("mintA", "mintB"), "count": "3"}
+    assert ACTION.validate_params(params) == []
+    assert params == {"token_addresses": ["mintA", "mintB"], "count": 3}
@@ -0,0 +1,100 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("solana")
+
+from src.helpers.solana.blockhash import BlockhashProvider, get_blockhash_provider
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_latest_blockhash(self, commitment=None):
+        self.calls += 1
+        value = SimpleNamespace(blockhash=f"hash-{self.calls}", last_valid_block_height=1000 + self.calls)
+        return SimpleNamespace(value=value)
+
+
+@pytest.mark.asyncio
+async def test_background_refresh_keeps_blockhash_current():
+    client = FakeClient()
+    provider = BlockhashProvider(client, refresh_interval=0.05, idle_timeout=5)
+    first = await provider.get()
+    assert first.last_valid_block_height > 1000
+
+    await asyncio.sleep(0.2)
+    calls = client.calls
+    second = await provider.get()
+    # Served from the refresher without another RPC call
+    assert client.calls == calls
+    assert second.blockhash != first.blockhash
+    provider._task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_refresher_stops_when_idle():
+    client = FakeClient()
+    provider = BlockhashProvider(client, refresh_interval=0.02, idle_timeout=0.1)
+    await provider.get()
+    await asyncio.sleep(0.3)
+    assert provider._task is None
+    calls = client.calls
+    await asyncio.sleep(0.1)
+    assert client.calls == calls
+
+    # The next caller restarts it
+    await provider.get()
+    assert provider._task is not None
+    provider._task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_stale_or_invalidated_blockhash_is_fetched_inline():
+    client = FakeClient()
+    provider = BlockhashProvider(client, refresh_interval=10, max_age=0.05)
+    await provider.get()
+    await asyncio.sleep(0.1)
+    calls = client.calls
+    await provider.get()
+    assert client.calls == calls + 1
+
+    provider.invalidate()
+    await provider.get()
+    assert client.calls == calls + 2
+    provider._task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_refresh_errors_do_not_stop_the_refresher():
+    client = FakeClient()
+    provider = BlockhashProvider(client, refresh_interval=0.02, idle_timeout=5)
+    await provider.get()
+
+    async def failing(commitment=None):
+        raise ConnectionError("rpc down")
+
+    client.get_latest_blockhash = failing
+    await asyncio.sleep(0.1)
+    assert provider._task is not None and not provider._task.done()
+    provider._task.cancel()
+
+
+def test_one_provider_per_client():
+    client = FakeClient()
+    assert get_blockhash_provider(client) is get_blockhash_provider(client)
+    assert get_blockhash_provider(client) is not get_blockhash_provider(FakeClient())
+
+
+@pytest.mark.asyncio
+async def test_latest_bypasses_the_cache():
+    client = FakeClient()
+    provider = BlockhashProvider(client, refresh_interval=10, idle_timeout=5)
+    cached = await provider.get()
+    latest = await provider.latest()
+    assert latest.last_valid_block_height > cached.last_valid_block_height
+    # The fresh value also becomes the cached one
+    assert (await provider.get()) == latest
+    provider._task.cancel()
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+pytest.importorskip("dotenv")
+
+import src.helpers.credentials as credentials
+from src.helpers.credentials import CredentialCache
+
+
+@pytest.fixture
+def env_file(tmp_path, monkeypatch):
+    path = tmp_path / ".env"
+    path.write_text("TEST_CRED_TOKEN=first\n")
+    monkeypatch.delenv("TEST_CRED_TOKEN", raising=False)
+    yield path
+    os.environ.pop("TEST_CRED_TOKEN", None)
+
+
+def _rewrite(path, text):
+    # Force a new mtime even on filesystems with coarse timestamps
+    stat = path.stat()
+    path.write_text(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_refresh_reads_once_until_the_file_changes(env_file, monkeypatch):
+    cache = CredentialCache(env_file)
+    loads = []
+    real_load = credentials.load_dotenv
+    monkeypatch.setattr(
+        credentials, "load_dotenv", lambda *a, **k: loads.append(1) or real_load(*a, **k)
+    )
+
+    assert cache.get("TEST_CRED_TOKEN") == "first"
+    version = cache.version
+    assert cache.get("TEST_CRED_TOKEN") == "first"
+    assert cache.refresh() == version
+    assert len(loads) == 1
+
+    _rewrite(env_file, "TEST_CRED_TOKEN=second\n")
+    assert cache.get("TEST_CRED_TOKEN") == "second"
+    assert cache.version == version + 1
+    assert len(loads) == 2
+
+
+def test_invalidate_forces_a_reload(env_file):
+    cache = CredentialCache(env_file)
+    version = cache.refresh()
+    cache.invalidate()
+    assert cache.refresh() == version + 1
+
+
+def test_missing_file_is_not_an_error(tmp_path):
+    cache = CredentialCache(tmp_path / "missing.env")
+    assert cache.get("TEST_CRED_MISSING", "default") == "default"
+    version = cache.version
+    assert cache.refresh() == version
+
+
+def test_signer_is_parsed_once_per_secret(env_file):
+    cache = CredentialCache(env_file)
+    parsed = []
+
+    def parse(secret):
+        parsed.append(secret)
+        return object()
+
+    signer = cache.signer("TEST_CRED_TOKEN", parse, "test")
+    assert cache.signer("TEST_CRED_TOKEN", parse, "test") is signer
+    assert parsed == ["first"]
+
+    _rewrite(env_file, "TEST_CRED_TOKEN=rotated\n")
+    assert cache.signer("TEST_CRED_TOKEN", parse, "test") is not signer
+    assert parsed == ["first", "rotated"]
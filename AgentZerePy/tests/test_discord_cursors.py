@@ -0,0 +1,58 @@
+import json
+import threading
+
+import pytest
+
+pytest.importorskip("discord")
+pytest.importorskip("requests")
+
+import src.connections.discord_connection as discord_connection
+from src.connections.discord_connection import DiscordConnection
+
+
+@pytest.fixture
+def connection(tmp_path, monkeypatch):
+    monkeypatch.setattr(discord_connection, "CURSORS_FILE", tmp_path / "cursors.json")
+    # Only the cursor bookkeeping is under test; skip the client and token check
+    conn = DiscordConnection.__new__(DiscordConnection)
+    conn._cursors_lock = threading.Lock()
+    conn._cursors = {}
+    conn._read_positions = {}
+    conn._cursors_dirty = False
+    conn._cursors_saved_at = 0.0
+    return conn
+
+
+def _saved(path):
+    return json.loads(path.read_text()) if path.exists() else None
+
+
+def test_reads_do_not_move_the_saved_cursor(connection):
+    connection._advance_read_position("1", "200")
+    assert connection.get_cursor("1") == "200"
+    connection.flush_cursors()
+    assert _saved(discord_connection.CURSORS_FILE) is None
+
+
+def test_commit_saves_newest_per_channel_and_throttles(connection):
+    messages = [
+        {"channel_id": "1", "id": "101"},
+        {"channel_id": "2", "id": "205"},
+        {"channel_id": "1", "id": "103"},
+    ]
+    connection.commit_cursors(messages)
+    assert _saved(discord_connection.CURSORS_FILE) == {"1": "103", "2": "205"}
+    assert connection.get_cursor("2") == "205"
+
+    # Within the save interval the new cursor waits for the next flush
+    connection.commit_cursors([{"channel_id": "1", "id": "110"}])
+    assert _saved(discord_connection.CURSORS_FILE)["1"] == "103"
+    connection.flush_cursors()
+    assert _saved(discord_connection.CURSORS_FILE)["1"] == "110"
+
+
+def test_commit_never_moves_a_cursor_back(connection):
+    connection.commit_cursors([{"channel_id": "1", "id": "500"}])
+    connection.commit_cursors([{"channel_id": "1", "id": "400"}])
+    connection.flush_cursors()
+    assert _saved(discord_connection.CURSORS_FILE) == {"1": "500"}
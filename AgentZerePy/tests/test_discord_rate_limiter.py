@@ -0,0 +1,138 @@
+import time
+
+import pytest
+
+pytest.importorskip("discord")
+pytest.importorskip("requests")
+
+from src.connections.discord_connection import DiscordRateLimiter
+
+CHANNEL = "/channels/111111111111111111"
+
+
+def test_route_keeps_major_parameter_and_strips_minor_ids():
+    route = DiscordRateLimiter.route(
+        "PUT", f"{CHANNEL}/messages/222222222222222222/reactions/%F0%9F%91%8D/@me?x=1"
+    )
+    assert route == f"PUT {CHANNEL}/messages/:id/reactions/:emoji/@me"
+    assert DiscordRateLimiter.route("GET", f"{CHANNEL}/messages") != DiscordRateLimiter.route(
+        "GET", "/channels/333333333333333333/messages"
+    )
+
+
+def test_unknown_route_is_not_limited():
+    limiter = DiscordRateLimiter()
+    started = time.monotonic()
+    for _ in range(10):
+        limiter.acquire(f"GET {CHANNEL}/messages")
+    assert time.monotonic() - started < 0.1
+
+
+def test_exhausted_bucket_waits_for_reset():
+    limiter = DiscordRateLimiter()
+    route = f"POST {CHANNEL}/messages"
+    limiter.update(
+        route,
+        {
+            "X-RateLimit-Bucket": "abc",
+            "X-RateLimit-Limit": "5",
+            "X-RateLimit-Remaining": "1",
+            "X-RateLimit-Reset-After": "0.3",
+        },
+    )
+    started = time.monotonic()
+    limiter.acquire(route)
+    assert time.monotonic() - started < 0.1
+    limiter.acquire(route)
+    assert time.monotonic() - started >= 0.25
+
+
+def test_routes_sharing_a_bucket_share_its_quota():
+    limiter = DiscordRateLimiter()
+    headers = {
+        "X-RateLimit-Bucket": "shared",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset-After": "0.3",
+    }
+    post = f"POST {CHANNEL}/messages"
+    patch = f"PATCH {CHANNEL}/messages/:id"
+    limiter.update(post, headers)
+    limiter.update(patch, headers)
+    assert limiter._bucket_key(post) == limiter._bucket_key(patch)
+
+
+def test_in_flight_requests_are_not_refunded_by_stale_headers():
+    limiter = DiscordRateLimiter()
+    route = f"POST {CHANNEL}/messages"
+    headers = {
+        "X-RateLimit-Bucket": "abc",
+        "X-RateLimit-Remaining": "3",
+        "X-RateLimit-Reset-After": "5",
+    }
+    limiter.update(route, headers)
+    limiter.acquire(route)
+    limiter.acquire(route)
+    # A response for the first request still says 3 remaining
+    limiter.update(route, headers)
+    assert limiter._buckets[limiter._bucket_key(route)]["remaining"] == 1
+
+
+def test_global_block_and_limit():
+    limiter = DiscordRateLimiter(global_limit=3)
+    started = time.monotonic()
+    for _ in range(4):
+        limiter.acquire(f"GET {CHANNEL}/messages")
+    assert time.monotonic() - started >= 0.9
+
+    limiter.block(f"GET {CHANNEL}/messages", 0.3, is_global=True)
+    started = time.monotonic()
+    limiter.acquire("GET /guilds/444444444444444444/channels")
+    assert time.monotonic() - started >= 0.25
+
+
+def test_route_block_after_429():
+    limiter = DiscordRateLimiter()
+    route = f"POST {CHANNEL}/messages"
+    limiter.block(route, 0.3, is_global=False)
+    started = time.monotonic()
+    limiter.acquire(route)
+    assert time.monotonic() - started >= 0.25
+
+
+def test_refilled_bucket_without_response_does_not_block_forever():
+    limiter = DiscordRateLimiter()
+    route = f"POST {CHANNEL}/messages"
+    limiter.update(
+        route,
+        {
+            "X-RateLimit-Bucket": "abc",
+            "X-RateLimit-Limit": "1",
+            "X-RateLimit-Remaining": "0",
+            "X-RateLimit-Reset-After": "0.05",
+        },
+    )
+    time.sleep(0.06)
+    limiter.acquire(route)
+    # No response ever updates the bucket; the next window still opens
+    reset_at = limiter._buckets[limiter._bucket_key(route)]["reset_at"]
+    assert reset_at - time.monotonic() <= 1.0
+
+
+def test_release_returns_the_slot():
+    limiter = DiscordRateLimiter()
+    route = f"POST {CHANNEL}/messages"
+    limiter.update(
+        route,
+        {
+            "X-RateLimit-Bucket": "abc",
+            "X-RateLimit-Limit": "2",
+            "X-RateLimit-Remaining": "1",
+            "X-RateLimit-Reset-After": "5",
+        },
+    )
+    limiter.acquire(route)
+    limiter.release(route)
+    limiter.release(route)
+    bucket = limiter._buckets[limiter._bucket_key(route)]
+    assert bucket["remaining"] == 2
+    assert not limiter.update(route, {})
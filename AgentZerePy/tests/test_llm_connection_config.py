@@ -0,0 +1,60 @@
+import pytest
+
+pytest.importorskip("openai")
+pytest.importorskip("dotenv")
+
+import src.connections.openai_connection as openai_connection
+from src.connections.openai_connection import OpenAIConnection
+
+
+class FakeCredentials:
+    def __init__(self):
+        self.version = 1
+        self.values = {"OPENAI_API_KEY": "sk-test"}
+
+    def refresh(self):
+        return self.version
+
+    def get(self, name, default=None):
+        return self.values.get(name, default)
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    calls = []
+
+    class FakeModels:
+        def list(self):
+            calls.append(1)
+            return []
+
+    class FakeOpenAI:
+        def __init__(self, **kwargs):
+            self.models = FakeModels()
+
+    credentials = FakeCredentials()
+    monkeypatch.setattr(openai_connection, "OpenAI", FakeOpenAI)
+    monkeypatch.setattr(openai_connection, "credential_cache", credentials)
+    return calls, credentials
+
+
+def test_is_configured_validates_once_per_credential_version(fake_openai):
+    calls, credentials = fake_openai
+    connection = OpenAIConnection({"model": "gpt-test"})
+
+    assert connection.is_configured()
+    assert connection.is_configured()
+    assert len(calls) == 1
+
+    credentials.version = 2
+    assert connection.is_configured()
+    assert len(calls) == 2
+
+
+def test_missing_key_is_not_configured(fake_openai):
+    calls, credentials = fake_openai
+    credentials.values = {}
+    connection = OpenAIConnection({"model": "gpt-test"})
+
+    assert not connection.is_configured()
+    assert not calls
@@ -0,0 +1,100 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("openai")
+
+from src.helpers import llm_pool
+from src.helpers.llm_pool import AdmissionController, parse_reset_duration
+
+
+@pytest.mark.parametrize(
+    "value, seconds",
+    [("1s", 1), ("6m0s", 360), ("20ms", 0.02), ("0.5", 0.5), ("1h2m", 3720), (None, None), ("soon", None)],
+)
+def test_parse_reset_duration(value, seconds):
+    if seconds is None:
+        assert parse_reset_duration(value) is None
+    else:
+        assert parse_reset_duration(value) == pytest.approx(seconds)
+
+
+async def _acquired_within(controller, tokens, timeout):
+    try:
+        await asyncio.wait_for(controller.acquire(tokens), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_waits_for_release():
+    controller = AdmissionController(max_concurrency=2)
+    await controller.acquire(10)
+    await controller.acquire(10)
+    assert not await _acquired_within(controller, 10, 0.1)
+
+    waiter = asyncio.create_task(controller.acquire(10))
+    await asyncio.sleep(0)
+    await controller.release(10)
+    await asyncio.wait_for(waiter, 1)
+    assert controller.in_flight == 2
+
+
+@pytest.mark.asyncio
+async def test_headers_subtract_in_flight_reservations():
+    controller = AdmissionController()
+    await controller.acquire(100)
+    await controller.acquire(100)
+    controller.update_from_headers(
+        {
+            "x-ratelimit-limit-requests": "500",
+            "x-ratelimit-remaining-requests": "10",
+            "x-ratelimit-remaining-tokens": "1000",
+            "x-ratelimit-reset-requests": "1s",
+            "x-ratelimit-reset-tokens": "1s",
+        }
+    )
+    assert controller.rpm_limit == 500
+    assert controller.remaining_requests == 8
+    assert controller.remaining_tokens == 800
+
+
+@pytest.mark.asyncio
+async def test_exhausted_quota_waits_for_reset():
+    controller = AdmissionController()
+    controller.update_from_headers(
+        {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "150ms"}
+    )
+    started = time.monotonic()
+    await asyncio.wait_for(controller.acquire(10), 2)
+    assert time.monotonic() - started >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_token_quota_blocks_large_requests_only():
+    controller = AdmissionController()
+    controller.update_from_headers(
+        {"x-ratelimit-remaining-tokens": "500", "x-ratelimit-reset-tokens": "10s"}
+    )
+    assert not await _acquired_within(controller, 1000, 0.1)
+    assert await _acquired_within(controller, 400, 0.1)
+
+
+@pytest.mark.asyncio
+async def test_local_rpm_window(monkeypatch):
+    monkeypatch.setattr(llm_pool, "WINDOW_SECONDS", 0.2)
+    controller = AdmissionController(rpm_limit=2)
+    for _ in range(2):
+        await controller.acquire(1)
+        await controller.release(1)
+    started = time.monotonic()
+    await asyncio.wait_for(controller.acquire(1), 2)
+    assert time.monotonic() - started >= 0.15
+
+
+def test_block_for_delays_everything():
+    controller = AdmissionController()
+    controller.block_for(5)
+    assert controller._wait_time(1, time.monotonic()) > 4
@@ -0,0 +1,96 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.helpers.post_dedup import (
+    PostDedupIndex,
+    generate_unique_post,
+    normalize_post,
+)
+
+POST = "Shipping the new solver release today, gas costs are down 30% across the board"
+
+
+@pytest.fixture
+def index(tmp_path):
+    return PostDedupIndex("test", capacity=4, index_dir=tmp_path)
+
+
+def test_normalize_drops_links_and_punctuation():
+    assert normalize_post("GM, World!  https://t.co/abc  ok") == "gm world ok"
+
+
+def test_signature_is_deterministic_and_ignores_formatting(index):
+    signature = index.signature(POST)
+    assert signature.shape == (128,)
+    assert signature.dtype == np.uint32
+    assert np.array_equal(signature, index.signature(POST.upper() + "!!! https://x.com/a"))
+    assert not np.array_equal(signature, index.signature("Something else entirely"))
+
+
+def test_short_text_still_gets_a_signature(index):
+    # Shorter than one shingle
+    assert index.signature("gm").shape == (128,)
+
+
+def test_near_duplicate_detected_at_threshold(index):
+    index.add(POST)
+    near = POST.replace("today", "today!").replace("30%", "30 %")
+    score, closest = index.most_similar(near)
+    assert score >= index.threshold == 0.6
+    assert closest == POST
+    assert index.is_duplicate(near)
+    assert not index.is_duplicate("Governance call moved to Thursday, agenda in the forum")
+
+
+def test_empty_index_has_no_match(index):
+    assert index.most_similar(POST) == (0.0, None)
+
+
+def test_ring_buffer_wraps_and_forgets_oldest(index, tmp_path):
+    posts = [
+        "Liquidity on the new pools doubled overnight",
+        "Reminder: community call starts in an hour",
+        "We just published the Q3 treasury report",
+        "Bug bounty payouts are live for the audit findings",
+        "Solvers competed on over a million batches this week",
+        "Hiring: two protocol engineers, remote friendly",
+    ]
+    for post in posts:
+        index.add(post)
+
+    assert index._ordered_texts() == posts[2:]
+    assert not index.is_duplicate(posts[0])
+    assert index.is_duplicate(posts[5])
+
+    # Reloading keeps the newest posts in order
+    reloaded = PostDedupIndex("test", capacity=4, index_dir=tmp_path)
+    assert reloaded._ordered_texts() == posts[2:]
+
+
+def test_generate_unique_post_steers_away_from_duplicates(index):
+    index.add(POST)
+    seen = []
+
+    def generate(avoid):
+        seen.append(avoid)
+        return POST if len(seen) == 1 else "A fresh take on MEV protection for traders"
+
+    assert generate_unique_post(index, generate) == "A fresh take on MEV protection for traders"
+    assert seen == [None, POST]
+
+
+def test_generate_unique_post_gives_up_after_max_attempts(index):
+    index.add(POST)
+    calls = []
+
+    def generate(avoid):
+        calls.append(avoid)
+        return POST
+
+    assert generate_unique_post(index, generate) is None
+    assert len(calls) == 3
+
+
+def test_generate_unique_post_stops_on_empty_generation(index):
+    assert generate_unique_post(index, lambda avoid: None) is None
@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("requests")
+
+import src.helpers.solana.token_registry as token_registry
+from src.helpers.solana.token_registry import JupiterTokenRegistry
+
+TOKENS = [
+    {"address": "So11111111111111111111111111111111111111112", "symbol": "SOL", "name": "Wrapped SOL", "decimals": 9},
+    {"address": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v", "symbol": "USDC", "name": "USD Coin", "decimals": 6},
+]
+
+
+class FakeResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return TOKENS
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    calls = []
+    state = {"fail": False}
+
+    def fake_get(url, **kwargs):
+        calls.append(url)
+        if state["fail"]:
+            raise ConnectionError("offline")
+        return FakeResponse()
+
+    monkeypatch.setattr(token_registry.requests, "get", fake_get)
+    return calls, state
+
+
+def test_lookups_use_the_index_and_snapshot(tmp_path, downloads):
+    calls, _ = downloads
+    snapshot = tmp_path / "tokens.json"
+    registry = JupiterTokenRegistry(snapshot_file=snapshot)
+    assert registry.get_by_symbol("usdc")["decimals"] == 6
+    assert registry.get_by_address(TOKENS[0]["address"])["symbol"] == "SOL"
+    assert len(calls) == 1
+
+    # A new process starts from the snapshot without downloading
+    warm = JupiterTokenRegistry(snapshot_file=snapshot)
+    assert warm.get_by_symbol("SOL")["name"] == "Wrapped SOL"
+    assert len(calls) == 1
+
+
+def test_failed_cold_download_backs_off(tmp_path, downloads):
+    calls, state = downloads
+    state["fail"] = True
+    registry = JupiterTokenRegistry(snapshot_file=tmp_path / "tokens.json")
+    assert registry.get_by_address(TOKENS[0]["address"]) is None
+    assert registry.get_by_symbol("SOL") is None
+    assert len(calls) == 1
+
+    # Once the backoff has passed the download is tried again
+    state["fail"] = False
+    registry._retry_at = 0.0
+    assert registry.get_by_symbol("SOL") is not None
+    assert len(calls) == 2